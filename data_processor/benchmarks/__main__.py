@@ -0,0 +1,51 @@
+"""
+Run the benchmark suite from the data_processor directory:
+
+    python -m benchmarks --rows 10000 100000 --output results.json
+    python -m benchmarks --baseline results.json --tolerance 0.2
+
+Exits with status 1 when a case regressed against the baseline.
+"""
+import argparse
+import itertools
+import sys
+from benchmarks.cases import CASES
+from benchmarks.data import DataSpec
+from benchmarks.runner import run_suite, save_results, load_results, compare, format_results
+
+
+def main(argv=None) -> int:
+    defaults = DataSpec()
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmark the data_processor operations.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[defaults.rows])
+    parser.add_argument('--columns', type=int, nargs='+', default=[defaults.columns])
+    parser.add_argument('--string-length', type=int, nargs='+', default=[defaults.string_length])
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[defaults.cardinality])
+    parser.add_argument('--duplicate-ratio', type=float, nargs='+', default=[defaults.duplicate_ratio])
+    parser.add_argument('--case', action='append', help="Only run cases whose name contains this text.")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Save the results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare the results with this JSON file.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative slowdown.")
+    parser.add_argument('--memory-tolerance', type=float, help="Allowed relative peak memory increase.")
+    args = parser.parse_args(argv)
+
+    specs = [DataSpec(*values) for values in itertools.product(args.rows, args.columns, args.string_length,
+                                                                args.cardinality, args.duplicate_ratio)]
+    cases = [case for case in CASES if not args.case or any(text in case.name for text in args.case)]
+
+    results = run_suite(specs, cases, args.repeat)
+    print(format_results(results))
+    if args.output:
+        save_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from typing import Callable, List, NamedTuple
+import pandas as pd
+from utils.helper import *
+from utils.streaming_dedup import BloomFilter
+from core.dataset import Dataset
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.data_validation_processor import DataValidationProcessor
+from processors.merge_processor import MergeProcessor
+from benchmarks.data import DataSpec, generate_frame, generate_lookup, generate_schema
+
+
+class BenchmarkData:
+    """
+    Inputs shared by the cases of one DataSpec, generated once.
+    """
+
+    def __init__(self, spec: DataSpec):
+        self.spec = spec
+        self.frame = generate_frame(spec)
+        # Second batch of rows with the same columns, for unions
+        self.batch = generate_frame(spec, seed=spec.seed + 1)
+        self.lookup = generate_lookup(spec)
+        self.schema = generate_schema(self.frame)
+
+    def dataset(self, frame: pd.DataFrame = None, name: str = None, dtype_mode: str = None) -> Dataset:
+        dataset = Dataset((self.frame if frame is None else frame).copy(), name=name, dtype_mode=dtype_mode)
+        dataset.schema = self.schema
+        return dataset
+
+
+class Case(NamedTuple):
+    name: str
+    group: str                                  # 'operation', 'processor' or 'pipeline'
+    setup: Callable[[BenchmarkData], Callable]  # Builds the callable to measure, called before every repetition
+    operations: tuple = ()                      # Names of the helper operations the case covers
+
+
+def _operation(operation, *arguments, **keywords) -> Case:
+    name = operation.__name__
+    return Case(name, 'operation', lambda data: lambda: operation(data.frame, *arguments, **keywords), (name,))
+
+
+def _check_no_duplicates(data: BenchmarkData) -> Callable:
+    # Duplicates raise, check the rows without them
+    frame = data.frame.drop_duplicates()
+    return lambda: check_no_duplicates(frame)
+
+
+def _process(processor, operation, *frames: Callable[[BenchmarkData], pd.DataFrame]):
+    def setup(data: BenchmarkData) -> Callable:
+        datasets = [data.dataset(frame(data)) for frame in frames]
+        return lambda: processor.process_operation(operation, *datasets)
+
+    return setup
+
+
+def _pipeline(data: BenchmarkData, scheduler: str, backend: str = None, dtype_mode: str = None) -> Callable:
+    frame, other = data.dataset(name='frame', dtype_mode=dtype_mode), data.dataset(data.batch, name='batch',
+                                                                                   dtype_mode=dtype_mode)
+    lookup = data.dataset(data.lookup, name='lookup', dtype_mode=dtype_mode)
+    manager = ExecutionManager()
+    manager.configure_scheduler(scheduler)
+    manager.configure_parallelism(backend, max_workers=2)
+    cleaning, validation = DataCleaningProcessor(), DataValidationProcessor()
+    manager.add_operation(1, cleaning, strip_leading_and_trailing_spaces, [frame, other])
+    manager.add_operation(2, cleaning, manage_special_characters, [frame, other])
+    manager.add_operation(3, cleaning, clean_numeric_values, [frame, other])
+    manager.add_operation(4, validation, validate_column_values, [frame, other])
+    manager.add_operation(5, MergeProcessor(), add_new_rows, [frame, other])
+    manager.add_operation(6, cleaning, remove_duplicates, [frame])
+    manager.add_operation(7, MergeProcessor(), bind_arguments(merge_dfs, merge_columns=['ID'], how='left'),
+                          [frame, lookup])
+    return manager.execute
+
+
+CASES: List[Case] = [
+    # Every operation of utils/helper.py on the generated frame
+    _operation(make_uppercase),
+    _operation(strip_leading_and_trailing_spaces),
+    _operation(remove_spaces_Around_punctuation),
+    _operation(manage_special_characters),
+    _operation(clean_numeric_values),
+    _operation(apply_standard_cleaning),
+    _operation(remove_duplicates),
+    Case('remove_duplicates_across_batches', 'operation',
+         lambda data: lambda: remove_duplicates_across_batches(
+             data.frame, store=BloomFilter(capacity=2 * data.spec.rows + 1)),
+         ('remove_duplicates_across_batches',)),
+    Case('drop_invalid_columns', 'operation', lambda data: lambda: drop_invalid_columns(data.frame, data.schema),
+         ('drop_invalid_columns',)),
+    Case('validate_column_values', 'operation',
+         lambda data: lambda: validate_column_values(data.frame, data.schema), ('validate_column_values',)),
+    Case('check_no_duplicates', 'operation', lambda data: _check_no_duplicates(data), ('check_no_duplicates',)),
+    Case('merge_dfs', 'operation',
+         lambda data: lambda: merge_dfs(data.frame, data.lookup, merge_columns=['ID'], how='left'), ('merge_dfs',)),
+    Case('add_new_rows', 'operation', lambda data: lambda: add_new_rows(data.frame, data.batch), ('add_new_rows',)),
+
+    # Processors, through process_operation on fresh Datasets
+    Case('DataCleaningProcessor.apply_standard_cleaning', 'processor',
+         _process(DataCleaningProcessor(), apply_standard_cleaning, lambda data: data.frame)),
+    Case('DataValidationProcessor.validate_column_values', 'processor',
+         _process(DataValidationProcessor(), validate_column_values, lambda data: data.frame)),
+    Case('MergeProcessor.merge_dfs', 'processor',
+         _process(MergeProcessor(), bind_arguments(merge_dfs, merge_columns=['ID'], how='left'),
+                  lambda data: data.frame, lambda data: data.lookup)),
+    Case('MergeProcessor.add_new_rows', 'processor',
+         _process(MergeProcessor(), add_new_rows,
+                  lambda data: data.frame, lambda data: data.batch, lambda data: data.frame.iloc[::2])),
+
+    # End-to-end pipelines, built before every repetition
+    Case('ExecutionManager.execute', 'pipeline', lambda data: _pipeline(data, 'order')),
+    Case('ExecutionManager.execute[dag]', 'pipeline', lambda data: _pipeline(data, 'dag')),
+    Case('ExecutionManager.execute[thread]', 'pipeline', lambda data: _pipeline(data, 'order', 'thread')),
+    Case('ExecutionManager.execute[optimize]', 'pipeline', lambda data: _pipeline(data, 'order', dtype_mode='optimize')),
+]
+
+
+def covered_operations() -> set:
+    return {name for case in CASES for name in case.operations}
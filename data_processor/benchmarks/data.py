@@ -0,0 +1,84 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+# Characters of the generated text: letters of both cases, spaces, punctuation and special characters
+ALPHABET = np.array(list("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789      ,.;:!?@#&*-_/"))
+
+
+class DataSpec(NamedTuple):
+    rows: int = 100_000
+    columns: int = 6            # Generated columns besides ID, cycling through text, amount and label columns
+    string_length: int = 16     # Characters of every text value
+    cardinality: int = 1_000    # Distinct values per column, and distinct IDs
+    duplicate_ratio: float = 0.1  # Share of the rows that copy another row
+    seed: int = 0
+
+    def label(self) -> str:
+        return (f"rows={self.rows} columns={self.columns} string_length={self.string_length} "
+                f"cardinality={self.cardinality} duplicate_ratio={self.duplicate_ratio}")
+
+
+def _text_pool(rng, size: int, length: int) -> np.ndarray:
+    characters = ALPHABET[rng.integers(0, len(ALPHABET), (size, length))]
+    # Padding like the raw files: leading and trailing spaces on some values
+    return np.array([' ' * (i % 3 == 0) + ''.join(row) + ' ' * (i % 4 == 0) for i, row in enumerate(characters)],
+                    dtype=object)
+
+
+def _amount_pool(rng, size: int) -> np.ndarray:
+    amounts = rng.uniform(0, 100_000, size).round(2)
+    formats = ('${:,.2f}', '{:.2f}', ' {:,.2f} ', 'USD {:.0f}', '{:.1f}%')
+    return np.array([formats[i % len(formats)].format(amount) for i, amount in enumerate(amounts)], dtype=object)
+
+
+def _label_pool(size: int) -> np.ndarray:
+    return np.array([f"label {i}" if i % 2 else f"Label_{i}" for i in range(size)], dtype=object)
+
+
+def generate_frame(spec: DataSpec, seed: int = None) -> pd.DataFrame:
+    """
+    Generate a messy DataFrame: an integer ID column and text, amount and label columns drawn from pools of
+    `cardinality` values, with `duplicate_ratio` of the rows copied from other rows.
+    """
+    rng = np.random.default_rng(spec.seed if seed is None else seed)
+    data = {'ID': rng.integers(0, spec.cardinality, spec.rows)}
+    for column in range(spec.columns):
+        kind = column % 3
+        if kind == 0:
+            pool = _text_pool(rng, spec.cardinality, spec.string_length)
+        elif kind == 1:
+            pool = _amount_pool(rng, spec.cardinality)
+        else:
+            pool = _label_pool(spec.cardinality)
+        data[f"{('TEXT', 'AMOUNT', 'LABEL')[kind]}_{column}"] = pool[rng.integers(0, len(pool), spec.rows)]
+    df = pd.DataFrame(data)
+
+    duplicates = int(spec.rows * spec.duplicate_ratio)
+    if duplicates:
+        rows = np.arange(spec.rows)
+        rows[rng.choice(spec.rows, duplicates, replace=False)] = rng.integers(0, spec.rows, duplicates)
+        df = df.iloc[rows].reset_index(drop=True)
+    return df
+
+
+def generate_lookup(spec: DataSpec, seed: int = None) -> pd.DataFrame:
+    """
+    Generate a table with one row per ID and one label column, to merge with generate_frame on ID.
+    """
+    rng = np.random.default_rng((spec.seed if seed is None else seed) + 1)
+    return pd.DataFrame({'ID': np.arange(spec.cardinality),
+                         'REGION': _label_pool(8)[rng.integers(0, 8, spec.cardinality)]})
+
+
+def generate_schema(df: pd.DataFrame) -> dict:
+    """
+    Schema keeping every column but the last one, with the label columns constrained to the values they hold
+    except one, so validation finds invalid values.
+    """
+    schema = {'COLUMNS': {column: None for column in df.columns[:-1]}}
+    for column in df.columns:
+        if column.startswith('LABEL'):
+            values = sorted(df[column].dropna().unique())
+            schema[column] = values[1:] or values
+    return schema
@@ -0,0 +1,115 @@
+import contextlib
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Iterable, List, NamedTuple
+import pandas as pd
+from benchmarks.cases import CASES, BenchmarkData, Case
+from benchmarks.data import DataSpec
+
+RESULTS_VERSION = 1
+
+
+class Regression(NamedTuple):
+    case: str
+    spec: dict
+    metric: str         # 'time' or 'peak_memory'
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float('inf')
+
+    def __str__(self):
+        return (f"{self.case} [{DataSpec(**self.spec).label()}]: {self.metric} {self.baseline:.6g} -> "
+                f"{self.current:.6g} ({self.ratio - 1:+.1%})")
+
+
+def measure(case: Case, data: BenchmarkData, repeat: int = 3) -> dict:
+    """
+    Time a case `repeat` times and measure its peak traced memory on one more run.
+    The setup of the case runs before every repetition and is not measured. Printed output is discarded.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            run = case.setup(data)
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        # Tracing slows the run down, so memory is measured separately from time
+        run = case.setup(data)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {'case': case.name, 'group': case.group, 'spec': data.spec._asdict(),
+            'time': statistics.median(times), 'times': times, 'peak_memory': peak}
+
+
+def run_suite(specs: Iterable[DataSpec], cases: List[Case] = None, repeat: int = 3) -> List[dict]:
+    """
+    Run every case on the data of every spec.
+
+    :return: One result per case and spec: median time in seconds, every time, and peak memory in bytes.
+    """
+    results = []
+    for spec in specs:
+        data = BenchmarkData(spec)
+        for case in CASES if cases is None else cases:
+            results.append(measure(case, data, repeat))
+    return results
+
+
+def save_results(results: List[dict], path):
+    with open(path, 'w') as file:
+        json.dump({'version': RESULTS_VERSION, 'python': platform.python_version(), 'pandas': pd.__version__,
+                   'results': results}, file, indent=2)
+
+
+def load_results(path) -> List[dict]:
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def _key(result: dict) -> tuple:
+    return result['case'], tuple(sorted(result['spec'].items()))
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float = 0.25,
+            memory_tolerance: float = None) -> List[Regression]:
+    """
+    Compare results with a baseline. Cases missing from the baseline are skipped.
+
+    :param tolerance: Allowed relative increase of the median time, 0.25 flags cases more than 25% slower.
+    :param memory_tolerance: Allowed relative increase of the peak memory, the time tolerance by default.
+    :return: The regressions.
+    """
+    memory_tolerance = tolerance if memory_tolerance is None else memory_tolerance
+    baseline = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline.get(_key(result))
+        if previous is None:
+            continue
+        for metric, allowed in (('time', tolerance), ('peak_memory', memory_tolerance)):
+            if result[metric] > previous[metric] * (1 + allowed):
+                regressions.append(Regression(result['case'], result['spec'], metric, previous[metric],
+                                              result[metric]))
+    return regressions
+
+
+def format_results(results: List[dict]) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"{result['case']:<50} {DataSpec(**result['spec']).label():<80} "
+                     f"{result['time'] * 1000:>10.2f} ms {result['peak_memory'] / 2 ** 20:>10.2f} MiB")
+    return '\n'.join(lines)
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterable, List, Sequence
+import pandas as pd
+from core.dataset import Dataset
+from core.lazy_dataset import detect_file_format, read_file
+from utils.schema import CompiledSchema, load_schema
+
+logger = logging.getLogger(__name__)
+
+# Files read at once by default, reads of network filesystems mostly wait
+MAX_CONCURRENT_READS = 32
+
+
+def _read_bytes(path) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def decode_frame(content: bytes, file_format: str, read_kwargs: dict = None) -> pd.DataFrame:
+    """
+    Decode the bytes of a CSV, Parquet or Feather file. Module-level, so process pools can run it.
+    """
+    return read_file(io.BytesIO(content), file_format, read_kwargs=read_kwargs)
+
+
+def _per_path(value, count: int, name: str) -> list:
+    # One value for every path, or a sequence with a value per path
+    if value is None or isinstance(value, (str, bytes, os.PathLike)):
+        return [value] * count
+    values = list(value)
+    if len(values) != count:
+        raise ValueError(f"Expected {count} {name}, one per path, got {len(values)}.")
+    return values
+
+
+async def load_datasets_async(paths: Iterable, schema_paths=None, names: Sequence[str] = None, lazy: bool = False,
+                              max_concurrency: int = MAX_CONCURRENT_READS, decode_executor: Executor = None,
+                              file_format: str = None, string_backend: str = None, storage: str = None,
+                              dtype_mode: str = None, **read_kwargs) -> List[Dataset]:
+    """
+    Create Datasets from many files concurrently.
+
+    At most max_concurrency files are read at once, on a thread pool, and decoded on decode_executor. Each schema
+    file is resolved once through the process-wide schema cache and its compiled schema shared by the Datasets
+    using it. With lazy=True no file is read: LazyDatasets read their file when their data is first needed,
+    only the columns the pipeline keeps (see Dataset.from_path).
+
+    :param paths: Paths of CSV, Parquet or Feather files.
+    :param schema_paths: Schema file of every Dataset, or one per path.
+    :param names: Name of each Dataset, one per path.
+    :param max_concurrency: Number of files read and decoded at once, bounding the memory of the raw bytes.
+    :param decode_executor: Executor decoding the files, e.g. a ProcessPoolExecutor for CSV files. A thread pool
+        by default, shut down when loading ends; a given executor is left running.
+    :param file_format: 'csv', 'parquet' or 'feather', detected from each file extension by default.
+    :param read_kwargs: Passed to pd.read_csv, pd.read_parquet or pd.read_feather.
+    :raises: The error of the first file that failed, in input order, once every file is done.
+    :return: The Datasets, in the order of the paths.
+    """
+    if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+        raise ValueError(f"max_concurrency must be a positive whole number. Got {max_concurrency}.")
+    paths = list(paths)
+    schema_paths = _per_path(schema_paths, len(paths), 'schema paths')
+    names = [None] * len(paths) if names is None else _per_path(names, len(paths), 'names')
+    loop = asyncio.get_running_loop()
+
+    reader = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='dataset-reader')
+    decoder = decode_executor or ThreadPoolExecutor(thread_name_prefix='dataset-decoder')
+    slots = asyncio.Semaphore(max_concurrency)
+    schemas = {}
+
+    def resolve_schema(schema_path) -> asyncio.Future:
+        # Datasets sharing a schema file wait for the same read
+        if schema_path is None:
+            return None
+        key = os.path.abspath(os.fspath(schema_path))
+        if key not in schemas:
+            schemas[key] = loop.run_in_executor(reader, load_schema, schema_path)
+        return schemas[key]
+
+    async def load(path, schema_path, name) -> Dataset:
+        schema_future = resolve_schema(schema_path)
+        schema: CompiledSchema = await schema_future if schema_future is not None else None
+        if lazy:
+            return Dataset.from_path(path, file_format=file_format, string_backend=string_backend, name=name,
+                                     storage=storage, dtype_mode=dtype_mode, schema=schema, **read_kwargs)
+
+        path_format = file_format or detect_file_format(path)
+        async with slots:
+            content = await loop.run_in_executor(reader, _read_bytes, path)
+            data = await loop.run_in_executor(decoder, decode_frame, content, path_format, read_kwargs)
+            del content
+            # Dtype conversions run off the event loop as well
+            return await loop.run_in_executor(
+                decoder if isinstance(decoder, ThreadPoolExecutor) else reader,
+                lambda: Dataset(data, string_backend=string_backend, name=name, storage=storage,
+                                dtype_mode=dtype_mode, schema=schema))
+
+    try:
+        results = await asyncio.gather(*(load(path, schema_path, name)
+                                         for path, schema_path, name in zip(paths, schema_paths, names)),
+                                       return_exceptions=True)
+    finally:
+        reader.shutdown(wait=False)
+        if decode_executor is None:
+            decoder.shutdown(wait=False)
+
+    for path, result in zip(paths, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to load '%s': %s", path, result)
+            raise result
+    return results
+
+
+def load_datasets(paths: Iterable, schema_paths=None, **kwargs) -> List[Dataset]:
+    """
+    Create Datasets from many files concurrently, from synchronous code. Takes the arguments of
+    load_datasets_async.
+
+    Inside a running event loop (e.g. a notebook), the loading runs on its own loop in a separate thread,
+    so the calling loop is blocked until it ends; coroutines should await load_datasets_async instead.
+    """
+    coroutine = load_datasets_async(paths, schema_paths, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
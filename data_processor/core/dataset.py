@@ -1,23 +1,250 @@
 import pandas as pd
-from utils.helper import read_yaml
+from utils.schema import CompiledSchema, load_schema, compile_schema
+from utils.dtypes import check_dtype_mode, enforce_dtypes
+from utils.arrow_backend import check_string_backend, convert_string_columns
+from core.shared_memory import SharedFrame
+from utils.multiway_merge import build_key_index
+from utils.row_hashing import RowHashSet
+from core.spill import check_storage, spill_frame, spill_policy
 
 
 class Dataset:
-    def __init__(self, data: pd.DataFrame, schema_path = None):
+    # Default string backend for new Datasets: 'python' keeps object columns,
+    # 'pyarrow' stores string columns in Arrow buffers so cleaning runs on Arrow compute kernels
+    string_backend = 'python'
+
+    # Default storage for new Datasets: 'memory' keeps the data in RAM, 'spill' lets the process-wide
+    # spill policy (core.spill.spill_policy) write the data to disk while it is idle and map it back on access
+    storage = 'memory'
+
+    # Arrow IPC file holding the data while it is spilled, or the last spilled version of it
+    _spill = None
+
+    # Memory used by the data, by id of the DataFrame: (id, bytes)
+    _memory_usage = None
+
+    # Default dtype mode for new Datasets: 'keep' leaves the dtypes of the data, 'schema' converts the columns
+    # the schema declares a dtype for, 'optimize' also gives the other columns their most compact dtype
+    dtype_mode = 'keep'
+
+    # Memory of the data before and after its dtypes were converted, None if no conversion ran
+    dtype_report = None
+
+    # Violation rates estimated by the last sampled validation of the Dataset
+    sampling_report = None
+
+    # Join-key indexes of the data by merge columns, rebuilt when the data is replaced
+    _key_indexes = None
+    _key_index_data = None
+
+    # Row hashes of a DataFrame of the Dataset, kept by incremental unions: (DataFrame, RowHashSet)
+    _row_hashes = None
+
+    # Shared memory segment holding a copy of the data (or the data itself) for worker processes
+    _shared_frame = None
+
+    def __init__(self, data: pd.DataFrame, schema_path = None, string_backend: str = None, name: str = None,
+                 storage: str = None, dtype_mode: str = None, schema: CompiledSchema = None):
         
-        self.data = data
-        self.schema = read_yaml(schema_path) if schema_path else None
+        self.name = name
+        self.string_backend = string_backend or Dataset.string_backend
+        check_string_backend(self.string_backend)
+        self.dtype_mode = dtype_mode or Dataset.dtype_mode
+        check_dtype_mode(self.dtype_mode)
+
+        # A compiled schema (e.g. resolved once for many Datasets) is used as it is, instead of schema_path
+        self.schema = schema if schema is not None else load_schema(schema_path) if schema_path else None
+        data = convert_string_columns(data) if self.string_backend == 'pyarrow' and data is not None else data
+        self.data = self._apply_dtypes(data)
+        self._init_storage(storage)
+
+    def _apply_dtypes(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the data to the dtypes of the dtype mode and keep the memory report of the conversion.
+        """
+        declared = compile_schema(self.schema).dtypes if self.schema is not None else {}
+        if data is None or self.dtype_mode == 'keep' or (self.dtype_mode == 'schema' and not declared):
+            return data
+        data, self.dtype_report = enforce_dtypes(data, declared, optimize=self.dtype_mode == 'optimize')
+        return data
+
+    def _init_storage(self, storage: str = None):
+        self.storage = storage or Dataset.storage
+        check_storage(self.storage)
+        if self.storage == 'spill':
+            spill_policy.track(self)
         
+    @classmethod
+    def from_path(cls, path, file_format: str = None, schema_path = None, string_backend: str = None,
+                  name: str = None, storage: str = None, dtype_mode: str = None, schema: CompiledSchema = None,
+                  **read_kwargs) -> 'Dataset':
+        """
+        Create a Dataset read from a CSV, Parquet or Feather file when its data is first needed,
+        reading only the columns the pipeline keeps (see LazyDataset).
+
+        :param file_format: 'csv', 'parquet' or 'feather', detected from the file extension by default.
+        :param read_kwargs: Passed to pd.read_csv, pd.read_parquet or pd.read_feather.
+        """
+        from core.lazy_dataset import LazyDataset
+
+        return LazyDataset(path, file_format=file_format, schema_path=schema_path, string_backend=string_backend,
+                           name=name, storage=storage, dtype_mode=dtype_mode, schema=schema, **read_kwargs)
+
+    @classmethod
+    def set_string_backend(cls, backend: str):
+        """
+        Select the string backend used by Datasets created from now on.
+        """
+        check_string_backend(backend)
+        cls.string_backend = backend
+
+    @classmethod
+    def set_dtype_mode(cls, mode: str):
+        """
+        Select the dtype mode of Datasets created from now on, 'keep', 'schema' or 'optimize'.
+        """
+        check_dtype_mode(mode)
+        cls.dtype_mode = mode
+
+    @classmethod
+    def set_storage(cls, storage: str):
+        """
+        Select the storage of Datasets created from now on, 'memory' or 'spill'.
+        """
+        check_storage(storage)
+        cls.storage = storage
+
+    def __repr__(self):
+        return f"<{type(self).__name__} '{self.name}'>" if self.name else f"<{type(self).__name__} at {hex(id(self))}>"
 
     def get_data(self) -> pd.DataFrame:
        
-    
+        if self.data is None and self._spill is not None:
+            # Map the spilled data back, columns are views of the file until they are written to
+            self.data = self._spill.load()
+            if self._row_hashes is not None and self._row_hashes[0] is None:
+                self._row_hashes = (self.data, self._row_hashes[1])
         return self.data
 
     def set_data(self, data: pd.DataFrame):
         
+        if self._shared_frame is not None and self._shared_frame.source is not data:
+            self.release_shared_memory()
+        self._key_indexes = None
+        if self._row_hashes is not None and self._row_hashes[0] is not data:
+            self._row_hashes = None
+        self._memory_usage = None
         self.data = data
 
+    def is_resident(self) -> bool:
+        """
+        Check whether the data is in memory, False while it is spilled or not loaded.
+        """
+        return self.data is not None
+
+    def is_spilled(self) -> bool:
+        """
+        Check whether the data is on disk, waiting to be mapped back by get_data.
+        """
+        return self.data is None and self._spill is not None
+
+    def memory_usage(self) -> int:
+        """
+        Bytes used by the data in memory, including Python strings, 0 while it is spilled.
+        Computed once per DataFrame.
+        """
+        if self.data is None:
+            return 0
+        if self._memory_usage is None or self._memory_usage[0] != id(self.data):
+            self._memory_usage = (id(self.data), int(self.data.memory_usage(index=True, deep=True).sum()))
+        return self._memory_usage[1]
+
+    def spill(self) -> bool:
+        """
+        Write the data to an Arrow IPC file in the spill directory and drop it from memory. The next get_data maps
+        the file back. Data Arrow cannot hold (e.g. object columns mixing types, non-string column names)
+        stays in memory.
+
+        :return: True if the data was spilled.
+        """
+        data = self.data
+        spill = spill_frame(data, spill_policy.spill_directory()) if data is not None else None
+        if spill is None:
+            return False
+
+        # In-place changes to the data are not tracked, so every spill writes the current data
+        if self._spill is not None:
+            self._spill.remove()
+        self._spill = spill
+        self.release_shared_memory()
+        # Cached structures must not keep the DataFrame alive, row hashes are reattached when it is mapped back
+        self._key_indexes = self._key_index_data = None
+        if self._row_hashes is not None:
+            self._row_hashes = (None, self._row_hashes[1]) if self._row_hashes[0] is data else None
+        self._memory_usage = None
+        self.data = None
+        return True
+
+    def row_hashes(self) -> RowHashSet:
+        """
+        Get the row hashes of the current data, None if they were not computed for it.
+        """
+        if self._row_hashes is not None and self._row_hashes[0] is self.get_data():
+            return self._row_hashes[1]
+        return None
+
+    def set_row_hashes(self, row_hashes: RowHashSet, data: pd.DataFrame = None):
+        """
+        Attach the row hashes of a DataFrame of the Dataset, the current data by default,
+        e.g. a RowHashSet loaded from a previous run.
+        """
+        self._row_hashes = (self.get_data() if data is None else data, row_hashes)
+
+    def key_index(self, merge_columns) -> pd.Index:
+        """
+        Get the index of the join-key values of the data, built on first use and cached until the data
+        is replaced, so repeated merges against the same dataset do not hash its keys again.
+        In-place changes to the key columns of the current DataFrame are not detected.
+        """
+        data = self.get_data()
+        if self._key_indexes is None or self._key_index_data is not data:
+            self._key_indexes = {}
+            self._key_index_data = data
+
+        key = tuple(merge_columns)
+        if key not in self._key_indexes:
+            self._key_indexes[key] = build_key_index(data, list(merge_columns))
+        return self._key_indexes[key]
+
+    def share(self) -> SharedFrame:
+        """
+        Place the data in shared memory so worker processes can read it without copying.
+        The segment is reused as long as the data is not replaced.
+        """
+        data = self.get_data()
+        if self._shared_frame is None or self._shared_frame.source is not data:
+            self.release_shared_memory()
+            self._shared_frame = SharedFrame.from_dataframe(data)
+        return self._shared_frame
+
+    def set_shared_data(self, frame: SharedFrame):
+        """
+        Replace the data with a DataFrame built on a shared memory segment, e.g. the result of a worker process.
+        The Dataset takes ownership of the segment and releases it when its data is replaced.
+        """
+        data = frame.claim().to_dataframe()
+        self.set_data(data)
+        frame.source = data
+        self._shared_frame = frame
+
+    def release_shared_memory(self):
+        """
+        Destroy the shared memory segment of the Dataset. The current data stays valid.
+        """
+        if self._shared_frame is not None:
+            self._shared_frame.release()
+            self._shared_frame = None
+
     def get_schema(self) -> dict:
         
         return self.schema
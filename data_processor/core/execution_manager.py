@@ -1,19 +1,156 @@
+import functools
+import logging
+import threading
+import types
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from core.dataset import Dataset
+from core.streaming import StreamingDataset
+from core.execution_plan import ExecutionPlan
 from processors.merge_processor import MergeProcessor
 from processors.data_cleaning_processor import DataCleaningProcessor
 from processors.data_validation_processor import DataValidationProcessor
-from utils.helper import check_operation_type, validate_order, check_duplicate_order, get_operation_list
+from utils.helper import check_operation_type, validate_order, check_duplicate_order, is_stateful_chunks
+from utils.registry import registry
+from core.shared_memory import SharedFrame
+from core.instrumentation import StepProfiler
+from core.lazy_dataset import push_down_projections
+from core.spill import SpillSchedule, spill_policy
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_BACKENDS = ('thread', 'process')
+# How the process backend sends DataFrames to workers and back: pickled, or through shared memory segments
+TRANSPORTS = ('pickle', 'shared_memory')
+SCHEDULERS = ('order', 'dag')
+
+
+def _process_in_worker(processor, operation, dataset):
+    """
+    Run one operation on one dataset in a worker process and send the resulting DataFrame back.
+    """
+    return processor.process_operation(operation, dataset).get_data()
+
+
+def _process_shared_in_worker(processor, operation, frame, schema, name):
+    """
+    Run one operation in a worker process on a DataFrame read from shared memory,
+    and place the result in a new segment owned by the caller.
+    """
+    # Read-only views: the worker cannot change the data of the Dataset in the parent process
+    # The data is used as it is, whatever the defaults of new Datasets
+    dataset = Dataset(frame.to_dataframe(writeable=False), string_backend='python', name=name, storage='memory',
+                      dtype_mode='keep', schema=schema)
+    result = SharedFrame.from_dataframe(processor.process_operation(operation, dataset).get_data())
+    result.close()
+    frame.close()
+    return result
+
+
+class _WorkerPool:
+    """
+    Worker pool shared by the steps of one run, created on first use.
+    """
+
+    def __init__(self, backend: str, max_workers: int, transport: str = 'pickle'):
+        self.backend = backend
+        self.max_workers = max_workers
+        self.transport = transport
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._executor is None:
+                pool = ProcessPoolExecutor if self.backend == 'process' else ThreadPoolExecutor
+                self._executor = pool(max_workers=self.max_workers)
+            return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+
+_DEFAULT_LOCK = threading.Lock()
+
+
+class _pipeline_method:
+    """
+    Method of an ExecutionManager pipeline. Called on the class, it runs on the default pipeline,
+    which keeps the class-level API working.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, instance, owner):
+        return types.MethodType(self.func, owner.default() if instance is None else instance)
+
 
 class ExecutionManager:
-    global_operations = []  # Class-level storage for operations
+    global_operations = []  # Operations of the default pipeline used by the class-level API
 
-    def __init__(self):
-        pass
+    # Defaults for new pipelines.
+    # Backend used to run an operation on several datasets at once: None (serial), 'thread' or 'process'
+    parallel_backend = None
+    max_workers = None
+    transport = 'pickle'
+
+    # 'order' runs steps one at a time by order, 'dag' runs independent steps concurrently
+    scheduler = 'order'
+    max_concurrent_steps = None
+
+    # StepProfiler recording metrics for every step, None measures nothing
+    profiler = None
+
+    def __init__(self, operations: list = None):
+        """
+        A pipeline with its own operations and settings. Pipelines can be built and executed
+        concurrently from several threads.
+
+        Calling the methods on the class (ExecutionManager.add_operation(...)) uses a default pipeline
+        whose operations are ExecutionManager.global_operations.
+
+        :param operations: List holding the (order, processor, operation, datasets) steps of the pipeline.
+        """
+        self.global_operations = [] if operations is None else operations
+        self._lock = threading.RLock()
+
+        self.parallel_backend = type(self).parallel_backend
+        self.max_workers = type(self).max_workers
+        self.transport = type(self).transport
+        self.scheduler = type(self).scheduler
+        self.max_concurrent_steps = type(self).max_concurrent_steps
+        self.profiler = type(self).profiler
 
     @classmethod
-    def add_operation(cls, order: int, processor, operation, datasets: list):
-        # Validate order and check for duplicates using helper functions
+    def default(cls) -> 'ExecutionManager':
+        """
+        Get the pipeline used when methods are called on the class.
+        """
+        if cls.__dict__.get('_default') is None:
+            with _DEFAULT_LOCK:
+                if cls.__dict__.get('_default') is None:
+                    cls._default = cls(operations=cls.global_operations)
+        default = cls._default
+        # ExecutionManager.global_operations = [] resets the class-level pipeline
+        if default.global_operations is not cls.global_operations:
+            with default._lock:
+                default.global_operations = cls.global_operations
+        return default
+
+    def _append(self, order: int, processor, operation, datasets: list):
+        # Check and append together so concurrent registrations cannot share an order. The orders are read
+        # from the list itself, which callers may change directly (e.g. replacing a step)
+        with self._lock:
+            check_duplicate_order(order, self.global_operations)
+            self.global_operations.append((order, processor, operation, datasets))
+
+    @_pipeline_method
+    def add_operation(self, order: int, processor, operation, datasets: list):
+        # Validate order, duplicates are checked when the operation is added
         validate_order(order)
-        check_duplicate_order(order, cls.global_operations)
         
         # Check operation type based on processor type
         if isinstance(processor, DataCleaningProcessor):
@@ -24,41 +161,218 @@ class ExecutionManager:
             check_operation_type(operation, 'merge')
 
         # Add the operation to global operations
-        cls.global_operations.append((order, processor, operation, datasets))
+        self._append(order, processor, operation, datasets)
 
-    @classmethod
-    def add_custom_operation(cls, order: int, processor, operation, datasets: list):
-        # Validate order and check for duplicates using helper functions
+    @_pipeline_method
+    def add_custom_operation(self, order: int, processor, operation, datasets: list):
+        # Validate order, duplicates are checked when the operation is added
         validate_order(order)
-        check_duplicate_order(order, cls.global_operations)
 
         # Check if the operation is a built-in operation
-        built_in_operations = get_operation_list('cleaning') + get_operation_list('validation') + get_operation_list('merge')
-        
-        if operation.__name__ in built_in_operations:
+        if registry.is_built_in(operation.__name__):
             raise ValueError(f"The operation '{operation.__name__}' is a built-in operation and cannot be used in add_custom_operation. Use add_operation instead.")
         
         # Add the custom operation to global operations
-        cls.global_operations.append((order, processor, operation, datasets))
+        self._append(order, processor, operation, datasets)
 
-    @classmethod
-    def execute(cls):
+    @_pipeline_method
+    def configure_parallelism(self, backend: str = 'process', max_workers: int = None, transport: str = 'pickle'):
+        """
+        Run an operation registered against several datasets on a pool of workers.
+
+        :param backend: 'process' for a process pool, 'thread' for a thread pool, None to run serially.
+        :param max_workers: Size of the pool, defaults to the number of CPUs.
+        :param transport: How the process backend moves DataFrames: 'pickle' copies them to and from workers,
+            'shared_memory' places column buffers in shared memory segments that workers read without copying.
+            Segments are released when a Dataset's data is replaced and at the end of the run.
+        """
+        if backend is not None and backend not in PARALLEL_BACKENDS:
+            raise ValueError(f"Invalid parallel backend '{backend}'. Use one of: {', '.join(PARALLEL_BACKENDS)}.")
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers <= 0):
+            raise ValueError(f"max_workers must be a positive whole number. Got {max_workers}.")
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Invalid transport '{transport}'. Use one of: {', '.join(TRANSPORTS)}.")
+        if transport == 'shared_memory' and backend != 'process':
+            raise ValueError("The shared_memory transport requires the 'process' backend.")
+
+        with self._lock:
+            self.parallel_backend = backend
+            self.max_workers = max_workers
+            self.transport = transport
+
+    @_pipeline_method
+    def configure_scheduler(self, scheduler: str = 'dag', max_concurrent_steps: int = None):
+        """
+        Choose how steps are scheduled.
+
+        :param scheduler: 'order' runs steps one at a time by order. 'dag' builds a dependency graph from the
+            datasets each step reads and writes and runs independent steps concurrently, with the same results.
+        :param max_concurrent_steps: Number of steps running at once with the 'dag' scheduler.
+        """
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Invalid scheduler '{scheduler}'. Use one of: {', '.join(SCHEDULERS)}.")
+        if max_concurrent_steps is not None and (not isinstance(max_concurrent_steps, int) or max_concurrent_steps <= 0):
+            raise ValueError(f"max_concurrent_steps must be a positive whole number. Got {max_concurrent_steps}.")
+
+        with self._lock:
+            self.scheduler = scheduler
+            self.max_concurrent_steps = max_concurrent_steps
+
+    @_pipeline_method
+    def configure_instrumentation(self, profiler: StepProfiler = None) -> StepProfiler:
+        """
+        Record wall and CPU time, rows, columns and memory in and out of every step executed from now on.
+
+        :param profiler: StepProfiler collecting the records, a new one by default. Several pipelines can share
+            a profiler. Use disable_instrumentation to stop measuring.
+        :return: The profiler.
+        """
+        profiler = profiler or StepProfiler()
+        with self._lock:
+            self.profiler = profiler
+        return profiler
+
+    @_pipeline_method
+    def disable_instrumentation(self):
+        with self._lock:
+            self.profiler = None
+
+    @_pipeline_method
+    def compile(self) -> ExecutionPlan:
+        """
+        Compile the registered operations into an ExecutionPlan that can be run many times with execute_plan,
+        against the registered datasets or other datasets bound to the same slots.
+        """
+        with self._lock:
+            return ExecutionPlan.compile(list(self.global_operations))
+
+    @_pipeline_method
+    def explain(self) -> str:
+        """
+        Describe the execution plan: which steps can run concurrently, what they wait for, and the critical path.
+        """
+        return self.compile().describe()
+
+    def _process_datasets(self, pool: _WorkerPool, processor, operation, datasets: list):
+        """
+        Run one operation on independent datasets through the worker pool and wait for all of them.
+        Errors are reported by the processor's ExceptionHandler with the failing dataset, the first one is raised.
+        """
+        executor = pool.get()
+        shared = pool.backend == 'process' and pool.transport == 'shared_memory'
+        if shared:
+            futures = [executor.submit(_process_shared_in_worker, processor, operation, dataset.share(),
+                                       dataset.get_schema(), dataset.name) for dataset in datasets]
+        elif pool.backend == 'process':
+            futures = [executor.submit(_process_in_worker, processor, operation, dataset) for dataset in datasets]
+        else:
+            futures = [executor.submit(processor.process_operation, operation, dataset) for dataset in datasets]
+
+        errors = []
+        for dataset, future in zip(datasets, futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                errors.append(error)
+                continue
+            # Results of worker processes are copied back into the same Dataset objects
+            if shared:
+                dataset.set_shared_data(result)
+            elif pool.backend == 'process':
+                dataset.set_data(result)
+
+        if errors:
+            raise errors[0]
+
+    def _run_step(self, step, pool: _WorkerPool, schedule: SpillSchedule, profiler: StepProfiler = None):
+        """
+        Execute one step on its datasets, measured by the profiler if there is one.
+        Its datasets are not spilled while it runs, idle datasets may be spilled once it is done.
+        """
+        _, processor, operation, datasets = step
+        logger.info("Executing '%s' on processor '%s'", operation.__name__, processor.__class__.__name__)
+        spill_policy.step_started(schedule, step)
+        try:
+            with profiler.measure(step) if profiler is not None else nullcontext():
+                self._process_step(step, pool)
+        finally:
+            spill_policy.step_finished(schedule, step)
+
+    def _process_step(self, step, pool: _WorkerPool):
+        _, processor, operation, datasets = step
+        # Check if processor is MergeProcessor, compiled plans ensure it has at least two datasets
+        if isinstance(processor, MergeProcessor):
+            # Merges need every row, streaming datasets apply their full dataset strategy first
+            # unless the merge runs out of core, chunk by chunk
+            for dataset in datasets:
+                if isinstance(dataset, StreamingDataset) and not processor.runs_out_of_core(operation):
+                    dataset.require_full_dataset(operation)
+            # For MergeProcessor, pass multiple datasets
+            processor.process_operation(operation, *datasets)
+            return
+
+        # For other processors, process each dataset individually
+        in_memory = []
+        for dataset in datasets:
+            if isinstance(dataset, StreamingDataset):
+                # Row-local operations are queued and run chunk by chunk when the dataset is written
+                dataset.queue_operation(processor, operation)
+            else:
+                in_memory.append(dataset)
+
+        # Stateful operations (e.g. deduplication across batches) share their state between the datasets,
+        # which must see it in order
+        independent = (len({id(dataset) for dataset in in_memory}) == len(in_memory)
+                       and not is_stateful_chunks(operation))
+        if pool.backend is not None and len(in_memory) > 1 and independent:
+            # Every step still waits for all of its datasets before the next order runs
+            self._process_datasets(pool, processor, operation, in_memory)
+        else:
+            for dataset in in_memory:
+                processor.process_operation(operation, dataset)
+
+    @_pipeline_method
+    def execute(self):
         """
         Execute all operations based on the global order across processors.
         """
-        # Sort operations by the specified order
-        cls.global_operations.sort(key=lambda x: x[0])
-
-        # Loop through each operation in order and execute it
-        for _, processor, operation, datasets in cls.global_operations:
-            print(f"Executing '{operation.__name__}' on processor '{processor.__class__.__name__}'")
-            # Check if processor is MergeProcessor
-            if isinstance(processor, MergeProcessor):
-                if len(datasets) < 2:
-                    raise ValueError("MergeProcessor requires at least two datasets for merging.")
-                # For MergeProcessor, pass multiple datasets
-                processor.process_operation(operation, *datasets)
+        self.execute_plan(self.compile())
+
+    @_pipeline_method
+    def execute_plan(self, plan: ExecutionPlan, bindings=None):
+        """
+        Run a compiled plan.
+
+        :param bindings: Datasets for the slots of the plan, by slot name (dict) or in slot order (sequence).
+            Unbound slots use the datasets the plan was compiled from.
+        """
+        graph = plan.bind(bindings)
+        datasets = list({id(dataset): dataset for step in graph.steps for dataset in step.datasets}.values())
+        # Datasets read from files only read the columns the plan keeps
+        push_down_projections(graph.steps)
+        # Settings are read once, so reconfiguring the pipeline does not affect runs in progress
+        with self._lock:
+            pool = _WorkerPool(self.parallel_backend, self.max_workers, self.transport)
+            scheduler, max_concurrent_steps = self.scheduler, self.max_concurrent_steps
+            profiler = self.profiler
+        # Spilling follows the remaining uses of each dataset in this run
+        schedule = spill_policy.start_run(graph.steps)
+        try:
+            if scheduler == 'dag':
+                graph.run(lambda step: self._run_step(step, pool, schedule, profiler),
+                         max_workers=max_concurrent_steps)
             else:
-                # For other processors, process each dataset individually
-                for dataset in datasets:
-                    processor.process_operation(operation, dataset)
+                # Loop through each operation in order and execute it
+                for step in graph.steps:
+                    self._run_step(step, pool, schedule, profiler)
+        finally:
+            spill_policy.end_run(schedule)
+            pool.close()
+            # Datasets keep their data, only the shared memory segments of this run are destroyed
+            for dataset in datasets:
+                dataset.release_shared_memory()
+
+        # Stream every chunked dataset through its queued operations into its sink
+        for dataset in datasets:
+            if isinstance(dataset, StreamingDataset) and dataset.sink is not None:
+                dataset.write()
@@ -0,0 +1,191 @@
+from typing import Callable, NamedTuple
+from core.scheduler import DependencyGraph
+from processors.merge_processor import MergeProcessor
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.data_validation_processor import DataValidationProcessor
+from utils.helper import check_operation_type, validate_order
+from utils.registry import registry
+from utils.cleaning_engine import is_fusable, FusedCleaningOperation
+
+# Operation type checked for the built-in operations of each processor
+PROCESSOR_OPERATION_TYPES = (
+    (DataCleaningProcessor, 'cleaning'),
+    (DataValidationProcessor, 'validation'),
+    (MergeProcessor, 'merge'),
+)
+
+
+class PlanStep(NamedTuple):
+    order: int
+    processor: object
+    operation: Callable
+    datasets: tuple
+
+
+class DatasetSlot:
+    """
+    Placeholder for a dataset of a compiled plan, bound to a Dataset when the plan runs.
+    """
+
+    def __init__(self, name: str, default=None):
+        self.name = name
+        self.default = default
+
+    def __repr__(self):
+        return repr(self.default) if self.default is not None else f"<slot '{self.name}'>"
+
+
+def fuse_cleaning_steps(operations: list) -> list:
+    """
+    Merge consecutive built-in cleaning steps queued on the same processor and datasets into one fused step.
+
+    :param operations: (order, processor, operation, datasets) tuples sorted by order.
+    :return: The steps to execute, in order.
+    """
+    steps = []
+    run = []
+
+    def flush():
+        if len(run) > 1:
+            order, processor, _, datasets = run[0]
+            steps.append((order, processor, FusedCleaningOperation([step[2] for step in run]), datasets))
+        else:
+            steps.extend(run)
+        run.clear()
+
+    for step in operations:
+        _, processor, operation, datasets = step
+        fusable = isinstance(processor, DataCleaningProcessor) and is_fusable(operation)
+        if run and not (fusable and processor is run[0][1] and list(datasets) == list(run[0][3])):
+            flush()
+        if fusable:
+            run.append(step)
+        else:
+            steps.append(step)
+    flush()
+
+    return steps
+
+
+def _validate_step(order, processor, operation, datasets):
+    validate_order(order)
+    if not callable(operation):
+        raise TypeError(f"The operation of step {order} is not callable.")
+    if not hasattr(processor, 'process_operation'):
+        raise TypeError(f"The processor of step {order} has no process_operation method.")
+    if not datasets:
+        raise ValueError(f"Step {order} has no datasets.")
+    if isinstance(processor, MergeProcessor) and len(datasets) < 2:
+        raise ValueError("MergeProcessor requires at least two datasets for merging.")
+
+    # Built-in operations must match their processor, custom operations run on any processor
+    if registry.is_built_in(getattr(operation, '__name__', None)):
+        for processor_type, operation_type in PROCESSOR_OPERATION_TYPES:
+            if isinstance(processor, processor_type):
+                check_operation_type(operation, operation_type)
+
+
+class ExecutionPlan:
+    """
+    An immutable, validated pipeline: steps sorted by order with consecutive built-in cleaning steps fused,
+    and the dependency graph between them.
+
+    The datasets of the steps are slots. Running the plan binds every slot to a Dataset, by slot name or
+    position, so the same plan runs against many datasets without validating, sorting or fusing again.
+    Slots compiled from Dataset objects default to them.
+    """
+
+    def __init__(self, steps: tuple, slots: tuple, graph: DependencyGraph):
+        self._steps = steps
+        self._slots = slots
+        self._graph = graph
+        self._slot_positions = {slot.name: position for position, slot in enumerate(slots)}
+        self._step_positions = tuple(tuple(self._slot_positions[slot.name] for slot in step.datasets)
+                                     for step in steps)
+
+    @classmethod
+    def compile(cls, operations: list) -> 'ExecutionPlan':
+        """
+        Compile pipeline steps into a plan.
+
+        :param operations: (order, processor, operation, datasets) tuples in any order. Datasets are Dataset
+            objects or slot names (strings) bound when the plan runs.
+        """
+        orders = set()
+        for order, processor, operation, datasets in operations:
+            _validate_step(order, processor, operation, datasets)
+            if order in orders:
+                raise ValueError(f"Duplicate order {order} found. Please use a different order number.")
+            orders.add(order)
+
+        slots = {}
+
+        def slot(dataset):
+            key = dataset if isinstance(dataset, str) else id(dataset)
+            if key not in slots:
+                if isinstance(dataset, str):
+                    slots[key] = DatasetSlot(dataset)
+                else:
+                    name = getattr(dataset, 'name', None)
+                    taken = {existing.name for existing in slots.values()}
+                    if not name or name in taken:
+                        name = f"dataset_{len(slots)}"
+                    slots[key] = DatasetSlot(name, default=dataset)
+            return slots[key]
+
+        resolved = [(order, processor, operation, tuple(slot(dataset) for dataset in datasets))
+                    for order, processor, operation, datasets in sorted(operations, key=lambda x: x[0])]
+        steps = tuple(PlanStep(*step) for step in fuse_cleaning_steps(resolved))
+        return cls(steps, tuple(slots.values()), DependencyGraph(steps))
+
+    @property
+    def steps(self) -> tuple:
+        return self._steps
+
+    @property
+    def slots(self) -> tuple:
+        """
+        Names of the dataset slots, in the order used to bind datasets by position.
+        """
+        return tuple(slot.name for slot in self._slots)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __repr__(self):
+        return f"<ExecutionPlan: {len(self._steps)} steps on {', '.join(self.slots)}>"
+
+    def bind(self, bindings=None) -> DependencyGraph:
+        """
+        Bind the slots to datasets.
+
+        :param bindings: Dict of slot name to Dataset, or a sequence of Datasets in slot order.
+            Slots that are not bound use the dataset they were compiled from.
+        :return: Dependency graph of the steps on the bound datasets.
+        """
+        datasets = [slot.default for slot in self._slots]
+        if isinstance(bindings, dict):
+            for name, dataset in bindings.items():
+                if name not in self._slot_positions:
+                    raise ValueError(f"Unknown dataset slot '{name}'. Use one of: {', '.join(self.slots)}.")
+                datasets[self._slot_positions[name]] = dataset
+        elif bindings is not None:
+            if len(bindings) != len(datasets):
+                raise ValueError(f"Expected {len(datasets)} datasets for slots {', '.join(self.slots)}, "
+                                 f"got {len(bindings)}.")
+            datasets = list(bindings)
+
+        unbound = [slot.name for slot, dataset in zip(self._slots, datasets) if dataset is None]
+        if unbound:
+            raise ValueError(f"No dataset bound to slots: {', '.join(unbound)}.")
+
+        steps = [step._replace(datasets=tuple(datasets[position] for position in positions))
+                 for step, positions in zip(self._steps, self._step_positions)]
+
+        # The compiled dependencies hold as long as every slot is bound to a different dataset
+        if len({id(dataset) for dataset in datasets}) == len(datasets):
+            return DependencyGraph.with_dependencies(steps, self._graph.dependencies)
+        return DependencyGraph(steps)
+
+    def describe(self) -> str:
+        return self._graph.describe()
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple
+from core.streaming import StreamingDataset
+from core.lazy_dataset import LazyDataset
+
+
+class StepRecord(NamedTuple):
+    order: int
+    operation: str
+    processor: str
+    datasets: tuple         # Name (or repr) of every dataset of the step
+    start: float            # Seconds since the profiler was created
+    wall_time: float        # Seconds
+    cpu_time: float         # CPU seconds of the process, worker processes excluded
+    rows_in: tuple          # Per dataset, None for a dataset whose data is not loaded (see frame_stats)
+    columns_in: tuple
+    rows_out: tuple
+    columns_out: tuple
+    memory_in: tuple        # Bytes of the DataFrame per dataset
+    memory_out: tuple
+    thread: int
+    error: str              # Type and message of the error raised by the step, None on success
+
+
+def dataset_label(dataset) -> str:
+    return dataset.name or repr(dataset)
+
+
+def frame_stats(dataset, deep: bool = True) -> tuple:
+    """
+    (rows, columns, bytes) of the data of a dataset, without loading a StreamingDataset that is not materialized
+    or a LazyDataset that is not loaded, nor mapping back spilled data (loading is part of the step that needs it).
+    """
+    if isinstance(dataset, StreamingDataset) and not dataset.is_materialized():
+        return None, None, None
+    if isinstance(dataset, LazyDataset) and not dataset.is_loaded():
+        return None, None, None
+    if dataset.is_spilled():
+        return None, None, None
+    df = dataset.get_data()
+    return df.shape[0], df.shape[1], int(df.memory_usage(index=True, deep=deep).sum())
+
+
+class StepProfiler:
+    """
+    Records metrics for every step an ExecutionManager runs (see ExecutionManager.configure_instrumentation).
+    Pipelines without a profiler measure nothing.
+
+    :param deep_memory: Count the memory of the Python objects held in object columns (e.g. strings).
+        Exact but proportional to the number of values, False only counts the column buffers.
+    :param hooks: Callables receiving every StepRecord as soon as its step finishes, e.g. to send it to a
+        metrics system.
+    """
+
+    def __init__(self, deep_memory: bool = True, hooks: List[Callable[[StepRecord], None]] = ()):
+        self.deep_memory = deep_memory
+        self.hooks = list(hooks)
+        self.records: List[StepRecord] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    @contextmanager
+    def measure(self, step):
+        """
+        Measure a step, (order, processor, operation, datasets), while it runs in the `with` block.
+        """
+        order, processor, operation, datasets = step
+        before = [frame_stats(dataset, self.deep_memory) for dataset in datasets]
+        error = None
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}"
+            raise
+        finally:
+            wall_time, cpu_time = time.perf_counter() - start, time.process_time() - cpu_start
+            after = [frame_stats(dataset, self.deep_memory) for dataset in datasets]
+            record = StepRecord(
+                order=order,
+                operation=getattr(operation, '__name__', repr(operation)),
+                processor=type(processor).__name__,
+                datasets=tuple(dataset_label(dataset) for dataset in datasets),
+                start=start - self._origin,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                rows_in=tuple(rows for rows, _, _ in before),
+                columns_in=tuple(columns for _, columns, _ in before),
+                rows_out=tuple(rows for rows, _, _ in after),
+                columns_out=tuple(columns for _, columns, _ in after),
+                memory_in=tuple(memory for _, _, memory in before),
+                memory_out=tuple(memory for _, _, memory in after),
+                thread=threading.get_ident(),
+                error=error,
+            )
+            with self._lock:
+                self.records.append(record)
+            for hook in self.hooks:
+                hook(record)
+
+    def to_records(self) -> List[dict]:
+        """
+        The records as dictionaries, in the order the steps finished.
+        """
+        with self._lock:
+            return [record._asdict() for record in self.records]
+
+    def to_jsonl(self, path):
+        """
+        Write one JSON object per step to a JSON lines file, appending to it so many runs can share a file.
+        """
+        with open(path, 'a') as file:
+            for record in self.to_records():
+                file.write(json.dumps(record) + '\n')
+
+    def to_chrome_trace(self, path=None) -> dict:
+        """
+        The records in the Chrome trace event format, to open in chrome://tracing or Perfetto.
+        Steps that ran concurrently appear on the lanes of their threads.
+
+        :param path: Also write the trace to this JSON file.
+        """
+        events = []
+        for record in self.to_records():
+            events.append({
+                'name': record['operation'],
+                'cat': record['processor'],
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['wall_time'] * 1e6,
+                'pid': os.getpid(),
+                'tid': record['thread'],
+                'args': {key: value for key, value in record.items()
+                         if key not in ('operation', 'processor', 'start', 'wall_time', 'thread')},
+            })
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as file:
+                json.dump(trace, file)
+        return trace
@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+from typing import Iterable, List
+import pandas as pd
+from core.dataset import Dataset
+from utils.helper import projected_columns, needed_columns
+from utils.schema import CompiledSchema
+from utils.arrow_backend import convert_string_columns
+
+logger = logging.getLogger(__name__)
+
+# File formats by file extension
+FILE_FORMATS = {
+    '.csv': 'csv', '.txt': 'csv',
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.feather': 'feather', '.arrow': 'feather', '.ipc': 'feather',
+}
+
+
+def detect_file_format(path) -> str:
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Cannot tell the format of '{path}' from its extension. "
+                         f"Pass file_format as one of: {', '.join(sorted(set(FILE_FORMATS.values())))}.")
+    return FILE_FORMATS[extension]
+
+
+def file_columns(path, file_format: str, read_kwargs: dict = None) -> List[str]:
+    """
+    Read the column names of a file without reading its rows.
+    """
+    if file_format == 'csv':
+        return pd.read_csv(path, nrows=0, **(read_kwargs or {})).columns.tolist()
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+
+        # Index columns written by pandas are restored by read_parquet, they are not data columns
+        return [name for name in pq.read_schema(path).names if not name.startswith('__index_level_')]
+    import pyarrow.ipc as ipc
+
+    with ipc.open_file(path) as reader:
+        return reader.schema.names
+
+
+def read_file(path, file_format: str, columns: List[str] = None, read_kwargs: dict = None) -> pd.DataFrame:
+    """
+    Read a file into a DataFrame, only the given columns if any.
+    """
+    read_kwargs = read_kwargs or {}
+    if file_format == 'csv':
+        if columns is not None:
+            read_kwargs = {**read_kwargs, 'usecols': columns}
+        return pd.read_csv(path, **read_kwargs)
+    if file_format == 'parquet':
+        return pd.read_parquet(path, columns=columns, **read_kwargs)
+    return pd.read_feather(path, columns=columns, **read_kwargs)
+
+
+class LazyDataset(Dataset):
+    """
+    A Dataset read from a file the first time its data is needed.
+
+    Before that, project() restricts the columns that are read. ExecutionManager does it from the plan: when a
+    step on the dataset declares the columns it keeps (see mark_as_column_projection), e.g. drop_invalid_columns
+    keeping the COLUMNS of the schema, and the steps before it declare the columns they read
+    (see mark_as_column_needs), the other columns are never read.
+    """
+
+    def __init__(self, path, file_format: str = None, schema_path=None, string_backend: str = None,
+                 name: str = None, storage: str = None, dtype_mode: str = None, schema: CompiledSchema = None,
+                 **read_kwargs):
+        file_format = file_format or detect_file_format(path)
+        if file_format not in ('csv', 'parquet', 'feather'):
+            raise ValueError(f"Invalid file format '{file_format}'. Use one of: csv, parquet, feather.")
+        super().__init__(None, schema_path, string_backend=string_backend, name=name, storage=storage,
+                         dtype_mode=dtype_mode, schema=schema)
+        self.path = path
+        self.file_format = file_format
+        self.read_kwargs = read_kwargs
+        self.columns = None  # Columns to read, None reads every column
+        self._load_lock = threading.Lock()
+
+    def is_loaded(self) -> bool:
+        return self.data is not None or self._spill is not None
+
+    def project(self, columns: Iterable[str]):
+        """
+        Read only these columns when the data is loaded, in file order. Columns missing from the file are ignored.
+        Has no effect once the data is loaded.
+        """
+        self.columns = set(columns)
+
+    def get_data(self) -> pd.DataFrame:
+        if not self.is_loaded():
+            with self._load_lock:
+                if not self.is_loaded():
+                    self.data = self._load()
+        # Spilled data is mapped back from its spill file, not read from the source file again
+        return super().get_data()
+
+    def _load(self) -> pd.DataFrame:
+        columns = None
+        if self.columns is not None:
+            available = file_columns(self.path, self.file_format, self.read_kwargs)
+            columns = [column for column in available if column in self.columns]
+            logger.debug("Reading %d of %d columns of '%s'", len(columns), len(available), self.path)
+        data = read_file(self.path, self.file_format, columns, self.read_kwargs)
+        data = convert_string_columns(data) if self.string_backend == 'pyarrow' else data
+        return self._apply_dtypes(data)
+
+    def __getstate__(self):
+        # Worker processes get the loaded data
+        self.get_data()
+        state = self.__dict__.copy()
+        del state['_load_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._load_lock = threading.Lock()
+
+
+def read_columns(operations, dataset) -> set:
+    """
+    Get the columns a dataset needs for a sequence of operations, None if it needs every column.
+
+    The operations up to the first one declaring a projection must declare the columns they read: the dataset
+    needs those and the projected columns. Columns dropped by the projection are never seen by later operations.
+    """
+    needed = set()
+    for operation in operations:
+        kept = projected_columns(operation, dataset)
+        if kept is not None:
+            return needed | kept
+        reads = needed_columns(operation, dataset)
+        if reads is None:
+            return None
+        needed |= reads
+    # Without a projection every column reaches the result
+    return None
+
+
+def push_down_projections(steps):
+    """
+    Restrict the columns read by the LazyDatasets of a plan that are not loaded yet to the columns the plan
+    needs (see read_columns).
+
+    :param steps: (order, processor, operation, datasets) steps in execution order.
+    """
+    operations = {}
+    for step in steps:
+        for dataset in step[3]:
+            if isinstance(dataset, LazyDataset) and not dataset.is_loaded():
+                operations.setdefault(id(dataset), (dataset, []))[1].append(step[2])
+
+    for dataset, dataset_operations in operations.values():
+        columns = read_columns(dataset_operations, dataset)
+        if columns is not None:
+            dataset.project(columns)
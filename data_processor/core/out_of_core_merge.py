@@ -0,0 +1,233 @@
+import copy
+import inspect
+import math
+import os
+import pickle
+import tempfile
+from typing import Callable, Iterable, Iterator, List
+import numpy as np
+import pandas as pd
+from core.streaming import StreamingDataset
+
+# Joins whose rows can come out without a match, and the side that then gets missing values
+NULLABLE_SIDES = {'left': ('right',), 'right': ('left',), 'outer': ('left', 'right'), 'inner': ()}
+
+
+def chunk_source(dataset) -> Callable[[], Iterable[pd.DataFrame]]:
+    """
+    Get a callable yielding the chunks of a dataset as it is now: a StreamingDataset that is not materialized
+    yields its chunks with the operations queued so far, any other Dataset yields its data in one chunk.
+    """
+    if isinstance(dataset, StreamingDataset) and not dataset.is_materialized():
+        snapshot = copy.copy(dataset)
+        snapshot.transforms = list(dataset.transforms)
+        return snapshot.iter_chunks
+    data = dataset.get_data()
+    return lambda: [data]
+
+
+def partition_ids(df: pd.DataFrame, merge_columns: List[str], partitions: int, hash_key: str) -> np.ndarray:
+    """
+    Partition of every row of a DataFrame by the hash of its merge columns.
+    Keys that pd.merge matches land in the same partition on both sides.
+    """
+    keys = {}
+    for column in merge_columns:
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            # pd.merge matches 1 with 1.0 and -0.0 with 0.0, adding 0.0 turns -0.0 into 0.0
+            values = values.astype('float64') + 0.0
+        else:
+            values = values.astype(object)
+        keys[column] = values
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(keys, copy=False), index=False, hash_key=hash_key)
+    return (hashes.to_numpy() % partitions).astype(np.intp)
+
+
+class _SpillFile:
+    """
+    DataFrames appended to a file on disk one after the other, with their estimated in-memory size.
+    Pickling keeps every dtype as it was.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.nbytes = 0
+        self._file = None
+
+    def append(self, df: pd.DataFrame, nbytes: int):
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+        pickle.dump(df, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(df)
+        self.nbytes += nbytes
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+
+
+class HashPartitionedMerge:
+    """
+    Out-of-core merge strategy for MergeProcessor, for datasets larger than memory.
+
+    Both inputs are read chunk by chunk and hash-partitioned on the merge columns into spill files, so rows
+    with the same key end up in the same partition on both sides. Each pair of partitions is then loaded and
+    joined with the merge operation itself, so every join type of merge_dfs gives the rows pd.merge gives.
+    Partition pairs larger than the memory budget are partitioned again with another hash, up to max_depth
+    times; a pair that is still too large (a single key holding most rows) is joined anyway.
+
+    Differences with merging in memory:
+        - Rows come out grouped by partition, not in the order pd.merge gives them.
+        - Columns of the side that can get missing values ('right' columns of a left join, 'left' columns of
+          a right join, both for an outer join) are upcast like pd.merge does for unmatched rows (e.g. int64
+          to float64) in every chunk, even when every row matches, so all chunks share one schema.
+
+    :param memory_budget: Bytes of input rows loaded at once to join a pair of partitions. The joined output
+        of the pair comes on top of it.
+    :param partitions: Number of partitions of the first pass.
+    :param spill_dir: Directory of the spill files, the system temporary directory by default.
+        Spill files are deleted once the merged chunks have been read.
+    :param max_depth: Number of times a partition pair larger than the budget is partitioned again.
+    """
+
+    def __init__(self, memory_budget: int = 256 * 2 ** 20, partitions: int = 16, spill_dir=None,
+                 max_depth: int = 3):
+        if not isinstance(memory_budget, int) or memory_budget <= 0:
+            raise ValueError(f"memory_budget must be a positive number of bytes. Got {memory_budget}.")
+        if not isinstance(partitions, int) or partitions < 1:
+            raise ValueError(f"partitions must be a positive whole number. Got {partitions}.")
+
+        self.memory_budget = memory_budget
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.max_depth = max_depth
+
+    def merge(self, operation, sources: List[Callable[[], Iterable[pd.DataFrame]]]) -> Iterator[pd.DataFrame]:
+        """
+        Merge chunked datasets with a merge operation, folding them left to right like MergeProcessor.
+
+        :param operation: Merge operation marked with mark_as_hash_partitionable, with its merge_columns bound
+            (see bind_arguments).
+        :param sources: Callables yielding the chunks of each dataset (see chunk_source).
+        :return: The merged chunks, computed as they are read.
+        """
+        arguments = inspect.signature(operation).bind_partial(**getattr(operation, '_bound_arguments', {}))
+        arguments.apply_defaults()
+        merge_columns = arguments.arguments.get('merge_columns')
+        if merge_columns is None:
+            raise ValueError("merge_columns must be provided")
+        merge_columns = [merge_columns] if isinstance(merge_columns, str) else list(merge_columns)
+        how = arguments.arguments.get('how', 'inner')
+        if how not in NULLABLE_SIDES:
+            raise ValueError(f"Invalid merge type '{how}' for an out-of-core merge. "
+                             f"Use one of: {', '.join(NULLABLE_SIDES)}.")
+
+        chunks = sources[0]()
+        for source in sources[1:]:
+            chunks = self._merge_pair(operation, chunks, source(), merge_columns, how)
+        return iter(chunks)
+
+    def _merge_pair(self, operation, left_chunks, right_chunks, merge_columns, how) -> Iterator[pd.DataFrame]:
+        with tempfile.TemporaryDirectory(prefix='merge_spill_', dir=self.spill_dir) as directory:
+            left, left_template = self._partition(left_chunks, merge_columns, self.partitions, 0, directory, 'left')
+            right, right_template = self._partition(right_chunks, merge_columns, self.partitions, 0, directory,
+                                                    'right')
+            templates = {'left': left_template, 'right': right_template}
+            for template in templates.values():
+                if template is None:
+                    continue
+                missing = [column for column in merge_columns if column not in template.columns]
+                if missing:
+                    raise KeyError(f"Merge columns not found: {', '.join(map(str, missing))}")
+
+            # Unmatched rows give missing values in the columns of the other side, cast them once up front
+            nullable = {}
+            for side in NULLABLE_SIDES.get(how, ()):
+                template = templates[side]
+                if template is not None:
+                    template = template.drop(columns=merge_columns)
+                    nullable[side] = template.reindex([0]).dtypes.to_dict()
+
+            for partition in range(self.partitions):
+                yield from self._join(operation, left[partition], right[partition], templates, nullable,
+                                      merge_columns, how, 1, directory, f'{partition}')
+
+    def _partition(self, chunks, merge_columns, partitions, depth, directory, name):
+        """
+        Write the rows of the chunks to one spill file per partition.
+
+        :return: The spill files, and an empty frame with the columns of the chunks (None without chunks).
+        """
+        files = [_SpillFile(os.path.join(directory, f'{name}_{partition}.pkl')) for partition in range(partitions)]
+        template = None
+        hash_key = f"partition{depth:07d}"
+        try:
+            for chunk in chunks:
+                if template is None:
+                    template = chunk.iloc[:0]
+                if not len(chunk):
+                    continue
+                # Share the size of the chunk between its partitions by row count
+                row_bytes = chunk.memory_usage(index=False, deep=True).sum() / len(chunk)
+                ids = partition_ids(chunk, merge_columns, partitions, hash_key)
+                order = np.argsort(ids, kind='stable')
+                bounds = np.searchsorted(ids[order], np.arange(partitions + 1))
+                for partition in range(partitions):
+                    rows = order[bounds[partition]:bounds[partition + 1]]
+                    if len(rows):
+                        files[partition].append(chunk.iloc[rows].reset_index(drop=True),
+                                                int(row_bytes * len(rows)))
+        finally:
+            for file in files:
+                file.close()
+        return files, template
+
+    def _join(self, operation, left: _SpillFile, right: _SpillFile, templates, nullable, merge_columns, how, depth,
+              directory, name) -> Iterator[pd.DataFrame]:
+        # Rows of a side only come out unmatched when the other side is nullable
+        sides = NULLABLE_SIDES[how]
+        if not (left.rows and right.rows) and not (left.rows and 'right' in sides) \
+                and not (right.rows and 'left' in sides):
+            return
+
+        if left.nbytes + right.nbytes > self.memory_budget and depth <= self.max_depth:
+            partitions = 2 * math.ceil((left.nbytes + right.nbytes) / self.memory_budget)
+            lefts, _ = self._partition(left, merge_columns, partitions, depth, directory, f'left_{name}')
+            rights, _ = self._partition(right, merge_columns, partitions, depth, directory, f'right_{name}')
+            left.remove()
+            right.remove()
+            for partition in range(partitions):
+                yield from self._join(operation, lefts[partition], rights[partition], templates, nullable,
+                                      merge_columns, how, depth + 1, directory, f'{name}_{partition}')
+            return
+
+        frames = {}
+        for side, spill in (('left', left), ('right', right)):
+            pieces = list(spill)
+            template = templates[side]
+            if template is None:
+                template = pd.DataFrame(columns=merge_columns)
+            frame = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else (pieces[0] if pieces else template)
+            dtypes = {column: dtype for column, dtype in nullable.get(side, {}).items()
+                      if frame[column].dtype != dtype}
+            frames[side] = frame.astype(dtypes) if dtypes else frame
+
+        joined = operation(frames['left'], frames['right'])
+        if len(joined):
+            yield joined
@@ -0,0 +1,149 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from processors.merge_processor import MergeProcessor
+
+
+def step_access(step) -> tuple:
+    """
+    Get the ids of the datasets a step reads and writes.
+
+    Merges read every dataset and write the first one, other steps read and write each of their datasets.
+    """
+    _, processor, _, datasets = step
+    reads = {id(dataset) for dataset in datasets}
+    writes = {id(datasets[0])} if isinstance(processor, MergeProcessor) and datasets else set(reads)
+    return reads, writes
+
+
+class DependencyGraph:
+    """
+    Dependency graph of the steps of a pipeline, built from the datasets each step reads and writes.
+
+    A step depends on every earlier step it conflicts with (write/read, read/write or write/write on the
+    same dataset), so running the graph gives the same results as running the steps in order.
+    """
+
+    def __init__(self, steps: list):
+        self.steps = list(steps)
+        self.dependencies = [set() for _ in self.steps]
+
+        last_writer = {}
+        readers_since_write = {}
+        for index, step in enumerate(self.steps):
+            reads, writes = step_access(step)
+            for dataset_id in reads | writes:
+                if dataset_id in last_writer:
+                    self.dependencies[index].add(last_writer[dataset_id])
+            for dataset_id in writes:
+                self.dependencies[index].update(readers_since_write.get(dataset_id, ()))
+
+            for dataset_id in reads - writes:
+                readers_since_write.setdefault(dataset_id, set()).add(index)
+            for dataset_id in writes:
+                last_writer[dataset_id] = index
+                readers_since_write[dataset_id] = set()
+
+    @classmethod
+    def with_dependencies(cls, steps: list, dependencies: list) -> 'DependencyGraph':
+        """
+        Build a graph whose dependencies are already known, e.g. a compiled plan bound to new datasets.
+        """
+        graph = cls.__new__(cls)
+        graph.steps = list(steps)
+        graph.dependencies = [set(step_dependencies) for step_dependencies in dependencies]
+        return graph
+
+    def levels(self) -> list:
+        """
+        Group the steps by depth: every step of a level only depends on steps of earlier levels.
+        """
+        depth = []
+        for index in range(len(self.steps)):
+            depth.append(1 + max((depth[dependency] for dependency in self.dependencies[index]), default=0))
+
+        levels = [[] for _ in range(max(depth, default=0))]
+        for index, level in enumerate(depth):
+            levels[level - 1].append(index)
+        return levels
+
+    def critical_path(self) -> list:
+        """
+        Get the longest chain of dependent steps, the lower bound on the number of sequential steps.
+        """
+        length = []
+        previous = []
+        for index in range(len(self.steps)):
+            best = max(self.dependencies[index], key=lambda dependency: length[dependency], default=None)
+            length.append(1 if best is None else length[best] + 1)
+            previous.append(best)
+
+        if not length:
+            return []
+
+        index = max(range(len(length)), key=lambda i: length[i])
+        path = []
+        while index is not None:
+            path.append(index)
+            index = previous[index]
+        return path[::-1]
+
+    def describe(self) -> str:
+        """
+        Describe the plan: steps per level with their dependencies, and the critical path.
+        """
+        levels = self.levels()
+        critical_path = self.critical_path()
+        lines = [f"Execution plan: {len(self.steps)} steps in {len(levels)} levels, "
+                 f"critical path of {len(critical_path)} steps"]
+
+        for number, level in enumerate(levels, start=1):
+            lines.append(f"Level {number} ({len(level)} concurrent):")
+            for index in level:
+                lines.append(f"  {self._describe_step(index)}")
+
+        lines.append("Critical path: " + " -> ".join(f"[{self.steps[index][0]}]" for index in critical_path))
+        return "\n".join(lines)
+
+    def _describe_step(self, index: int) -> str:
+        order, processor, operation, datasets = self.steps[index]
+        description = (f"[{order}] {getattr(operation, '__name__', operation)} on {processor.__class__.__name__} "
+                       f"-> {', '.join(repr(dataset) for dataset in datasets)}")
+        if self.dependencies[index]:
+            orders = sorted(self.steps[dependency][0] for dependency in self.dependencies[index])
+            description += f" (after {', '.join(f'[{order}]' for order in orders)})"
+        return description
+
+    def run(self, run_step, max_workers: int = None):
+        """
+        Run the steps on a thread pool, starting each one as soon as the steps it depends on are done.
+        On failure no new step is started and the first error is raised once running steps finish.
+        """
+        remaining = {index: set(dependencies) for index, dependencies in enumerate(self.dependencies)}
+        dependents = [[] for _ in self.steps]
+        for index, dependencies in enumerate(self.dependencies):
+            for dependency in dependencies:
+                dependents[dependency].append(index)
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for index in [index for index, dependencies in remaining.items() if not dependencies]:
+                    del remaining[index]
+                    running[executor.submit(run_step, self.steps[index])] = index
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    if future.exception() is not None:
+                        errors.append((index, future.exception()))
+                        continue
+                    for dependent in dependents[index]:
+                        remaining[dependent].discard(index)
+                if not errors:
+                    submit_ready()
+
+        if errors:
+            raise min(errors, key=lambda error: error[0])[1]
@@ -0,0 +1,222 @@
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from utils.arrow_backend import pa, is_arrow_string
+
+# Column buffers are aligned so NumPy and Arrow views into the segment are aligned for any dtype
+ALIGNMENT = 64
+
+
+class _Segment(shared_memory.SharedMemory):
+    """
+    SharedMemory segment that is never unmapped explicitly.
+
+    NumPy views keep a reference to the mapping but no buffer export, so closing the mapping under them
+    would crash instead of raising. The mapping is unmapped when the last view of it is garbage collected.
+    """
+
+    def close(self):
+        self._buf = None
+        self._mmap = None
+        if getattr(self, '_fd', -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _missing_value(series: pd.Series):
+    """
+    Get the single missing value marker of an object column (None or NaN), or raise ValueError if they are mixed.
+    """
+    missing = series[series.isna()]
+    if missing.empty or all(value is None for value in missing):
+        return None
+    if all(isinstance(value, float) for value in missing):
+        return np.nan
+    raise ValueError("Mixed missing value markers.")
+
+
+def _column_buffers(series: pd.Series):
+    """
+    Get the buffers of a column that can be placed in shared memory.
+
+    :return: (spec, buffers) where spec describes how to rebuild the column, or None for columns that are pickled.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        values = np.ascontiguousarray(series.to_numpy())
+        return {'kind': 'numpy', 'dtype': values.dtype.str, 'length': len(values)}, [values]
+
+    if pa is None:
+        return None
+
+    if is_arrow_string(series):
+        array = series.array._pa_array.combine_chunks()
+        spec = {'kind': 'arrow', 'pandas': 'string'}
+    elif dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        try:
+            missing = _missing_value(series)
+        except ValueError:
+            return None
+        array = pa.array(series.to_numpy(), type=pa.large_string(), from_pandas=True)
+        spec = {'kind': 'arrow', 'pandas': 'object', 'missing': missing}
+    else:
+        return None
+
+    spec.update(type=array.type, length=len(array), null_count=array.null_count, offset=array.offset)
+    return spec, array.buffers()
+
+
+class SharedFrame:
+    """
+    A DataFrame whose column buffers live in one shared memory segment.
+
+    Numeric, boolean and datetime columns are stored as raw NumPy buffers and string columns as Arrow buffers
+    (validity, offsets and data). Other columns and the index are pickled with the handle. A SharedFrame is
+    picklable: the pickle only holds the segment name and layout, so sending it to a worker process does not
+    copy the data, and the worker builds its DataFrame on views of the segment.
+
+    The process that created the segment owns it and unlinks it on release(). Ownership of a segment
+    created by a worker is passed to the receiving process with claim().
+    """
+
+    def __init__(self, segment_name: str, columns: pd.Index, index: pd.Index, layout: list):
+        self.segment_name = segment_name
+        self.columns = columns
+        self.index = index
+        self.layout = layout
+        self.owner = False
+        self.source = None
+        self._segment = None
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'SharedFrame':
+        """
+        Copy the columns of a DataFrame into a new shared memory segment owned by this process.
+        """
+        columns = []
+        size = 0
+        for position in range(df.shape[1]):
+            shared = _column_buffers(df.iloc[:, position])
+            if shared is None:
+                columns.append(({'kind': 'pickle', 'series': df.iloc[:, position]}, []))
+                continue
+            spec, buffers = shared
+            regions = []
+            for buffer in buffers:
+                if buffer is None:
+                    regions.append(None)
+                    continue
+                nbytes = buffer.nbytes if isinstance(buffer, np.ndarray) else buffer.size
+                regions.append((size, nbytes))
+                size += _aligned(nbytes)
+            spec['regions'] = regions
+            columns.append((spec, buffers))
+
+        segment = _Segment(create=True, size=max(size, 1))
+        try:
+            memory = np.frombuffer(segment.buf, dtype=np.uint8)
+            for spec, buffers in columns:
+                for region, buffer in zip(spec.get('regions', ()), buffers):
+                    if region is not None:
+                        start, nbytes = region
+                        memory[start:start + nbytes] = np.frombuffer(buffer, dtype=np.uint8, count=nbytes)
+            del memory
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+
+        frame = cls(segment.name, df.columns, df.index, [spec for spec, _ in columns])
+        frame.owner = True
+        frame.source = df
+        frame._segment = segment
+        return frame
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Only the layout travels, the receiving process attaches to the segment by name
+        state.update(owner=False, source=None, _segment=None)
+        return state
+
+    def claim(self):
+        """
+        Take ownership of a segment created by another process, so release() unlinks it.
+        """
+        self.owner = True
+        return self
+
+    def to_dataframe(self, writeable: bool = True) -> pd.DataFrame:
+        """
+        Build a DataFrame on views of the segment. Numeric columns and Arrow backed string columns are not copied,
+        object string columns are decoded from their Arrow buffers.
+
+        :param writeable: False makes the NumPy views read-only, so a worker cannot change the data of its parent.
+        """
+        if self._segment is None:
+            self._segment = _Segment(name=self.segment_name)
+        buffer = self._segment.buf
+
+        data = {}
+        for position, spec in enumerate(self.layout):
+            if spec['kind'] == 'pickle':
+                data[position] = spec['series'].to_numpy()
+            elif spec['kind'] == 'numpy':
+                start, _ = spec['regions'][0]
+                values = np.ndarray(spec['length'], dtype=np.dtype(spec['dtype']), buffer=buffer, offset=start)
+                if not writeable:
+                    values.flags.writeable = False
+                data[position] = values
+            else:
+                data[position] = self._arrow_column(buffer, spec)
+
+        if any(spec['kind'] == 'pickle' for spec in self.layout):
+            # Pickled columns keep their own dtype (e.g. categorical or nullable integer)
+            df = pd.concat([pd.Series(data[position], index=self.index, copy=False) if spec['kind'] != 'pickle'
+                            else spec['series'] for position, spec in enumerate(self.layout)], axis=1, copy=False)
+        else:
+            df = pd.DataFrame(data, index=self.index, copy=False)
+        df.columns = self.columns
+        return df
+
+    @staticmethod
+    def _arrow_column(buffer, spec: dict):
+        buffers = [None if region is None else pa.py_buffer(buffer[region[0]:region[0] + region[1]])
+                   for region in spec['regions']]
+        array = pa.Array.from_buffers(spec['type'], spec['length'], buffers,
+                                      null_count=spec['null_count'], offset=spec['offset'])
+        if spec['pandas'] == 'string':
+            return pd.arrays.ArrowStringArray(pa.chunked_array([array]))
+
+        values = array.to_numpy(zero_copy_only=False)
+        if spec['missing'] is not None and spec['null_count']:
+            values[array.is_null().to_numpy(zero_copy_only=False)] = spec['missing']
+        return values
+
+    def close(self):
+        """
+        Detach this process from the segment without destroying it.
+        """
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def release(self):
+        """
+        Detach from the segment and, if this process owns it, destroy it. DataFrames already built on the
+        segment stay valid, the memory is returned once they are garbage collected.
+        """
+        if self.owner:
+            try:
+                segment = self._segment or _Segment(name=self.segment_name)
+                segment.unlink()
+                segment.close()
+            except FileNotFoundError:
+                pass
+            self.owner = False
+        self.source = None
+        self.close()
@@ -0,0 +1,273 @@
+import logging
+import os
+import tempfile
+import threading
+import uuid
+import weakref
+import numpy as np
+import pandas as pd
+from utils.arrow_backend import pa
+
+logger = logging.getLogger(__name__)
+
+# Storage modes of a Dataset: 'memory' keeps the data in RAM, 'spill' lets the spill policy move idle data to disk
+STORAGE_MODES = ('memory', 'spill')
+
+
+def check_storage(storage: str):
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"Invalid storage '{storage}'. Use one of: {', '.join(STORAGE_MODES)}.")
+    if storage == 'spill' and pa is None:
+        raise ImportError("The 'spill' storage requires the pyarrow package.")
+
+
+class SpillFile:
+    """
+    A DataFrame written to an uncompressed Arrow IPC (Feather v2) file.
+
+    Loading maps the file copy-on-write: numeric, boolean and datetime columns without missing values and
+    Arrow-backed string columns are views of the mapping, paged in by the OS on access. Writes to the views go to
+    private pages, the file is never changed. Other columns (e.g. object strings, columns with missing values)
+    are converted on load. The file is deleted with the object.
+    """
+
+    def __init__(self, df: pd.DataFrame, directory):
+        import pyarrow.ipc as ipc
+
+        # Arrow has a single null, checked first so nothing is written for data that would not round-trip
+        null_sentinels = object_null_sentinels(df)
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.arrow")
+        table = pa.Table.from_pandas(df)
+        try:
+            with pa.OSFile(path, 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except BaseException:
+            _remove(path)
+            raise
+        self.path = path
+        # Pandas strings come back Arrow-backed, the ones stored in Python objects are converted back
+        self._python_strings = {column: dtype for column, dtype in df.dtypes.items()
+                                if isinstance(dtype, pd.StringDtype) and dtype.storage != 'pyarrow'}
+        self._null_sentinels = null_sentinels
+        self._finalizer = weakref.finalize(self, _remove, path)
+
+    def load(self) -> pd.DataFrame:
+        import pyarrow.ipc as ipc
+
+        mapping = np.memmap(self.path, mode='c')
+        table = ipc.open_file(pa.BufferReader(pa.py_buffer(mapping))).read_all()
+        with pd.option_context('mode.string_storage', 'pyarrow'):
+            df = table.to_pandas(split_blocks=True)
+
+        # Arrow hands out read-only views, rebuild NumPy columns as writeable views of the same mapped pages
+        start, columns = mapping.ctypes.data, []
+        for position, dtype in enumerate(df.dtypes):
+            column = df.iloc[:, position]
+            if position in self._null_sentinels:
+                values = column.to_numpy(dtype=object, copy=True)
+                values[column.isna().to_numpy()] = self._null_sentinels[position]
+                column = pd.Series(values, index=df.index, name=column.name, copy=False)
+            elif isinstance(dtype, np.dtype) and dtype != object:
+                values = column.to_numpy(copy=False)
+                offset = values.ctypes.data - start
+                if not values.flags.writeable and 0 <= offset <= mapping.nbytes - values.nbytes:
+                    values = np.ndarray(values.shape, dtype=values.dtype, buffer=mapping, offset=offset)
+                    column = pd.Series(values, index=df.index, name=column.name, copy=False)
+            columns.append(column)
+        if columns:
+            df = pd.concat(columns, axis=1, copy=False)
+        return df.astype(self._python_strings) if self._python_strings else df
+
+    def remove(self):
+        self._finalizer()
+
+    def __getstate__(self):
+        # Copies sent to worker processes read the file, only this object deletes it
+        return {'path': self.path, '_python_strings': self._python_strings, '_null_sentinels': self._null_sentinels}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._finalizer = lambda: None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        # Already removed, or still mapped on platforms that do not allow it, e.g. Windows
+        pass
+
+
+def object_null_sentinels(df: pd.DataFrame) -> dict:
+    """
+    Get the missing value of the object columns holding one other than None, by column position.
+    Arrow reads every missing value back as None.
+
+    :raises ValueError: If an object column mixes missing values, e.g. None and NaN.
+    """
+    sentinels = {}
+    for position, dtype in enumerate(df.dtypes):
+        if dtype != object:
+            continue
+        column = df.iloc[:, position]
+        missing = column[column.isna()]
+        if not len(missing):
+            continue
+        # NaN != NaN, so missing values are told apart by type
+        kinds = {type(value): value for value in missing}
+        if len(kinds) > 1:
+            raise ValueError(f"Column '{column.name}' mixes missing values: {', '.join(map(repr, kinds.values()))}.")
+        sentinel = next(iter(kinds.values()))
+        if sentinel is not None:
+            sentinels[position] = sentinel
+    return sentinels
+
+
+def spill_frame(df: pd.DataFrame, directory) -> SpillFile:
+    """
+    Write a DataFrame to a SpillFile, if it round-trips through Arrow: unique string column names, column
+    types Arrow can hold (not e.g. object columns mixing numbers and strings) and a single kind of missing value
+    per object column.
+
+    :return: The SpillFile, None if the DataFrame cannot be spilled.
+    """
+    if (isinstance(df.columns, pd.MultiIndex) or not df.columns.is_unique
+            or not all(isinstance(column, str) for column in df.columns)):
+        return None
+    try:
+        return SpillFile(df, directory)
+    except (pa.ArrowException, ValueError, OSError) as error:
+        logger.debug("Cannot spill a DataFrame: %s", error)
+        return None
+
+
+class SpillSchedule:
+    """
+    The uses of every dataset by the steps of one run, and which steps are done.
+    """
+
+    def __init__(self, steps):
+        self.positions = {id(step): position for position, step in enumerate(steps)}
+        self.uses = {}
+        for position, step in enumerate(steps):
+            for dataset in step[3]:
+                self.uses.setdefault(id(dataset), []).append(position)
+        self.done = set()
+
+    def next_use(self, dataset) -> int:
+        """
+        Number of steps left to run before the next step using the dataset, None if no remaining step uses it.
+        """
+        remaining = [position for position in self.uses.get(id(dataset), ()) if position not in self.done]
+        if not remaining:
+            return None
+        return sum(1 for position in range(remaining[0]) if position not in self.done)
+
+
+class SpillPolicy:
+    """
+    Process-wide policy moving the data of idle Datasets with storage='spill' to disk when the Datasets holding
+    data in memory exceed the memory budget.
+
+    After every step of a run, Datasets that are not used by a running step are spilled, in order: those no
+    remaining step uses (or not used by any running pipeline), then those whose next use is the furthest away,
+    until the memory held is within the budget. Spilled data is mapped back by Dataset.get_data.
+
+    :param memory_budget: Bytes of DataFrame memory the spillable Datasets may hold, None never spills.
+    :param directory: Directory of the spill files, a new temporary directory by default.
+    """
+
+    def __init__(self, memory_budget: int = None, directory=None):
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self._datasets = weakref.WeakValueDictionary()  # Spillable Datasets holding data in memory, by id
+        self._pins = {}                                  # Number of running steps using each Dataset, by id
+        self._schedules = []
+        self._lock = threading.RLock()
+
+    def configure(self, memory_budget: int = None, directory=None):
+        """
+        Set the memory budget (bytes) and spill directory. A budget of None disables spilling.
+        """
+        if memory_budget is not None and (not isinstance(memory_budget, int) or memory_budget < 0):
+            raise ValueError(f"memory_budget must be a positive number of bytes. Got {memory_budget}.")
+        with self._lock:
+            self.memory_budget = memory_budget
+            self.directory = directory
+
+    def spill_directory(self):
+        with self._lock:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix='dataset_spill_')
+            os.makedirs(self.directory, exist_ok=True)
+            return self.directory
+
+    def track(self, dataset):
+        """
+        Register a Dataset whose data is in memory and may be spilled.
+        """
+        with self._lock:
+            self._datasets[id(dataset)] = dataset
+
+    def untrack(self, dataset):
+        with self._lock:
+            self._datasets.pop(id(dataset), None)
+
+    def start_run(self, steps) -> SpillSchedule:
+        schedule = SpillSchedule(steps)
+        with self._lock:
+            self._schedules.append(schedule)
+        return schedule
+
+    def end_run(self, schedule: SpillSchedule):
+        with self._lock:
+            self._schedules.remove(schedule)
+
+    def step_started(self, schedule: SpillSchedule, step):
+        with self._lock:
+            for dataset in step[3]:
+                self._pins[id(dataset)] = self._pins.get(id(dataset), 0) + 1
+
+    def step_finished(self, schedule: SpillSchedule, step):
+        """
+        Mark a step as done and spill idle Datasets while the memory held exceeds the budget.
+        """
+        with self._lock:
+            schedule.done.add(schedule.positions[id(step)])
+            for dataset in step[3]:
+                self._pins[id(dataset)] -= 1
+                if not self._pins[id(dataset)]:
+                    del self._pins[id(dataset)]
+            self.enforce()
+
+    def _distance(self, dataset) -> float:
+        # Steps before the dataset is needed again, by the closest running pipeline
+        distances = [schedule.next_use(dataset) for schedule in self._schedules]
+        distances = [distance for distance in distances if distance is not None]
+        return min(distances) if distances else float('inf')
+
+    def enforce(self):
+        """
+        Spill idle Datasets, the ones needed last first, until the memory held is within the budget.
+        """
+        with self._lock:
+            if self.memory_budget is None:
+                return
+            resident = [dataset for dataset in list(self._datasets.values()) if dataset.is_resident()]
+            held = sum(dataset.memory_usage() for dataset in resident)
+            if held <= self.memory_budget:
+                return
+
+            idle = [dataset for dataset in resident if id(dataset) not in self._pins]
+            for dataset in sorted(idle, key=self._distance, reverse=True):
+                nbytes = dataset.memory_usage()
+                if dataset.spill():
+                    logger.debug("Spilled %r (%d bytes)", dataset, nbytes)
+                    held -= nbytes
+                if held <= self.memory_budget:
+                    return
+
+
+# Policy shared by every Dataset and pipeline of the process
+spill_policy = SpillPolicy()
@@ -0,0 +1,208 @@
+import pandas as pd
+from typing import Callable, Iterable, Iterator
+from core.dataset import Dataset
+from utils.helper import is_row_local, is_stateful_chunks, FullDatasetRequiredError
+from utils.arrow_backend import convert_string_columns
+
+# How a StreamingDataset handles operations that need every row at once (e.g. remove_duplicates or merges)
+FULL_DATASET_STRATEGIES = ('raise', 'materialize')
+
+
+class CsvSink:
+    """
+    Sink writing chunks to a single CSV file as they arrive.
+    """
+
+    def __init__(self, path, **to_csv_kwargs):
+        self.path = path
+        self.to_csv_kwargs = to_csv_kwargs
+        self._header_written = False
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self.path, mode='a' if self._header_written else 'w', header=not self._header_written,
+                     index=False, **self.to_csv_kwargs)
+        self._header_written = True
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    """
+    Sink writing chunks as row groups of a single Parquet file. Every chunk must have the schema of the first one.
+    """
+
+    def __init__(self, path, **writer_kwargs):
+        self.path = path
+        self.writer_kwargs = writer_kwargs
+        self._writer = None
+
+    def write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._writer = pq.ParquetWriter(self.path, table.schema, **self.writer_kwargs)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class StreamingDataset(Dataset):
+    """
+    A Dataset backed by a chunked source instead of a materialized DataFrame.
+
+    Row-local operations are queued and applied chunk by chunk when the dataset is iterated
+    or written to its sink, so memory is bounded by the chunk size.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[pd.DataFrame]], schema_path = None, sink = None,
+                 full_dataset_strategy: str = 'raise', string_backend: str = None, name: str = None):
+
+        if full_dataset_strategy not in FULL_DATASET_STRATEGIES:
+            raise ValueError(f"Invalid full dataset strategy '{full_dataset_strategy}'. "
+                             f"Use one of: {', '.join(FULL_DATASET_STRATEGIES)}.")
+
+        # Chunks are streamed as they are read, only materialized data is ever held
+        super().__init__(None, schema_path, string_backend=string_backend, name=name, storage='memory',
+                         dtype_mode='keep')
+        self.source = source
+        self.sink = sink
+        self.full_dataset_strategy = full_dataset_strategy
+        self.transforms = []
+
+    @classmethod
+    def from_csv(cls, path, chunksize: int = 100_000, schema_path = None, sink = None,
+                 full_dataset_strategy: str = 'raise', **read_csv_kwargs):
+        """
+        Stream a CSV file in chunks of `chunksize` rows.
+        """
+        def source():
+            with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+                yield from reader
+
+        return cls(source, schema_path=schema_path, sink=sink, full_dataset_strategy=full_dataset_strategy)
+
+    @classmethod
+    def from_parquet(cls, path, batch_size: int = 100_000, schema_path = None, sink = None,
+                     full_dataset_strategy: str = 'raise', columns = None):
+        """
+        Stream a Parquet file in record batches of `batch_size` rows.
+        """
+        def source():
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+                yield batch.to_pandas()
+
+        return cls(source, schema_path=schema_path, sink=sink, full_dataset_strategy=full_dataset_strategy)
+
+    def is_materialized(self) -> bool:
+        return self.data is not None
+
+    def set_source(self, source: Callable[[], Iterable[pd.DataFrame]]):
+        """
+        Replace the chunked source of the dataset, e.g. with the output of an out-of-core merge.
+        Queued operations and materialized data are dropped, they are part of the new source.
+        """
+        self.source = source
+        self.set_data(None)
+
+    def pipe(self, transform: Callable[[pd.DataFrame], pd.DataFrame]):
+        """
+        Queue a transformation to run on every chunk.
+        """
+        if self.is_materialized():
+            self.set_data(transform(self.data))
+        else:
+            self.transforms.append(transform)
+
+    def queue_operation(self, processor, operation):
+        """
+        Queue an operation through its processor. Operations that need the whole dataset are handled
+        by the full dataset strategy: 'raise' refuses them, 'materialize' loads every chunk into memory first.
+        """
+        if self.is_materialized() or is_row_local(operation) or is_stateful_chunks(operation):
+            self.pipe(lambda chunk: self._process_chunk(processor, operation, chunk))
+        else:
+            self.require_full_dataset(operation)
+            processor.process_operation(operation, self)
+
+    def require_full_dataset(self, operation):
+        """
+        Apply the full dataset strategy before running an operation that needs every row at once.
+        """
+        if self.is_materialized():
+            return
+
+        if self.full_dataset_strategy == 'raise':
+            raise FullDatasetRequiredError(
+                f"The operation '{getattr(operation, '__name__', operation)}' needs the whole dataset and cannot run "
+                f"chunk by chunk. Use full_dataset_strategy='materialize' to load the dataset into memory."
+            )
+        self.set_data(self._concat_chunks())
+
+    def _process_chunk(self, processor, operation, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Every chunk keeps its dtypes, so they concatenate, and stays in memory
+        chunk_dataset = Dataset(chunk, string_backend='python', name=self.name, storage='memory', dtype_mode='keep',
+                                schema=self.schema)
+        return processor.process_operation(operation, chunk_dataset).get_data()
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the chunks of the dataset with every queued transformation applied.
+        """
+        if self.is_materialized():
+            yield self.data
+            return
+
+        for chunk in self.source():
+            if self.string_backend == 'pyarrow':
+                chunk = convert_string_columns(chunk)
+            for transform in self.transforms:
+                chunk = transform(chunk)
+            yield chunk
+
+    def write(self, sink = None) -> int:
+        """
+        Run the queued operations chunk by chunk and write the results to the sink.
+
+        :return: Number of rows written.
+        """
+        sink = sink or self.sink
+        if sink is None:
+            raise ValueError("No sink provided to write the streaming dataset to.")
+
+        rows = 0
+        try:
+            for chunk in self.iter_chunks():
+                sink.write(chunk)
+                rows += len(chunk)
+        finally:
+            if hasattr(sink, 'close'):
+                sink.close()
+
+        return rows
+
+    def get_data(self) -> pd.DataFrame:
+        """
+        Load every chunk into one DataFrame. This reads the whole dataset into memory.
+        """
+        if self.is_materialized():
+            return self.data
+        return self._concat_chunks()
+
+    def _concat_chunks(self) -> pd.DataFrame:
+        chunks = list(self.iter_chunks())
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    def set_data(self, data: pd.DataFrame):
+
+        super().set_data(data)
+        self.transforms = []
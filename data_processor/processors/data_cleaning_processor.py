@@ -1,12 +1,27 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from core.dataset import Dataset
-from utils.helper import get_operation_list
+from utils.helper import get_operation_list, is_row_local
+from utils.cleaning_engine import split_fusable_runs
 from utils.exception_handler import ExceptionHandler
 
 class DataCleaningProcessor():
-    
-    def __init__(self):
-        
-        self.exception_handler = ExceptionHandler() 
+
+    def __init__(self, partitions: int = None, max_workers: int = None, min_partition_rows: int = 1_000_000):
+        """
+        :param partitions: Split DataFrames into this many row partitions for row-local operations,
+            each partition runs in a worker process. None runs every operation on the whole frame.
+        :param max_workers: Size of the process pool, defaults to the number of partitions.
+        :param min_partition_rows: DataFrames with fewer rows than this are not partitioned.
+        """
+        if partitions is not None and (not isinstance(partitions, int) or partitions <= 0):
+            raise ValueError(f"partitions must be a positive whole number. Got {partitions}.")
+
+        self.exception_handler = ExceptionHandler()
+        self.partitions = partitions
+        self.max_workers = max_workers
+        self.min_partition_rows = min_partition_rows
 
     def process_operation(self, operation, dataset: Dataset):
         """
@@ -14,12 +29,43 @@ class DataCleaningProcessor():
         """
         try:
             df = dataset.get_data()
-            df = operation(df)
+            if self._should_partition(operation, df):
+                df = self._process_partitions(operation, df)
+            else:
+                df = operation(df)
             dataset.set_data(df)
-            
+
         except Exception as error:
-            self.exception_handler.handle(operation, error)
-        
+            self.exception_handler.handle(operation, error, dataset)
+
+        return dataset
+
+    def _should_partition(self, operation, df: pd.DataFrame) -> bool:
+        # Operations like remove_duplicates need every row and always run on the whole frame
+        return (self.partitions is not None and self.partitions > 1 and is_row_local(operation)
+                and len(df) >= self.min_partition_rows)
+
+    def _process_partitions(self, operation, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run a row-local operation on row partitions in a process pool and concatenate the results,
+        keeping the original index.
+        """
+        bounds = np.linspace(0, len(df), self.partitions + 1).astype(int)
+        partitions = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+        with ProcessPoolExecutor(max_workers=self.max_workers or self.partitions) as executor:
+            results = list(executor.map(operation, partitions))
+
+        return pd.concat(results)
+
+    def process_operations(self, operations: list, dataset: Dataset):
+        """
+        Process consecutive cleaning operations on a dataset, fusing runs of built-in operations
+        into a single pass.
+        """
+        for operation in split_fusable_runs(operations):
+            self.process_operation(operation, dataset)
+
         return dataset
 
     def get_operation_list(self):
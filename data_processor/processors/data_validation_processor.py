@@ -1,12 +1,23 @@
+import logging
 from core.dataset import Dataset
-from utils.helper import SchemaNotProvidedError, get_operation_list
+from utils.helper import SchemaNotProvidedError, get_operation_list, is_validation_only
 from utils.exception_handler import ExceptionHandler
+from utils.validation_engine import validate_dataframe, ValidationReport, SAMPLE_SIZE
+from utils.sampling import SamplingPolicy, SampledValidationReport, estimate_violations
+
+logger = logging.getLogger(__name__)
 
 class DataValidationProcessor():
 
-    def __init__(self):
-        
+    def __init__(self, sampling: SamplingPolicy = None):
+        """
+        :param sampling: Validate datasets larger than the sample from a sample first, and validate every row
+            only when the sample exceeds the policy's threshold. Only operations marked as validation-only
+            (e.g. validate_column_values) are sampled, the others change the data and run on every row.
+            None validates every row.
+        """
         self.exception_handler = ExceptionHandler()  
+        self.sampling = sampling
 
     def process_operation(self, operation, dataset: Dataset):
         """
@@ -19,13 +30,62 @@ class DataValidationProcessor():
             
             df = dataset.get_data()
             schema = dataset.get_schema()
-            df = operation(df, schema)
+            if (self.sampling is not None and is_validation_only(operation)
+                    and self.sampling.sample_rows(len(df)) < len(df)):
+                df = self._process_sampled(operation, df, schema, dataset)
+            else:
+                df = operation(df, schema)
             dataset.set_data(df)
 
         except Exception as error:
-            self.exception_handler.handle(operation, error)
+            self.exception_handler.handle(operation, error, dataset)
 
         return dataset
 
+    def _process_sampled(self, operation, df, schema, dataset: Dataset):
+        """
+        Estimate the violations of a dataset from a sample of its rows, then run a validation-only operation
+        once: on every row when the sample exceeds the violation threshold, on the sample otherwise.
+        """
+        sample = self.sampling.draw(df)
+        report = estimate_violations(sample, schema, len(df), self.sampling)
+        dataset.sampling_report = report
+        for message in report.messages():
+            logger.warning(message)
+        if report.exceeds(self.sampling.threshold):
+            report.escalated = True
+            logger.warning("Sample of %r exceeds the violation threshold, validating every row.", dataset)
+            return operation(df, schema)
+
+        try:
+            operation(sample, schema)
+        except Exception:
+            # The sample already fails, the full validation reports every problem
+            report.escalated = True
+            return operation(df, schema)
+        return df
+
+    def sampled_report(self, dataset: Dataset, sampling: SamplingPolicy = None) -> SampledValidationReport:
+        """
+        Estimate the violation rates of a dataset from a sample, without running any operation.
+        """
+        sampling = sampling or self.sampling or SamplingPolicy()
+        if dataset.get_schema() is None:
+            raise SchemaNotProvidedError("Schema required to validate the data.")
+        df = dataset.get_data()
+        return estimate_violations(sampling.draw(df), dataset.get_schema(), len(df), sampling)
+
+    def validation_report(self, dataset: Dataset, max_violations: int = None,
+                          sample_size: int = SAMPLE_SIZE) -> ValidationReport:
+        """
+        Validate the values of a dataset against its schema and return the violations instead of printing them.
+
+        :param max_violations: Stop checking columns once more than this many invalid values are found.
+        :param sample_size: Number of distinct invalid values kept per column.
+        """
+        if dataset.get_schema() is None:
+            raise SchemaNotProvidedError("Schema required to validate the data.")
+        return validate_dataframe(dataset.get_data(), dataset.get_schema(), max_violations, sample_size)
+
     def get_operation_list(self):
         return get_operation_list('validation')
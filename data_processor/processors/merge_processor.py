@@ -1,29 +1,83 @@
+import logging
+import pandas as pd
 from core.dataset import Dataset
-from utils.helper import  get_operation_list
+from core.streaming import StreamingDataset
+from core.out_of_core_merge import HashPartitionedMerge, chunk_source
+from utils.helper import  get_operation_list, is_hash_partitionable, is_incremental
 from utils.exception_handler import ExceptionHandler
 
+logger = logging.getLogger(__name__)
+
 class MergeProcessor:
 
-    def __init__(self):
-        
+    def __init__(self, out_of_core: HashPartitionedMerge = None, incremental: bool = False):
+        """
+        :param out_of_core: Merge hash-partitionable operations (merge_dfs) out of core with this strategy,
+            for datasets larger than memory. None merges in memory.
+        :param incremental: Keep the row hashes of unions (add_new_rows) on the first Dataset, so the datasets
+            of the next unions are added without deduplicating it again.
+        """
         self.exception_handler = ExceptionHandler()
+        self.out_of_core = out_of_core
+        self.incremental = incremental
+
+    def runs_out_of_core(self, operation) -> bool:
+        """
+        Check if an operation is merged out of core, without loading the datasets into memory.
+        """
+        return self.out_of_core is not None and is_hash_partitionable(operation)
 
     def process_operation(self, operation, *dataset_stream: Dataset):
         main_obj = None
         try:
             # Take the first dataset as the base
             main_obj = dataset_stream[0]
-            print(f"Printing shape of main object in merge processor: - {main_obj.get_data().shape}")
+
+            if self.runs_out_of_core(operation):
+                self._merge_out_of_core(operation, dataset_stream)
+                return main_obj
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Shape of the main dataset in merge processor: %s", main_obj.get_data().shape)
+
+            # Merge every dataset in one pass when the operation supports it
+            multiway = getattr(operation, '_multiway', None)
+            if multiway is not None and len(dataset_stream) >= 2:
+                arguments = getattr(operation, '_bound_arguments', {})
+                if self.incremental and is_incremental(operation):
+                    arguments = {**arguments, 'incremental': True}
+                merged = multiway(dataset_stream, **arguments)
+                if merged is not None:
+                    main_obj.set_data(merged)
+                    return main_obj
+
             for collection_obj in dataset_stream[1:]:
                 main_obj_pandas = operation(main_obj.get_data(),collection_obj.get_data())
                 main_obj.set_data(main_obj_pandas)
         
         except Exception as error:
-            print(f'Merge Processor failed on {operation} {error}')
-            self.exception_handler.handle(operation, error)
+            logger.error("Merge Processor failed on %s: %s", getattr(operation, '__name__', operation), error)
+            self.exception_handler.handle(operation, error, main_obj)
 
         return main_obj
 
+    def _merge_out_of_core(self, operation, dataset_stream):
+        """
+        Merge the datasets partition by partition. A StreamingDataset base becomes lazily backed by the merge,
+        which runs when it is iterated or written to its sink; any other base gets the merged data in memory.
+        """
+        main_obj = dataset_stream[0]
+        sources = [chunk_source(dataset) for dataset in dataset_stream]
+
+        def merged():
+            return self.out_of_core.merge(operation, sources)
+
+        if isinstance(main_obj, StreamingDataset) and not main_obj.is_materialized():
+            main_obj.set_source(merged)
+        else:
+            chunks = list(merged())
+            main_obj.set_data(pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame())
+
     def get_operation_list(self):
         """
         Get the list of available merge operations.
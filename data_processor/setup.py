@@ -37,4 +37,7 @@ setuptools.setup(
         "python-box==6.0.2",
         "typing_extensions==4.12.1"
     ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,62 @@
+import pytest
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def dummy_data():
+    """Fixture to provide a sample DataFrame for testing"""
+    data = {
+        'name': [' Alice ', 'Bob ', 'Straße ', None],
+        'amount': ['$500', '300', '$700', '300'],
+        'punctuated_text': ['Hello , World !', 'Good :bye -', 'Test , case -', ' example ;'],
+        'hash_id': [1, 2, 1, 4]
+    }
+    return pd.DataFrame(data)
+
+@pytest.fixture
+def reset_backend():
+    yield
+    Dataset.set_string_backend('python')
+
+
+def as_values(dataframe):
+    return dataframe.astype(object).where(dataframe.notna(), None).to_dict('list')
+
+
+def test_dataset_converts_string_columns(dummy_data):
+    dataset = Dataset(dummy_data, string_backend='pyarrow')
+    df = dataset.get_data()
+
+    assert df['name'].dtype == pd.StringDtype('pyarrow')
+    assert df['punctuated_text'].dtype == pd.StringDtype('pyarrow')
+    assert df['hash_id'].dtype == 'int64'
+
+
+def test_global_string_backend(dummy_data, reset_backend):
+    Dataset.set_string_backend('pyarrow')
+    assert Dataset(dummy_data).get_data()['name'].dtype == pd.StringDtype('pyarrow')
+    assert Dataset(dummy_data, string_backend='python').get_data()['name'].dtype == 'object'
+
+
+def test_invalid_string_backend(dummy_data):
+    with pytest.raises(ValueError):
+        Dataset(dummy_data, string_backend='rust')
+
+
+@pytest.mark.parametrize('operation', [
+    make_uppercase,
+    strip_leading_and_trailing_spaces,
+    remove_spaces_Around_punctuation,
+    manage_special_characters,
+    clean_numeric_values,
+    apply_standard_cleaning,
+])
+def test_arrow_backend_matches_python_backend(dummy_data, operation):
+    expected = operation(Dataset(dummy_data).get_data())
+    result = operation(Dataset(dummy_data, string_backend='pyarrow').get_data())
+
+    assert as_values(result) == as_values(expected)
@@ -0,0 +1,44 @@
+import pytest
+from utils.registry import registry, OPERATION_TYPES
+from benchmarks.data import DataSpec, generate_frame
+from benchmarks.cases import CASES, covered_operations
+from benchmarks.runner import run_suite, save_results, load_results, compare
+
+
+@pytest.fixture
+def spec():
+    return DataSpec(rows=200, columns=3, string_length=8, cardinality=20, duplicate_ratio=0.25)
+
+
+def test_generated_frame_follows_spec(spec):
+    df = generate_frame(spec)
+
+    assert df.shape == (200, 4)
+    assert df['ID'].nunique() <= 20
+    assert df['TEXT_0'].str.len().max() <= 8 + 2
+    assert df.duplicated().sum() >= 1
+    assert generate_frame(spec).equals(df)
+
+
+def test_every_built_in_operation_is_benchmarked():
+    built_in = {name for operation_type in OPERATION_TYPES for name in registry.names(operation_type, built_in_only=True)}
+
+    assert built_in - covered_operations() == set()
+    assert 'check_no_duplicates' in covered_operations()
+
+
+def test_results_are_compared_with_baseline(spec, tmp_path):
+    cases = [case for case in CASES if case.name in ('remove_duplicates', 'ExecutionManager.execute')]
+    results = run_suite([spec], cases, repeat=1)
+    save_results(results, tmp_path / "baseline.json")
+    baseline = load_results(tmp_path / "baseline.json")
+
+    assert [result['case'] for result in baseline] == ['remove_duplicates', 'ExecutionManager.execute']
+    assert all(result['time'] > 0 and result['peak_memory'] > 0 for result in baseline)
+    assert compare(results, baseline) == []
+
+    slower = [dict(result, time=result['time'] * 2) for result in results]
+    regressions = compare(slower, baseline, tolerance=0.5)
+    assert [(regression.case, regression.metric) for regression in regressions] == [
+        ('remove_duplicates', 'time'), ('ExecutionManager.execute', 'time')]
+    assert regressions[0].ratio == pytest.approx(2)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+import pytest
+import pandas as pd
+import core.bulk_loader as bulk_loader
+from core.bulk_loader import load_datasets, load_datasets_async
+from core.lazy_dataset import LazyDataset
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      ID: int32
+      NAME: null
+    """)
+    return path
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for index in range(12):
+        frame = pd.DataFrame({'ID': [index, index + 100], 'NAME': [f'name {index}', 'other']})
+        file_format = ('csv', 'parquet', 'feather')[index % 3]
+        path = tmp_path / f"part_{index}.{file_format}"
+        getattr(frame, f"to_{file_format}")(path, **({'index': False} if file_format == 'csv' else {}))
+        paths.append(path)
+    return paths
+
+
+def test_datasets_are_loaded_in_input_order(paths, schema_path):
+    datasets = load_datasets(paths, schema_path, names=[path.stem for path in paths], max_concurrency=4,
+                             dtype_mode='schema')
+
+    assert [dataset.name for dataset in datasets] == [path.stem for path in paths]
+    assert [dataset.get_data()['ID'].iloc[0] for dataset in datasets] == list(range(12))
+    # One compiled schema shared by every Dataset, its dtypes applied on load
+    assert len({id(dataset.get_schema()) for dataset in datasets}) == 1
+    assert all(dataset.get_data()['ID'].dtype == 'int32' for dataset in datasets)
+
+
+def test_lazy_datasets_are_not_read(paths, schema_path, monkeypatch):
+    monkeypatch.setattr(bulk_loader, '_read_bytes', lambda path: pytest.fail("file read"))
+    datasets = load_datasets(paths, schema_path, lazy=True)
+
+    assert all(isinstance(dataset, LazyDataset) and not dataset.is_loaded() for dataset in datasets)
+    assert datasets[4].get_data()['ID'].tolist() == [4, 104]
+
+
+def test_reads_are_bounded(paths, monkeypatch):
+    lock, running, peak = threading.Lock(), [0], [0]
+    read_bytes = bulk_loader._read_bytes
+
+    def slow_read(path):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return read_bytes(path)
+
+    monkeypatch.setattr(bulk_loader, '_read_bytes', slow_read)
+    load_datasets(paths, max_concurrency=3)
+
+    assert 1 < peak[0] <= 3
+
+
+def test_usable_inside_a_running_event_loop(paths):
+    async def main():
+        awaited = await load_datasets_async(paths[:3])
+        # The synchronous API runs on its own loop when called from a coroutine
+        blocking = load_datasets(paths[:3])
+        return awaited, blocking
+
+    awaited, blocking = asyncio.run(main())
+    for first, second in zip(awaited, blocking):
+        pd.testing.assert_frame_equal(first.get_data(), second.get_data())
+
+
+def test_failing_file_raises(paths, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_datasets([*paths, tmp_path / "missing.csv"])
+    with pytest.raises(ValueError, match="schema paths"):
+        load_datasets(paths, schema_paths=[None])
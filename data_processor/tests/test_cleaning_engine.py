@@ -0,0 +1,110 @@
+import logging
+import pytest
+import pandas as pd
+from utils.helper import *
+from utils import cleaning_engine
+from utils.cleaning_engine import FusedCleaningOperation, split_fusable_runs, expand_operations
+from core.dataset import Dataset
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+
+
+@pytest.fixture
+def dummy_data():
+    """Fixture to provide a sample DataFrame for testing"""
+    data = {
+        'name': [' Alice ', 'Bob ', 'Carla ', ' alice'],
+        'amount': ['$500', '300', '$700', '300'],
+        'punctuated_text': ['Hello , World !', 'Good :bye -', 'Test , case -', ' example ;'],
+        'hash_id': [1, 2, 1, 4]
+    }
+    return pd.DataFrame(data)
+
+@pytest.fixture(autouse=True)
+def clear_operations():
+    ExecutionManager.global_operations.clear()
+    yield
+    ExecutionManager.global_operations.clear()
+
+
+def chained(dataframe, operations):
+    for operation in operations:
+        dataframe = operation(dataframe)
+    return dataframe
+
+
+def test_standard_cleaning_matches_chained_operations(dummy_data):
+    result = apply_standard_cleaning(dummy_data)
+    expected = chained(dummy_data, STANDARD_CLEANING_OPERATIONS)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['NAME'].tolist() == ['ALICE', 'BOB', 'CARLA', 'ALICE']
+    assert result['AMOUNT'].tolist() == [500.0, 300.0, 700.0, 300.0]
+    assert result['PUNCTUATED_TEXT'].tolist() == ['HELLO-WORLD-', 'GOOD-BYE-', 'TEST-CASE-', 'EXAMPLE-']
+
+
+def test_fused_operation_does_not_modify_input(dummy_data):
+    original = dummy_data.copy()
+    fused = FusedCleaningOperation([strip_leading_and_trailing_spaces, make_uppercase])
+    result = fused(dummy_data)
+
+    pd.testing.assert_frame_equal(dummy_data, original)
+    pd.testing.assert_frame_equal(result, chained(original, [strip_leading_and_trailing_spaces, make_uppercase]))
+
+
+def test_redundant_punctuation_step_is_dropped():
+    operations = expand_operations([remove_spaces_Around_punctuation, manage_special_characters])
+    assert operations == [manage_special_characters]
+
+
+def test_split_fusable_runs_keeps_non_fusable_operations():
+    operations = split_fusable_runs([make_uppercase, clean_numeric_values, remove_duplicates, make_uppercase])
+
+    assert isinstance(operations[0], FusedCleaningOperation)
+    assert operations[1:] == [remove_duplicates, make_uppercase]
+
+
+def test_fused_operation_rejects_non_fusable_operation():
+    with pytest.raises(TypeError):
+        FusedCleaningOperation([make_uppercase, remove_duplicates])
+
+
+def test_dictionary_encoded_cleaning_matches_row_by_row(dummy_data, monkeypatch):
+    data = pd.concat([dummy_data] * 50, ignore_index=True)
+    data.loc[3, 'name'] = None
+
+    monkeypatch.setattr(cleaning_engine, 'DICTIONARY_ENCODING_MIN_ROWS', 10 ** 9)
+    expected = apply_standard_cleaning(data)
+
+    monkeypatch.setattr(cleaning_engine, 'DICTIONARY_ENCODING_MIN_ROWS', 1)
+    result = apply_standard_cleaning(data)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['NAME'][3] is None
+
+
+def test_category_columns_are_cleaned_through_categories():
+    data = pd.DataFrame({'status': pd.Categorical([' open', 'OPEN ', None, 'closed'])})
+    result = apply_standard_cleaning(data)
+
+    assert isinstance(result['STATUS'].dtype, pd.CategoricalDtype)
+    assert result['STATUS'].cat.categories.tolist() == ['OPEN', 'CLOSED']
+    assert result['STATUS'].tolist()[:2] == ['OPEN', 'OPEN']
+    assert pd.isna(result['STATUS'][2])
+
+
+def test_execution_manager_fuses_consecutive_cleaning_steps(dummy_data, caplog):
+    dataset = Dataset(dummy_data)
+    processor = DataCleaningProcessor()
+    ExecutionManager.add_operation(1, processor, make_uppercase, [dataset])
+    ExecutionManager.add_operation(2, processor, strip_leading_and_trailing_spaces, [dataset])
+    ExecutionManager.add_operation(3, processor, clean_numeric_values, [dataset])
+
+    with caplog.at_level(logging.INFO, logger='core.execution_manager'):
+        ExecutionManager.execute()
+
+    assert caplog.text.count("Executing") == 1
+    pd.testing.assert_frame_equal(
+        dataset.get_data(),
+        chained(dummy_data, [make_uppercase, strip_leading_and_trailing_spaces, clean_numeric_values])
+    )
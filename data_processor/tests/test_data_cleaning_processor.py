@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 from processors.data_cleaning_processor import DataCleaningProcessor
 from core.dataset import Dataset
+from utils.helper import apply_standard_cleaning, strip_leading_and_trailing_spaces, remove_duplicates
 
 
 # Example operation to add a new column to the DataFrame
@@ -71,3 +72,34 @@ class TestDataCleaningProcessor:
         processor.process(dataset)
         captured = capsys.readouterr()
         assert "ValueError in 'invalid_operation': Invalid values found.\n" in captured.out
+
+
+class TestPartitionedCleaning:
+
+    @pytest.fixture
+    def dataset(self):
+
+        df = pd.DataFrame({
+            'name': [' Alice ', 'Bob ', 'Carla ', ' alice', 'Bob ', 'Dave'],
+            'amount': ['$500', '300', '$700', '300', '300', 'n/a'],
+        }, index=[10, 3, 7, 1, 5, 2])
+        return Dataset(df)
+
+    @pytest.fixture
+    def processor(self):
+
+        return DataCleaningProcessor(partitions=3, max_workers=2, min_partition_rows=1)
+
+    def test_row_local_operation_matches_whole_frame(self, processor, dataset):
+        expected = strip_leading_and_trailing_spaces(dataset.get_data())
+
+        processed_df = processor.process_operation(strip_leading_and_trailing_spaces, dataset).get_data()
+
+        pd.testing.assert_frame_equal(processed_df, expected)
+        assert processed_df.index.tolist() == [10, 3, 7, 1, 5, 2]
+
+    def test_non_row_local_operation_runs_on_whole_frame(self, processor, dataset):
+        processor.process_operation(strip_leading_and_trailing_spaces, dataset)
+        processed_df = processor.process_operation(remove_duplicates, dataset).get_data()
+
+        assert processed_df['name'].tolist() == ['Alice', 'Bob', 'Carla', 'alice', 'Dave']
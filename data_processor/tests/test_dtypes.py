@@ -0,0 +1,126 @@
+import pytest
+import numpy as np
+import pandas as pd
+from utils.helper import *
+from utils.dtypes import enforce_dtypes, resolve_dtype
+from core.dataset import Dataset
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      ID: int32
+      SCORE: float32
+      COUNT: Int16
+      ACTIVE: bool
+      JOINED: datetime
+      CITY: category
+      NOTE: string
+    CITY:
+      - Paris
+      - Oslo
+    """)
+    return path
+
+@pytest.fixture
+def raw_frame():
+    # Everything arrives as text
+    return pd.DataFrame({
+        'ID': ['1', '2', '3', '4'],
+        'SCORE': ['0.5', '1.25', '2', '3.75'],
+        'COUNT': ['10', None, '30', '40'],
+        'ACTIVE': ['yes', 'no', 'True', '0'],
+        'JOINED': ['2024-01-01', '2024-02-15', '2024-03-01', None],
+        'CITY': ['Paris', 'Oslo', 'Paris', 'Oslo'],
+        'NOTE': [' a ', 'b', 'c', None],
+        'EXTRA': ['x', 'y', 'z', 'w'],
+    })
+
+
+def test_schema_dtypes_are_applied_on_construction(schema_path, raw_frame):
+    dataset = Dataset(raw_frame, schema_path=schema_path, dtype_mode='schema')
+    data = dataset.get_data()
+
+    assert data.dtypes.astype(str).to_dict() == {
+        'ID': 'int32', 'SCORE': 'float32', 'COUNT': 'Int16', 'ACTIVE': 'bool', 'JOINED': 'datetime64[ns]',
+        'CITY': 'category', 'NOTE': str(resolve_dtype('string')), 'EXTRA': 'object'}
+    assert data['ACTIVE'].tolist() == [True, False, True, False]
+    assert data['COUNT'].isna().tolist() == [False, True, False, False]
+    # Undeclared columns are left alone in the default mode
+    assert data['EXTRA'].dtype == object
+
+    report = dataset.dtype_report
+    assert [column.column for column in report.columns] == list(raw_frame.columns)
+    assert report.bytes_after < report.bytes_before
+    assert 'Total' in str(report)
+
+
+def test_values_the_declared_dtype_cannot_hold(schema_path, raw_frame):
+    with pytest.raises(ValueError, match="ID"):
+        Dataset(raw_frame.assign(ID=['1', '2', 'three', '4']), schema_path=schema_path, dtype_mode='schema')
+    with pytest.raises(ValueError, match="missing values"):
+        Dataset(raw_frame.assign(ID=['1', None, '3', '4']), schema_path=schema_path, dtype_mode='schema')
+    with pytest.raises(ValueError, match="fractional"):
+        Dataset(raw_frame.assign(ID=[1.5, 2, 3, 4]), schema_path=schema_path, dtype_mode='schema')
+
+
+def test_unknown_types_and_plain_integers(raw_frame, caplog):
+    converted, _ = enforce_dtypes(raw_frame, {'NOTE': 'varchar', 'COUNT': 'integer'})
+
+    assert converted['NOTE'].dtype == object and converted['NOTE'].equals(raw_frame['NOTE'])
+    assert "NOTE (varchar)" in caplog.text
+    # Plain integer columns are nullable
+    assert converted['COUNT'].dtype == 'Int64' and converted['COUNT'].isna().sum() == 1
+
+
+def test_data_is_kept_by_default(schema_path, raw_frame):
+    dataset = Dataset(raw_frame.assign(ID=['1', None, 'three', '4']), schema_path=schema_path)
+
+    assert dataset.dtype_mode == 'keep'
+    assert dataset.get_data()['ID'].tolist() == ['1', None, 'three', '4'] and dataset.dtype_report is None
+
+
+def test_optimizer_only_makes_lossless_changes():
+    df = pd.DataFrame({
+        'SMALL': np.arange(100, dtype='int64'),
+        'LARGE': np.arange(100, dtype='int64') * 100_000,
+        'HALVES': np.arange(100) / 2,
+        'TENTHS': np.arange(100) / 10,
+        'LABEL': ['a', 'b'] * 50,
+        'TEXT': [f'text {i}' for i in range(100)],
+        'FLAG': [True, False] * 50,
+    })
+    optimized, report = enforce_dtypes(df, optimize=True)
+
+    assert optimized.dtypes.astype(str).to_dict() == {
+        'SMALL': 'int8', 'LARGE': 'int32', 'HALVES': 'float32', 'TENTHS': 'float64', 'LABEL': 'category',
+        'TEXT': 'string', 'FLAG': 'bool'}
+    pd.testing.assert_frame_equal(optimized.astype(df.dtypes.to_dict()), df)
+    assert report.ratio > 1
+
+
+def test_operations_give_the_same_results_on_optimized_data(schema_path, raw_frame, capsys):
+    raw_frame = raw_frame.assign(AMOUNT=['$500', ' 300 ', '$500', ' 300 '])
+    optimized = Dataset(raw_frame, dtype_mode='optimize').get_data()
+    assert optimized['AMOUNT'].dtype == 'category'
+
+    expected = apply_standard_cleaning(raw_frame)
+    cleaned = apply_standard_cleaning(optimized)
+    # Same values, missing values are spelled differently by the dtypes
+    pd.testing.assert_frame_equal(cleaned.astype(object).where(cleaned.notna(), None),
+                                  expected.astype(object).where(expected.notna(), None))
+
+    validate_column_values(optimized, Dataset(raw_frame, schema_path=schema_path, dtype_mode='keep').get_schema())
+    assert "CITY" not in capsys.readouterr().out
+
+
+def test_file_datasets_apply_dtypes_on_load(schema_path, raw_frame, tmp_path):
+    path = tmp_path / "raw.csv"
+    raw_frame.to_csv(path, index=False)
+    dataset = Dataset.from_path(path, schema_path=schema_path, dtype_mode='schema')
+
+    assert dataset.dtype_report is None
+    assert dataset.get_data()['ID'].dtype == 'int32'
+    assert dataset.dtype_report is not None
@@ -0,0 +1,256 @@
+import json
+import logging
+import pytest
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+from core.execution_manager import ExecutionManager
+from core.scheduler import DependencyGraph
+from core.instrumentation import StepProfiler
+from utils.streaming_dedup import BloomFilter
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.merge_processor import MergeProcessor
+
+
+# Example operation that raises an error on one dataset only
+def fail_on_bob(df):
+    if (df['name'] == 'Bob').any():
+        raise ValueError("Bob is not allowed")
+    return df
+
+
+@pytest.fixture
+def datasets():
+    names = [[' Alice ', 'Bob '], ['Carla ', ' dave'], [' erin', 'Frank ']]
+    return [Dataset(pd.DataFrame({'name': values, 'amount': ['$1', '2']}), name=f"part_{i}")
+            for i, values in enumerate(names)]
+
+@pytest.fixture(autouse=True)
+def reset_manager():
+    ExecutionManager.global_operations.clear()
+    yield
+    ExecutionManager.global_operations.clear()
+    ExecutionManager.configure_parallelism(None)
+    ExecutionManager.configure_scheduler('order')
+    ExecutionManager.disable_instrumentation()
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_execution_matches_serial(datasets, backend):
+    expected = [strip_leading_and_trailing_spaces(apply_standard_cleaning(dataset.get_data())) for dataset in datasets]
+
+    ExecutionManager.configure_parallelism(backend, max_workers=2)
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), apply_standard_cleaning, datasets)
+    ExecutionManager.add_operation(2, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+    ExecutionManager.execute()
+
+    for dataset, frame in zip(datasets, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), frame)
+
+
+def test_bound_operations_run_on_process_backend(datasets):
+    operation = bind_arguments(remove_duplicates, keep='last')
+    expected = [remove_duplicates(dataset.get_data(), keep='last') for dataset in datasets]
+
+    ExecutionManager.configure_parallelism('process', max_workers=2)
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), operation, datasets)
+    ExecutionManager.execute()
+
+    for dataset, frame in zip(datasets, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), frame)
+
+
+def test_stateful_operations_share_their_store_on_process_backend(datasets):
+    duplicate = Dataset(datasets[0].get_data().copy(), name='duplicate')
+    store = BloomFilter(capacity=1000)
+
+    ExecutionManager.configure_parallelism('process', max_workers=2)
+    ExecutionManager.add_operation(1, DataCleaningProcessor(),
+                                   bind_arguments(remove_duplicates_across_batches, store=store),
+                                   [datasets[0], duplicate])
+    ExecutionManager.execute()
+
+    # The datasets run in order in this process, against the same store
+    assert len(datasets[0].get_data()) == 2 and duplicate.get_data().empty
+
+
+def test_shared_memory_transport_matches_serial(datasets):
+    expected = [strip_leading_and_trailing_spaces(apply_standard_cleaning(dataset.get_data())) for dataset in datasets]
+
+    ExecutionManager.configure_parallelism('process', max_workers=2, transport='shared_memory')
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), apply_standard_cleaning, datasets)
+    ExecutionManager.add_operation(2, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+    ExecutionManager.execute()
+
+    for dataset, frame in zip(datasets, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), frame)
+        # Segments are destroyed at the end of the run
+        assert dataset._shared_frame is None
+
+
+def test_shared_memory_workers_ignore_dataset_defaults(datasets, monkeypatch):
+    expected = [make_uppercase(dataset.get_data()) for dataset in datasets]
+    # Worker processes inherit the defaults, they must not convert or spill the views of shared memory
+    monkeypatch.setattr(Dataset, 'dtype_mode', 'optimize')
+    monkeypatch.setattr(Dataset, 'storage', 'spill')
+
+    ExecutionManager.configure_parallelism('process', max_workers=2, transport='shared_memory')
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets)
+    ExecutionManager.execute()
+
+    for dataset, frame in zip(datasets, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), frame)
+
+
+def test_parallel_error_identifies_dataset(datasets, capsys):
+    ExecutionManager.configure_parallelism('thread', max_workers=2)
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+    ExecutionManager.add_custom_operation(2, DataCleaningProcessor(), fail_on_bob, datasets)
+
+    with pytest.raises(ValueError, match="Bob is not allowed"):
+        ExecutionManager.execute()
+
+    captured = capsys.readouterr()
+    assert "failed on <Dataset 'part_0'>" in captured.out
+
+
+def test_invalid_parallel_backend():
+    with pytest.raises(ValueError):
+        ExecutionManager.configure_parallelism('gpu')
+    with pytest.raises(ValueError):
+        ExecutionManager.configure_parallelism('thread', transport='shared_memory')
+
+
+def test_dependency_graph_from_datasets(datasets):
+    first, second, third = datasets
+    cleaning, merge = DataCleaningProcessor(), MergeProcessor()
+    steps = [
+        (1, cleaning, make_uppercase, [first]),
+        (2, cleaning, make_uppercase, [second]),
+        (3, merge, add_new_rows, [first, second]),
+        (4, cleaning, remove_duplicates, [third]),
+        (5, cleaning, remove_duplicates, [second]),
+    ]
+    graph = DependencyGraph(steps)
+
+    assert graph.dependencies == [set(), set(), {0, 1}, set(), {1, 2}]
+    assert graph.levels() == [[0, 1, 3], [2], [4]]
+    assert [steps[index][0] for index in graph.critical_path()] == [1, 3, 5]
+
+
+def test_dag_scheduler_matches_order_scheduler(datasets):
+    def build():
+        copies = [Dataset(dataset.get_data().copy(), name=dataset.name) for dataset in datasets]
+        ExecutionManager.global_operations.clear()
+        ExecutionManager.add_operation(1, DataCleaningProcessor(), apply_standard_cleaning, copies[:1])
+        ExecutionManager.add_operation(2, DataCleaningProcessor(), make_uppercase, copies[1:])
+        ExecutionManager.add_operation(3, MergeProcessor(), add_new_rows, copies[:2])
+        ExecutionManager.add_operation(4, DataCleaningProcessor(), remove_duplicates, copies[2:])
+        return copies
+
+    expected = build()
+    ExecutionManager.execute()
+
+    ExecutionManager.configure_scheduler('dag', max_concurrent_steps=4)
+    result = build()
+    plan = ExecutionManager.explain()
+    ExecutionManager.execute()
+
+    for dataset, frame in zip(result, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), frame.get_data())
+    assert "Level 1 (2 concurrent)" in plan
+    assert "Critical path: [1] -> [3]" in plan
+
+
+def test_pipelines_are_independent_and_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run_pipeline(index):
+        dataset = Dataset(pd.DataFrame({'name': [f' tenant {index} ', 'Bob ']}), name=f"tenant_{index}")
+        pipeline = ExecutionManager()
+        pipeline.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, [dataset])
+        pipeline.add_operation(2, DataCleaningProcessor(), make_uppercase, [dataset])
+        pipeline.execute()
+        return dataset.get_data()['NAME'].tolist()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run_pipeline, range(32)))
+
+    assert results == [[f'TENANT {index}', 'BOB'] for index in range(32)]
+    # Instance pipelines do not touch the class-level pipeline
+    assert ExecutionManager.global_operations == []
+
+
+def test_assigning_global_operations_resets_class_pipeline(datasets, monkeypatch):
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets)
+    monkeypatch.setattr(ExecutionManager, 'global_operations', [])
+
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+    ExecutionManager.execute()
+
+    # Only the step added after the reset ran
+    assert ExecutionManager.default().global_operations is ExecutionManager.global_operations
+    assert len(ExecutionManager.global_operations) == 1
+    assert datasets[0].get_data()['name'].tolist() == ['Alice', 'Bob']
+
+
+def test_duplicate_orders_follow_replaced_steps(datasets):
+    pipeline = ExecutionManager()
+    pipeline.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets)
+    # Replacing a step in place keeps the length of the list
+    pipeline.global_operations[0] = (2, DataCleaningProcessor(), make_uppercase, datasets)
+
+    pipeline.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+    with pytest.raises(ValueError, match="Duplicate order"):
+        pipeline.add_operation(2, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+
+
+def test_class_api_uses_default_pipeline(datasets):
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets[:1])
+    pipeline = ExecutionManager()
+    pipeline.configure_scheduler('dag')
+
+    assert ExecutionManager.default().global_operations is ExecutionManager.global_operations
+    assert len(ExecutionManager.global_operations) == 1
+    assert ExecutionManager.default().scheduler == 'order'
+    with pytest.raises(ValueError, match="Duplicate order"):
+        ExecutionManager.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets[1:])
+
+
+def test_instrumentation_records_every_step(datasets, tmp_path):
+    received = []
+    manager = ExecutionManager()
+    profiler = manager.configure_instrumentation(StepProfiler(hooks=[received.append]))
+    manager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets[:1])
+    manager.add_operation(2, MergeProcessor(), add_new_rows, datasets[:2])
+
+    manager.execute()
+
+    records = profiler.to_records()
+    assert [record['operation'] for record in records] == ['strip_leading_and_trailing_spaces', 'add_new_rows']
+    assert records[1]['processor'] == 'MergeProcessor'
+    assert records[1]['datasets'] == ('part_0', 'part_1')
+    assert records[1]['rows_in'] == (2, 2) and records[1]['rows_out'] == (4, 2)
+    assert records[0]['columns_in'] == records[0]['columns_out'] == (2,)
+    assert all(record['wall_time'] >= 0 and record['memory_out'][0] > 0 for record in records)
+    assert len(received) == 2
+
+    profiler.to_jsonl(tmp_path / "steps.jsonl")
+    lines = (tmp_path / "steps.jsonl").read_text().splitlines()
+    assert [json.loads(line)['order'] for line in lines] == [1, 2]
+
+    trace = profiler.to_chrome_trace(tmp_path / "trace.json")
+    written = json.loads((tmp_path / "trace.json").read_text())
+    assert [event['name'] for event in written['traceEvents']] == [record['operation'] for record in records]
+    assert [event['ph'] for event in trace['traceEvents']] == ['X', 'X']
+
+
+def test_steps_are_logged_and_not_measured_by_default(datasets, caplog):
+    manager = ExecutionManager()
+    manager.add_operation(1, DataCleaningProcessor(), make_uppercase, datasets[:1])
+
+    with caplog.at_level(logging.INFO, logger='core.execution_manager'):
+        manager.execute()
+
+    assert "Executing 'make_uppercase' on processor 'DataCleaningProcessor'" in caplog.text
+    assert manager.profiler is None
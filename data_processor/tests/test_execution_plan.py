@@ -0,0 +1,71 @@
+import pytest
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+from core.execution_manager import ExecutionManager
+from core.execution_plan import ExecutionPlan
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.merge_processor import MergeProcessor
+
+
+def make_dataset(names, name=None):
+    return Dataset(pd.DataFrame({'name': names, 'amount': ['$1', '2']}), name=name)
+
+@pytest.fixture
+def plan():
+    cleaning = DataCleaningProcessor()
+    return ExecutionPlan.compile([
+        (3, MergeProcessor(), add_new_rows, ['daily', 'history']),
+        (1, cleaning, strip_leading_and_trailing_spaces, ['daily']),
+        (2, cleaning, make_uppercase, ['daily']),
+    ])
+
+@pytest.fixture(autouse=True)
+def clear_operations():
+    ExecutionManager.global_operations.clear()
+    yield
+    ExecutionManager.global_operations.clear()
+
+
+def test_compile_sorts_and_fuses_steps(plan):
+    assert plan.slots == ('daily', 'history')
+    assert [step.order for step in plan.steps] == [1, 3]
+    assert plan.steps[0].operation.__name__ == 'fused(strip_leading_and_trailing_spaces, make_uppercase)'
+
+
+def test_plan_runs_against_new_bindings(plan):
+    for names in ([' a ', 'b '], ['c', ' d']):
+        history = Dataset(pd.DataFrame({'NAME': ['X', 'Y'], 'AMOUNT': ['$1', '2']}))
+        daily = make_dataset(names)
+        ExecutionManager.execute_plan(plan, {'daily': daily, 'history': history})
+
+        expected = make_uppercase(strip_leading_and_trailing_spaces(make_dataset(names).get_data()))
+        pd.testing.assert_frame_equal(daily.get_data(), add_new_rows(expected, history.get_data()))
+
+
+def test_plan_rejects_invalid_steps_and_bindings(plan):
+    with pytest.raises(ValueError, match="Duplicate order"):
+        ExecutionPlan.compile([(1, DataCleaningProcessor(), make_uppercase, ['a']),
+                               (1, DataCleaningProcessor(), make_uppercase, ['b'])])
+    with pytest.raises(TypeError):
+        ExecutionPlan.compile([(1, MergeProcessor(), make_uppercase, ['a', 'b'])])
+    with pytest.raises(ValueError, match="at least two datasets"):
+        ExecutionPlan.compile([(1, MergeProcessor(), add_new_rows, ['a'])])
+    with pytest.raises(ValueError, match="No dataset bound"):
+        plan.bind({'daily': make_dataset(['a', 'b'])})
+    with pytest.raises(ValueError, match="Unknown dataset slot"):
+        plan.bind({'weekly': make_dataset(['a', 'b'])})
+
+
+def test_manager_plan_defaults_to_registered_datasets():
+    first, second = make_dataset([' a', 'b '], name='first'), make_dataset([' c', 'd '])
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, [first, second])
+    plan = ExecutionManager.compile()
+
+    assert plan.slots == ('first', 'dataset_1')
+    replacement = make_dataset([' e', 'f '])
+    ExecutionManager.execute_plan(plan, [first, replacement])
+
+    assert first.get_data()['name'].tolist() == ['a', 'b']
+    assert replacement.get_data()['name'].tolist() == ['e', 'f']
+    assert second.get_data()['name'].tolist() == [' c', 'd ']
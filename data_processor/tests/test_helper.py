@@ -69,6 +69,16 @@ def test_clean_numeric_values(dummy_data):
     assert result['amount'][1] == 300.0
     assert result['amount'][2] == 700.0
     assert result['amount'][3] == 300.0
+    assert result['amount'].dtype == 'float64'
+    assert result['hash_id'].dtype == 'int64'
+
+
+def test_clean_numeric_values_leaves_non_numeric_strings(dummy_data):
+    processor = clean_numeric_values
+    dummy_data.at[1, 'amount'] = 'n/a'
+    result = processor(dummy_data)
+    assert result['amount'].tolist() == [500.0, 'n/a', 700.0, 300.0]
+    assert result['name'].tolist() == dummy_data['name'].tolist()
 
 
 def test_remove_duplicates(dummy_data):
@@ -112,4 +122,37 @@ def test_read_yaml(tmp_path):
     
     result = read_yaml(yaml_file)
     assert result['COLUMNS']['name'] is None
-    assert result['COLUMNS']['amount'] is None
\ No newline at end of file
+    assert result['COLUMNS']['amount'] is None
+
+def test_operation_registry_lists_and_checks_operations(monkeypatch):
+    import utils.helper as helper
+    from utils.registry import OperationRegistry, registry
+
+    assert registry.get('cleaning', 'make_uppercase') is make_uppercase
+    assert 'merge_dfs' in get_operation_list('merge')
+    assert registry.is_built_in('drop_invalid_columns')
+
+    # Operations marked in tests go to a local registry, the shared one is left as it is
+    local = OperationRegistry()
+    local.register(make_uppercase, 'cleaning', built_in=True)
+    monkeypatch.setattr(helper, 'registry', local)
+
+    @mark_as_cleaning_operation
+    def add_flag(df):
+        return df.assign(flag=True)
+
+    # Operations of other modules are registered and type-checked, but are not built-in
+    assert local.get('cleaning', 'add_flag') is add_flag and registry.get('cleaning', 'add_flag') is None
+    assert 'add_flag' not in get_operation_list('cleaning') and not local.is_built_in('add_flag')
+    check_operation_type(add_flag, 'cleaning')
+    with pytest.raises(TypeError):
+        check_operation_type(add_flag, 'merge')
+
+    # Built-in names are reserved, unless explicitly overridden
+    with pytest.raises(ValueError, match="override"):
+        local.register(lambda df: df, 'cleaning', name='make_uppercase')
+    replacement = local.register(lambda df: df, 'cleaning', name='make_uppercase', override=True)
+    assert local.get('cleaning', 'make_uppercase') is replacement
+    assert local.names('cleaning', built_in_only=True) == ['make_uppercase']
+    with pytest.raises(ValueError):
+        local.names('sorting')
@@ -0,0 +1,109 @@
+import pytest
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+from core.lazy_dataset import LazyDataset
+from utils.streaming_dedup import BloomFilter
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.data_validation_processor import DataValidationProcessor
+
+
+@pytest.fixture
+def wide_frame():
+    return pd.DataFrame({f'COL_{i}': [f' v{i} ', f'w{i}'] for i in range(10)})
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      COL_1: null
+      COL_4: null
+      MISSING: null
+    """)
+    return path
+
+@pytest.fixture(params=['csv', 'parquet', 'feather'])
+def path(request, tmp_path, wide_frame):
+    path = tmp_path / f"wide.{request.param}"
+    getattr(wide_frame, f"to_{request.param}")(path, **({'index': False} if request.param == 'csv' else {}))
+    return path
+
+
+def test_dataset_is_loaded_on_first_use(path, wide_frame):
+    dataset = Dataset.from_path(path)
+
+    assert isinstance(dataset, LazyDataset) and not dataset.is_loaded()
+    pd.testing.assert_frame_equal(dataset.get_data(), wide_frame)
+
+
+def test_schema_columns_are_pushed_into_the_reader(path, schema_path, wide_frame):
+    dataset = Dataset.from_path(path, schema_path=schema_path)
+    manager = ExecutionManager()
+    manager.add_operation(1, DataValidationProcessor(), drop_invalid_columns, [dataset])
+    manager.add_operation(2, DataCleaningProcessor(), strip_leading_and_trailing_spaces, [dataset])
+
+    assert not dataset.is_loaded()
+    manager.execute()
+
+    assert dataset.columns == {'COL_1', 'COL_4', 'MISSING'}
+    expected = strip_leading_and_trailing_spaces(wide_frame[['COL_1', 'COL_4']])
+    pd.testing.assert_frame_equal(dataset.get_data(), expected)
+
+
+def test_declared_projection_of_custom_operation(path, wide_frame):
+    @mark_as_column_projection(lambda dataset, columns: columns)
+    def select(dataframe, columns):
+        return dataframe[columns]
+
+    dataset = Dataset.from_path(path)
+    manager = ExecutionManager()
+    manager.add_custom_operation(1, DataCleaningProcessor(), bind_arguments(select, columns=['COL_7', 'COL_2']),
+                                 [dataset])
+    manager.execute()
+
+    assert dataset.columns == {'COL_2', 'COL_7'}
+    pd.testing.assert_frame_equal(dataset.get_data(), wide_frame[['COL_7', 'COL_2']])
+
+
+def test_no_projection_when_first_step_needs_every_column(path, schema_path, wide_frame):
+    dataset = Dataset.from_path(path, schema_path=schema_path)
+    manager = ExecutionManager()
+    manager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, [dataset])
+    manager.add_operation(2, DataValidationProcessor(), drop_invalid_columns, [dataset])
+    manager.execute()
+
+    assert dataset.columns is None
+    assert dataset.get_data().columns.tolist() == ['COL_1', 'COL_4']
+
+
+def test_columns_read_before_the_projection_are_pushed_down(path, schema_path, wide_frame):
+    dataset = Dataset.from_path(path, schema_path=schema_path)
+    manager = ExecutionManager()
+    manager.add_operation(1, DataCleaningProcessor(),
+                          bind_arguments(remove_duplicates_across_batches, store=BloomFilter(capacity=100),
+                                         subset=['COL_9']), [dataset])
+    manager.add_operation(2, DataValidationProcessor(), drop_invalid_columns, [dataset])
+    manager.execute()
+
+    assert dataset.columns == {'COL_1', 'COL_4', 'COL_9', 'MISSING'}
+    assert dataset.get_data().columns.tolist() == ['COL_1', 'COL_4']
+
+
+def test_lazy_dataset_takes_dataset_settings(path, schema_path, wide_frame):
+    dataset = Dataset.from_path(path, schema_path=schema_path, name='wide', string_backend='pyarrow')
+
+    assert dataset.name == 'wide' and dataset.get_schema() is not None
+    assert dataset.string_backend == 'pyarrow' and dataset.dtype_mode == Dataset.dtype_mode
+    assert dataset.storage == 'memory' and dataset.is_resident() is False
+
+    # String columns are read into Arrow buffers
+    data = dataset.get_data()
+    assert all(dtype == 'string[pyarrow]' for dtype in data.dtypes)
+    assert data.astype(object).equals(wide_frame)
+
+
+def test_unknown_extension_needs_format(tmp_path):
+    with pytest.raises(ValueError, match="file_format"):
+        Dataset.from_path(tmp_path / "data.xlsx")
@@ -0,0 +1,154 @@
+import pytest
+import numpy as np
+import pandas as pd
+from functools import reduce
+from utils.helper import *
+from core.dataset import Dataset
+from core.streaming import StreamingDataset, CsvSink
+from core.execution_manager import ExecutionManager
+from core.out_of_core_merge import HashPartitionedMerge
+from processors.merge_processor import MergeProcessor
+from utils.row_hashing import RowHashSet
+from utils.multiway_merge import multiway_merge
+
+
+@pytest.fixture
+def frames():
+    facts = pd.DataFrame({'id': [3, 1, 2, 1, 5], 'amount': [10.0, 20.0, 30.0, 40.0, 50.0]})
+    customers = pd.DataFrame({'id': [1, 2, 3], 'customer': ['Alice', 'Bob', 'Carla']})
+    regions = pd.DataFrame({'id': [2, 3, 1, 4], 'region': [1, 2, 3, 4]})
+    return facts, customers, regions
+
+
+@pytest.mark.parametrize('how', ['left', 'inner', 'outer'])
+def test_multiway_merge_matches_pairwise(frames, how):
+    operation = bind_arguments(merge_dfs, merge_columns=['id'], how=how)
+    datasets = [Dataset(frame) for frame in frames]
+
+    MergeProcessor().process_operation(operation, *datasets)
+
+    expected = reduce(lambda left, right: pd.merge(left, right, on=['id'], how=how), frames)
+    pd.testing.assert_frame_equal(datasets[0].get_data(), expected)
+
+
+def test_outer_merge_runs_in_one_pass(frames):
+    facts, customers, regions = frames
+    frames = [facts.assign(code='a'), customers.assign(code='a'), regions.assign(code=['b', 'c', 'a', 'd'])]
+
+    # The default join of merge_dfs, on two key columns
+    merged = multiway_merge([Dataset(frame) for frame in frames], merge_columns=['id', 'code'])
+
+    expected = reduce(lambda left, right: pd.merge(left, right, on=['id', 'code'], how='outer'), frames)
+    assert merged is not None
+    pd.testing.assert_frame_equal(merged, expected)
+
+
+def test_key_index_is_cached_until_data_changes(frames):
+    facts, customers, regions = frames
+    dimension = Dataset(customers)
+    operation = bind_arguments(merge_dfs, merge_columns=['id'], how='left')
+
+    MergeProcessor().process_operation(operation, Dataset(facts), dimension, Dataset(regions))
+    index = dimension.key_index(['id'])
+    MergeProcessor().process_operation(operation, Dataset(facts), dimension, Dataset(regions))
+    assert dimension.key_index(['id']) is index
+
+    dimension.set_data(customers.iloc[:2])
+    assert dimension.key_index(['id']).tolist() == [1, 2]
+
+
+def test_duplicate_keys_fall_back_to_pairwise(frames):
+    facts, customers, regions = frames
+    customers = pd.concat([customers, customers.iloc[:1]], ignore_index=True)
+    datasets = [Dataset(facts), Dataset(customers), Dataset(regions)]
+
+    MergeProcessor().process_operation(bind_arguments(merge_dfs, merge_columns=['id'], how='left'), *datasets)
+
+    expected = pd.merge(pd.merge(facts, customers, on=['id'], how='left'), regions, on=['id'], how='left')
+    pd.testing.assert_frame_equal(datasets[0].get_data(), expected)
+
+
+@pytest.fixture
+def partitions():
+    return [pd.DataFrame({'id': [1, 2, 2], 'name': ['a', 'b', 'b']}),
+            pd.DataFrame({'name': ['b', 'c'], 'id': [2, 3]}),
+            pd.DataFrame({'id': [3, 4, 1], 'name': ['c', 'd', 'a']})]
+
+
+def test_add_new_rows_unions_every_dataset_at_once(partitions):
+    datasets = [Dataset(frame) for frame in partitions]
+
+    MergeProcessor().process_operation(add_new_rows, *datasets)
+
+    expected = reduce(add_new_rows, partitions)
+    pd.testing.assert_frame_equal(datasets[0].get_data(), expected)
+    assert datasets[0].get_data()['id'].tolist() == [1, 2, 3, 4]
+
+
+def test_incremental_union_keeps_row_hashes(partitions, tmp_path):
+    table = Dataset(partitions[0])
+    processor = MergeProcessor(incremental=True)
+
+    processor.process_operation(add_new_rows, table, Dataset(partitions[1]))
+    row_hashes = table.row_hashes()
+    assert len(row_hashes) == 3
+
+    processor.process_operation(add_new_rows, table, Dataset(partitions[2]))
+    assert table.get_data()['id'].tolist() == [1, 2, 3, 4]
+    assert table.row_hashes() is row_hashes and len(row_hashes) == 4
+
+    # The hashes can be saved and attached to the table in the next run
+    row_hashes.save(tmp_path / "hashes.npy")
+    restored = Dataset(table.get_data())
+    restored.set_row_hashes(RowHashSet.load(tmp_path / "hashes.npy"))
+    processor.process_operation(add_new_rows, restored, Dataset(pd.DataFrame({'id': [5, 4], 'name': ['e', 'd']})))
+    assert restored.get_data()['id'].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_row_hash_set_grows_in_sorted_runs():
+    row_hashes = RowHashSet()
+    for start in range(0, 1000, 10):
+        row_hashes.add(np.arange(start + 9, start - 1, -1, dtype=np.uint64))
+
+    # A logarithmic number of runs, found by every lookup
+    assert len(row_hashes) == 1000 and len(row_hashes._runs) <= 10
+    assert row_hashes.contains(np.array([0, 555, 999, 1000], dtype=np.uint64)).tolist() == [True, True, True, False]
+    assert (row_hashes.hashes == np.arange(1000, dtype=np.uint64)).all()
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('how', ['left', 'right', 'inner', 'outer'])
+def test_out_of_core_merge_matches_in_memory_merge(frames, tmp_path, how):
+    facts, customers, _ = frames
+    operation = bind_arguments(merge_dfs, merge_columns=['id'], how=how)
+    chunks = [facts.iloc[:2], facts.iloc[2:]]
+    streamed = StreamingDataset(lambda: iter(chunks))
+    # A tiny budget partitions every pair again
+    processor = MergeProcessor(out_of_core=HashPartitionedMerge(memory_budget=64, partitions=2, spill_dir=tmp_path))
+
+    processor.process_operation(operation, streamed, Dataset(customers))
+
+    assert not streamed.is_materialized()
+    expected = merge_dfs(facts, customers, merge_columns=['id'], how=how)
+    pd.testing.assert_frame_equal(_sorted(streamed.get_data()), _sorted(expected), check_dtype=False)
+    # Spill files are removed once the merged chunks are read
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_out_of_core_merge_streams_to_sink(frames, tmp_path):
+    facts, customers, regions = frames
+    streamed = StreamingDataset(lambda: iter([facts]), sink=CsvSink(tmp_path / "merged.csv"))
+    manager = ExecutionManager()
+    processor = MergeProcessor(out_of_core=HashPartitionedMerge(partitions=4))
+    manager.add_operation(1, processor, bind_arguments(merge_dfs, merge_columns=['id'], how='left'),
+                          [streamed, Dataset(customers), Dataset(regions)])
+
+    manager.execute()
+
+    written = pd.read_csv(tmp_path / "merged.csv")
+    expected = reduce(lambda left, right: merge_dfs(left, right, merge_columns=['id'], how='left'),
+                      [facts, customers, regions])
+    pd.testing.assert_frame_equal(_sorted(written), _sorted(expected), check_dtype=False)
@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+import pandas as pd
+from utils.helper import validate_column_values, drop_invalid_columns
+from utils.sampling import SamplingPolicy, wilson_interval
+from core.dataset import Dataset
+from processors.data_validation_processor import DataValidationProcessor
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      status: null
+      region: null
+    status:
+      - open
+      - closed
+    """)
+    return path
+
+def make_dataset(schema_path, invalid_every=None):
+    status = np.array(['open', 'closed'] * 5000, dtype=object)
+    if invalid_every:
+        status[::invalid_every] = 'broken'
+    df = pd.DataFrame({'status': status, 'region': np.repeat(['north', 'south'], 5000), 'extra': 1})
+    return Dataset(df, schema_path=schema_path)
+
+
+def test_wilson_interval():
+    lower, upper = wilson_interval(0, 100)
+    assert lower == 0.0 and 0.03 < upper < 0.04
+    lower, upper = wilson_interval(50, 100)
+    assert lower < 0.5 < upper
+
+
+def test_sample_is_reproducible_and_stratified(schema_path):
+    df = make_dataset(schema_path).get_data()
+    policy = SamplingPolicy(size=100, stratify_by='region', seed=7)
+
+    sample = policy.draw(df)
+    assert sample.index.equals(policy.draw(df).index)
+    assert sample['region'].value_counts().to_dict() == {'north': 50, 'south': 50}
+
+
+def test_clean_sample_skips_full_validation(schema_path, caplog):
+    dataset = make_dataset(schema_path)
+    processor = DataValidationProcessor(sampling=SamplingPolicy(size=500, seed=1))
+
+    processor.process_operation(validate_column_values, dataset)
+
+    report = dataset.sampling_report
+    assert not report.escalated
+    assert report.sample_rows == 500 and report.rows == 10_000
+    assert report.estimates[0].rate == 0 and report.estimates[0].upper < 0.01
+    assert "validating every row" not in caplog.text
+
+
+def test_sample_over_threshold_escalates(schema_path, caplog, capsys):
+    dataset = make_dataset(schema_path, invalid_every=10)
+    processor = DataValidationProcessor(sampling=SamplingPolicy(size=500, seed=1, threshold=0.01))
+
+    processor.process_operation(validate_column_values, dataset)
+
+    # The operation runs once, on every row, so its report is printed once
+    output = capsys.readouterr().out
+    assert output.count("Invalid values in column 'status'") == 1
+
+    estimate = dataset.sampling_report.estimates[0]
+    assert dataset.sampling_report.escalated
+    assert estimate.lower < 0.1 < estimate.upper
+    assert "validating every row" in caplog.text
+
+
+def test_operations_changing_data_run_on_every_row(schema_path):
+    dataset = make_dataset(schema_path)
+    processor = DataValidationProcessor(sampling=SamplingPolicy(size=100))
+    calls = []
+
+    def drop_and_count(dataframe, schema):
+        calls.append(len(dataframe))
+        return drop_invalid_columns(dataframe, schema)
+
+    processor.process_operation(drop_and_count, dataset)
+
+    # Straight on the full frame, not on the sample first
+    assert calls == [10_000]
+    assert dataset.get_data().shape == (10_000, 2) and dataset.sampling_report is None
@@ -0,0 +1,65 @@
+import os
+import pytest
+import pandas as pd
+from core.dataset import Dataset
+from utils.helper import drop_invalid_columns, validate_column_values
+from utils.schema import SchemaCache, CompiledSchema, schema_cache
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      NAME: null
+      AMOUNT: float64
+      CODE:
+        type: string
+    AMOUNT:
+      - '300'
+      - '$500'
+    """)
+    return path
+
+
+def test_datasets_share_the_compiled_schema(schema_path):
+    first = Dataset(pd.DataFrame({'NAME': ['a']}), schema_path=schema_path)
+    second = Dataset(pd.DataFrame({'NAME': ['b']}), schema_path=schema_path)
+
+    schema = first.get_schema()
+    assert schema is second.get_schema()
+    assert schema.columns == {'NAME', 'AMOUNT', 'CODE'}
+    assert schema.dtypes == {'AMOUNT': 'float64', 'CODE': 'string'}
+    assert schema.valid_values == {'AMOUNT': frozenset({'300', '$500'})}
+    # Reads like the parsed YAML
+    assert schema['COLUMNS']['NAME'] is None
+    assert list(schema.COLUMNS) == ['NAME', 'AMOUNT', 'CODE']
+
+
+def test_cache_reloads_changed_files_and_is_bounded(schema_path, tmp_path):
+    cache = SchemaCache(max_size=1)
+    schema = cache.get(schema_path)
+    assert cache.get(schema_path) is schema
+
+    schema_path.write_text("COLUMNS:\n  NAME: null\n")
+    stat = os.stat(schema_path)
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(schema_path).columns == {'NAME'}
+
+    other = tmp_path / "other.yaml"
+    other.write_text("COLUMNS:\n  AMOUNT: null\n")
+    cache.get(other)
+    assert len(cache) == 1
+
+
+def test_validation_operations_use_compiled_schema(schema_path, capsys):
+    schema = schema_cache.get(schema_path)
+    df = pd.DataFrame({'NAME': ['a', 'b', 'c'], 'AMOUNT': ['300', 'bad', None], 'EXTRA': [1, 2, 3]})
+
+    assert list(drop_invalid_columns(df, schema).columns) == ['NAME', 'AMOUNT']
+    validate_column_values(df, schema)
+    assert "Invalid values in column 'AMOUNT': bad" in capsys.readouterr().out
+
+    # Plain dictionaries are still accepted
+    assert isinstance(schema, CompiledSchema)
+    assert list(drop_invalid_columns(df, {'COLUMNS': {'NAME': None}}).columns) == ['NAME']
@@ -0,0 +1,55 @@
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from core.dataset import Dataset
+from core.shared_memory import SharedFrame
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'amount': [1.5, np.nan, 3.0],
+        'count': [1, 2, 3],
+        'name': [' Alice', None, 'Bob '],
+        'code': pd.array(['a', None, 'c'], dtype='string[pyarrow]'),
+        'grade': pd.Categorical(['x', 'y', 'x']),
+    }, index=[10, 11, 12])
+
+
+def test_shared_frame_round_trip(df):
+    frame = SharedFrame.from_dataframe(df)
+    attached = pickle.loads(pickle.dumps(frame))
+    try:
+        result = attached.to_dataframe(writeable=False)
+        pd.testing.assert_frame_equal(result, df)
+        assert [spec['kind'] for spec in frame.layout] == ['numpy', 'numpy', 'arrow', 'arrow', 'pickle']
+        assert not result['count'].to_numpy().flags.writeable
+    finally:
+        attached.close()
+        frame.release()
+
+    # Data built on a released segment stays readable
+    assert result['count'].sum() == 6
+
+
+def test_pickled_handle_does_not_hold_data():
+    large = pd.DataFrame({'values': np.arange(1_000_000)})
+    frame = SharedFrame.from_dataframe(large)
+    try:
+        assert len(pickle.dumps(frame)) < 10_000
+    finally:
+        frame.release()
+
+
+def test_set_data_releases_segment(df):
+    dataset = Dataset(df)
+    frame = dataset.share()
+    assert dataset.share() is frame
+
+    dataset.set_data(df.copy())
+    assert dataset._shared_frame is None
+    with pytest.raises(FileNotFoundError):
+        SharedFrame(frame.segment_name, df.columns, df.index, frame.layout).to_dataframe()
@@ -0,0 +1,116 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+from core.spill import spill_policy
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.merge_processor import MergeProcessor
+
+
+@pytest.fixture
+def spill_dir(tmp_path):
+    yield tmp_path
+    spill_policy.configure(None)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'ID': np.arange(1000),
+        'PRICE': np.linspace(0, 1, 1000),
+        'NAME': [f' name {i} ' for i in range(1000)],
+        'CATEGORY': pd.Categorical(['a', 'b'] * 500),
+        'WHEN': pd.date_range('2024-01-01', periods=1000, freq='h', tz='UTC'),
+        'LABEL': pd.array([f'l{i}' for i in range(1000)], dtype='string[pyarrow]'),
+    })
+
+
+def test_spilled_data_is_mapped_back(spill_dir, frame):
+    spill_policy.configure(directory=str(spill_dir))
+    dataset = Dataset(frame.copy(), storage='spill')
+
+    assert dataset.spill()
+    assert dataset.is_spilled() and dataset.memory_usage() == 0
+    assert len(os.listdir(spill_dir)) == 1
+
+    data = dataset.get_data()
+    pd.testing.assert_frame_equal(data, frame)
+    # Numeric columns are views of the file, writes stay in memory
+    values = data['ID'].to_numpy(copy=False)
+    assert not values.flags.owndata and values.flags.writeable
+    data.loc[0, 'ID'] = -1
+    dataset.spill()
+    assert dataset.get_data().loc[0, 'ID'] == -1
+    assert len(os.listdir(spill_dir)) == 1
+
+
+def test_data_arrow_cannot_hold_stays_in_memory(spill_dir):
+    spill_policy.configure(directory=str(spill_dir))
+    dataset = Dataset(pd.DataFrame({'A': [1, 'two', 3.0]}), storage='spill')
+
+    assert not dataset.spill()
+    assert dataset.is_resident() and not os.listdir(spill_dir)
+
+
+def test_missing_values_of_object_columns_are_kept(spill_dir):
+    spill_policy.configure(directory=str(spill_dir))
+    frame = pd.DataFrame({'NAN': ['a', np.nan, 'c'], 'NONE': ['a', None, 'c'], 'FLOAT': [1.0, np.nan, 3.0]})
+    dataset = Dataset(frame.copy(), storage='spill')
+
+    assert dataset.spill()
+    data = dataset.get_data()
+    pd.testing.assert_frame_equal(data, frame)
+    assert isinstance(data.loc[1, 'NAN'], float) and data.loc[1, 'NONE'] is None
+
+    # Arrow would read both back as None
+    mixed = Dataset(pd.DataFrame({'A': ['a', None, np.nan]}), storage='spill')
+    assert not mixed.spill() and mixed.is_resident()
+
+
+def test_datasets_needed_last_are_spilled_first(spill_dir, frame):
+    first, second, third = (Dataset(frame.copy(), storage='spill', name=name) for name in ('first', 'second', 'third'))
+    spill_policy.configure(memory_budget=2 * first.memory_usage(), directory=str(spill_dir))
+    steps = [(1, None, None, (first,)), (2, None, None, (second,)), (3, None, None, (third,)),
+             (4, None, None, (second,))]
+
+    schedule = spill_policy.start_run(steps)
+    try:
+        spill_policy.step_started(schedule, steps[0])
+        spill_policy.step_finished(schedule, steps[0])
+        # first is not used again, third is needed before second
+        assert first.is_spilled() and second.is_resident() and third.is_resident()
+
+        third.get_data()
+        spill_policy.step_started(schedule, steps[1])
+        spill_policy.step_finished(schedule, steps[1])
+        assert first.is_spilled() and second.is_resident() and third.is_resident()
+    finally:
+        spill_policy.end_run(schedule)
+
+
+def test_pipeline_with_spilling_matches_in_memory(spill_dir, frame):
+    def run(storage):
+        datasets = [Dataset(frame.copy(), storage=storage, name=f'batch_{i}') for i in range(3)]
+        manager = ExecutionManager()
+        manager.configure_scheduler('order')
+        manager.add_operation(1, DataCleaningProcessor(), strip_leading_and_trailing_spaces, datasets)
+        manager.add_operation(2, MergeProcessor(), add_new_rows, datasets)
+        manager.add_operation(3, DataCleaningProcessor(), remove_duplicates, datasets[:1])
+        manager.execute()
+        return datasets
+
+    expected = run('memory')
+    spill_policy.configure(memory_budget=0, directory=str(spill_dir))
+    datasets = run('spill')
+
+    # Nothing is in use once the run ends, the budget spills every dataset
+    assert all(dataset.is_spilled() for dataset in datasets)
+    for dataset, reference in zip(datasets, expected):
+        pd.testing.assert_frame_equal(dataset.get_data(), reference.get_data())
+
+
+def test_invalid_storage():
+    with pytest.raises(ValueError, match="storage"):
+        Dataset(pd.DataFrame(), storage='disk')
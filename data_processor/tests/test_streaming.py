@@ -0,0 +1,125 @@
+import pytest
+import pandas as pd
+from utils.helper import *
+from core.dataset import Dataset
+from core.spill import spill_policy
+from core.streaming import StreamingDataset, CsvSink
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+from processors.data_validation_processor import DataValidationProcessor
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    data = {
+        'name': [' Alice ', 'Bob ', 'Carla ', ' alice', 'Bob '],
+        'amount': ['$500', '300', '$700', '300', '300'],
+        'extra': ['x', 'y', 'z', 'w', 'y'],
+    }
+    path = tmp_path / "input.csv"
+    pd.DataFrame(data).to_csv(path, index=False)
+    return path
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.yaml"
+    path.write_text("""
+    COLUMNS:
+      NAME: null
+      AMOUNT: null
+    """)
+    return path
+
+@pytest.fixture(autouse=True)
+def clear_operations():
+    ExecutionManager.global_operations.clear()
+    yield
+    ExecutionManager.global_operations.clear()
+
+
+def test_chunks_are_processed_lazily(csv_path):
+    chunks_read = []
+
+    def source():
+        for chunk in pd.read_csv(csv_path, chunksize=2):
+            chunks_read.append(len(chunk))
+            yield chunk
+
+    dataset = StreamingDataset(source)
+    dataset.queue_operation(DataCleaningProcessor(), make_uppercase)
+    assert chunks_read == []
+
+    chunks = list(dataset.iter_chunks())
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0]['NAME'].tolist() == [' ALICE ', 'BOB ']
+
+
+def test_execute_streams_into_sink(csv_path, schema_path, tmp_path):
+    output_path = tmp_path / "output.csv"
+    dataset = StreamingDataset.from_csv(csv_path, chunksize=2, schema_path=schema_path, sink=CsvSink(output_path))
+
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), make_uppercase, [dataset])
+    ExecutionManager.add_operation(2, DataCleaningProcessor(), strip_leading_and_trailing_spaces, [dataset])
+    ExecutionManager.add_operation(3, DataValidationProcessor(), drop_invalid_columns, [dataset])
+    ExecutionManager.execute()
+
+    cleaned = strip_leading_and_trailing_spaces(make_uppercase(pd.read_csv(csv_path)))
+    expected = drop_invalid_columns(cleaned, read_yaml(schema_path))
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
+
+
+def test_numeric_cleaning_needs_every_row(tmp_path):
+    # Whether AMOUNT becomes float64 depends on every row, chunks would get different dtypes
+    path = tmp_path / "amounts.csv"
+    pd.DataFrame({'AMOUNT': ['10', '20', 'abc', '30']}).to_csv(path, index=False)
+    with pytest.raises(FullDatasetRequiredError):
+        StreamingDataset.from_csv(path, chunksize=2).queue_operation(DataCleaningProcessor(), clean_numeric_values)
+
+    output_path = tmp_path / "output.csv"
+    dataset = StreamingDataset.from_csv(path, chunksize=2, full_dataset_strategy='materialize', dtype=str,
+                                        sink=CsvSink(output_path))
+    ExecutionManager.add_operation(1, DataCleaningProcessor(), apply_standard_cleaning, [dataset])
+    ExecutionManager.execute()
+
+    assert pd.read_csv(output_path, dtype=str)['AMOUNT'].tolist() == ['10.0', '20.0', 'ABC', '30.0']
+
+
+def test_chunks_ignore_dataset_defaults(csv_path, monkeypatch):
+    monkeypatch.setattr(Dataset, 'dtype_mode', 'optimize')
+    monkeypatch.setattr(Dataset, 'storage', 'spill')
+    tracked = []
+    monkeypatch.setattr(spill_policy, 'track', tracked.append)
+    dataset = StreamingDataset.from_csv(csv_path, chunksize=2)
+    dataset.queue_operation(DataCleaningProcessor(), make_uppercase)
+
+    # Chunks keep the dtypes they are read with, optimized ones would get e.g. int8 or category
+    with pd.read_csv(csv_path, chunksize=2) as raw:
+        for chunk, raw_chunk in zip(dataset.iter_chunks(), raw):
+            assert chunk.dtypes.tolist() == raw_chunk.dtypes.tolist()
+    assert dataset.get_data()['NAME'].tolist() == [' ALICE ', 'BOB ', 'CARLA ', ' ALICE', 'BOB ']
+    assert not tracked
+
+
+def test_replacing_materialized_data_releases_shared_memory(csv_path):
+    dataset = StreamingDataset.from_csv(csv_path, chunksize=2, full_dataset_strategy='materialize')
+    dataset.queue_operation(DataCleaningProcessor(), remove_duplicates)
+    dataset.share()
+
+    dataset.set_data(dataset.get_data().iloc[:1])
+    assert dataset._shared_frame is None
+
+
+def test_full_dataset_operation_raises_by_default(csv_path):
+    dataset = StreamingDataset.from_csv(csv_path, chunksize=2)
+
+    with pytest.raises(FullDatasetRequiredError):
+        dataset.queue_operation(DataCleaningProcessor(), remove_duplicates)
+
+
+def test_full_dataset_operation_materializes_when_requested(csv_path):
+    dataset = StreamingDataset.from_csv(csv_path, chunksize=2, full_dataset_strategy='materialize', dtype=str)
+    dataset.queue_operation(DataCleaningProcessor(), strip_leading_and_trailing_spaces)
+    dataset.queue_operation(DataCleaningProcessor(), remove_duplicates)
+
+    assert dataset.is_materialized()
+    assert dataset.get_data()['name'].tolist() == ['Alice', 'Bob', 'Carla', 'alice']
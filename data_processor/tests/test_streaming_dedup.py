@@ -0,0 +1,106 @@
+import pytest
+import numpy as np
+import pandas as pd
+from utils.helper import *
+from utils.streaming_dedup import DiskHashSet, BloomFilter, drop_seen_rows
+from core.streaming import StreamingDataset
+from core.execution_manager import ExecutionManager
+from processors.data_cleaning_processor import DataCleaningProcessor
+
+
+@pytest.fixture
+def batches():
+    first = pd.DataFrame({'id': [1, 2, 2, 3], 'name': ['a', 'b', 'b', 'c']})
+    second = pd.DataFrame({'id': [3, 4, 1, 5], 'name': ['c', 'd', 'x', 'e']})
+    return first, second
+
+
+@pytest.fixture(params=['exact', 'verified', 'bloom'])
+def store_factory(request, tmp_path):
+    if request.param == 'bloom':
+        return lambda: BloomFilter(tmp_path / "seen.npy", capacity=1000, error_rate=0.001)
+    return lambda: DiskHashSet(tmp_path / "seen.db", verify=request.param == 'verified')
+
+
+def test_duplicates_across_batches_are_dropped(batches, store_factory):
+    first, second = batches
+    store = store_factory()
+
+    assert drop_seen_rows(first, store)['id'].tolist() == [1, 2, 3]
+    assert drop_seen_rows(second, store)['id'].tolist() == [4, 1, 5]
+    assert len(store) == 6
+
+
+def test_state_persists_between_runs(batches, store_factory):
+    first, second = batches
+    store = store_factory()
+    drop_seen_rows(first, store)
+    store.close()
+
+    store = store_factory()
+    assert drop_seen_rows(second, store)['id'].tolist() == [4, 1, 5]
+
+
+def test_subset_identifies_rows(batches, tmp_path):
+    first, second = batches
+    store = DiskHashSet(tmp_path / "seen.db")
+    drop_seen_rows(first, store, subset=['id'])
+
+    assert drop_seen_rows(second, store, subset=['id'])['id'].tolist() == [4, 5]
+
+
+def test_verification_keeps_rows_with_colliding_hashes():
+    hashes = np.array([42], dtype=np.uint64)
+    verified = DiskHashSet(':memory:', verify=True)
+    unverified = DiskHashSet(':memory:')
+    for store in (verified, unverified):
+        store.seen(hashes, pd.DataFrame({'id': [1]}))
+
+    assert not verified.seen(hashes, pd.DataFrame({'id': [2]})).any()
+    assert verified.seen(hashes, pd.DataFrame({'id': [1]})).all()
+    assert unverified.seen(hashes, pd.DataFrame({'id': [2]})).all()
+
+
+def test_verification_within_a_batch():
+    hashes = np.array([7, 7, 7, 8], dtype=np.uint64)
+    batch = pd.DataFrame({'id': [1, 2, 1, 3]})
+    verified = DiskHashSet(':memory:', verify=True)
+
+    # Rows 0 and 1 collide, row 2 repeats row 0
+    assert verified.seen(hashes, batch).tolist() == [False, False, True, False]
+    assert len(verified) == 3
+    assert verified.seen(hashes[:2], batch.iloc[:2]).all()
+    assert DiskHashSet(':memory:').seen(hashes, batch).tolist() == [False, True, True, False]
+
+
+def test_verification_compares_values_not_objects():
+    shared = 'abc'
+    same_object = pd.DataFrame({'a': [shared], 'b': [shared]}, dtype=object)
+    distinct_objects = pd.DataFrame({'a': [''.join(['ab', 'c'])], 'b': [''.join(['a', 'bc'])]}, dtype=object)
+    store = DiskHashSet(':memory:', verify=True)
+
+    drop_seen_rows(same_object, store)
+    assert drop_seen_rows(distinct_objects, store).empty
+    assert len(drop_seen_rows(pd.concat([distinct_objects, same_object], ignore_index=True),
+                              DiskHashSet(':memory:', verify=True))) == 1
+
+
+def test_bloom_filter_false_positive_rate():
+    rng = np.random.default_rng(0)
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    bloom.seen(rng.integers(0, 2 ** 63, 10_000).astype(np.uint64))
+
+    assert bloom.seen(rng.integers(0, 2 ** 63, 10_000).astype(np.uint64)).mean() < 0.02
+
+
+def test_streaming_dataset_dedups_chunk_by_chunk(batches, tmp_path):
+    chunks = list(batches)
+    dataset = StreamingDataset(lambda: iter(chunks))
+    operation = bind_arguments(remove_duplicates_across_batches, store=DiskHashSet(tmp_path / "seen.db"))
+    manager = ExecutionManager()
+    manager.add_operation(1, DataCleaningProcessor(), operation, [dataset])
+
+    manager.execute()
+
+    assert not dataset.is_materialized()
+    assert [chunk['id'].tolist() for chunk in dataset.iter_chunks()] == [[1, 2, 3], [4, 1, 5]]
@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+import pandas as pd
+from utils.validation_engine import validate_dataframe
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'status': ['open', 'closed', 'bad', None, 'worse', 'bad'],
+        'grade': pd.Categorical(['A', 'B', 'Z', 'A', None, 'Y']),
+        'amount': [1, 2, 3, 4, 5, 6],
+    })
+
+@pytest.fixture
+def schema():
+    return {
+        'COLUMNS': {'status': None, 'grade': None, 'amount': None},
+        'status': ['open', 'closed'],
+        'grade': ['A', 'B'],
+        'missing': ['x'],
+    }
+
+
+def test_report_lists_violations_per_column(df, schema):
+    report = validate_dataframe(df, schema)
+
+    assert not report.is_valid
+    assert report.to_records() == [
+        {'column': 'status', 'count': 3, 'samples': ['bad', 'worse']},
+        {'column': 'grade', 'count': 2, 'samples': ['Z', 'Y']},
+    ]
+    assert report.violations[0].mask.tolist() == [False, False, True, False, True, True]
+    assert report.mask.tolist() == [False, False, True, False, True, True]
+    assert report.total_violations == 5
+
+
+def test_report_samples_and_budget(df, schema):
+    assert validate_dataframe(df, schema, sample_size=1).violations[0].samples == ('bad',)
+
+    report = validate_dataframe(df, schema, max_violations=2)
+    assert report.truncated
+    assert [violation.column for violation in report.violations] == ['status']
+
+
+def test_valid_dataframe(df, schema):
+    report = validate_dataframe(df[['amount']], schema)
+    assert report.is_valid
+    assert not report.mask.any()
@@ -0,0 +1,103 @@
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+STRING_BACKENDS = ('python', 'pyarrow')
+
+# Characters matched by Python's str.strip() and by \s in Python regular expressions,
+# spelled out so Arrow (RE2 / utf8proc) kernels give exactly the same results
+PYTHON_WHITESPACE = ''.join(chr(code) for code in (
+    0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x1c, 0x1d, 0x1e, 0x1f, 0x20, 0x85, 0xa0, 0x1680,
+    *range(0x2000, 0x200b), 0x2028, 0x2029, 0x202f, 0x205f, 0x3000,
+))
+RE2_WHITESPACE = r'[\t\n\x0b\x0c\r\x1c-\x20\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+
+
+def check_string_backend(backend: str):
+    """
+    Ensure the string backend is known and its dependencies are installed.
+    """
+    if backend not in STRING_BACKENDS:
+        raise ValueError(f"Invalid string backend '{backend}'. Use one of: {', '.join(STRING_BACKENDS)}.")
+    if backend == 'pyarrow' and pa is None:
+        raise ImportError("The 'pyarrow' string backend requires the pyarrow package.")
+
+
+def is_arrow_string(series: pd.Series) -> bool:
+    """
+    Check if a column holds Arrow-backed strings.
+    """
+    return isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == 'pyarrow'
+
+
+def convert_string_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert object columns holding only strings (and nulls) to Arrow-backed string dtype.
+
+    :param dataframe: Input DataFrame, left unmodified.
+    :return: A DataFrame whose string columns are stored in Arrow buffers.
+    """
+    string_columns = [col for col in dataframe.columns[dataframe.dtypes == 'object']
+                      if pd.api.types.infer_dtype(dataframe[col], skipna=True) == 'string']
+    if not string_columns:
+        return dataframe
+
+    return dataframe.astype({col: pd.StringDtype('pyarrow') for col in string_columns})
+
+
+def _kernel(name: str):
+    # Older pyarrow releases may not ship every kernel
+    return getattr(pc, name, None)
+
+
+def _to_series(array, series: pd.Series) -> pd.Series:
+    return pd.Series(pd.arrays.ArrowStringArray(array), index=series.index, name=series.name)
+
+
+def arrow_upper(series: pd.Series):
+    """
+    Uppercase an Arrow string column. Returns None when the kernels are not available.
+    """
+    ascii_upper, is_ascii = _kernel('ascii_upper'), _kernel('string_is_ascii')
+    if ascii_upper is None or is_ascii is None:
+        return None
+
+    array = pa.array(series.array)
+    result = _to_series(ascii_upper(array), series)
+
+    # utf8proc does not apply multi-character mappings (e.g. 'ß' -> 'SS'), non-ASCII strings go through Python
+    non_ascii = pc.fill_null(pc.invert(is_ascii(array)), False).to_numpy(zero_copy_only=False)
+    if non_ascii.any():
+        values = result.to_numpy(dtype=object)
+        values[non_ascii] = [value.upper() for value in series.to_numpy(dtype=object)[non_ascii]]
+        result = pd.Series(values, index=series.index, name=series.name).astype(series.dtype)
+
+    return result
+
+
+def arrow_strip(series: pd.Series):
+    """
+    Strip leading and trailing whitespace from an Arrow string column. Returns None when the kernel is not available.
+    """
+    trim = _kernel('utf8_trim')
+    if trim is None:
+        return None
+
+    return _to_series(trim(pa.array(series.array), characters=PYTHON_WHITESPACE), series)
+
+
+def arrow_replace_regex(series: pd.Series, pattern: str, replacement: str):
+    """
+    Replace regex matches in an Arrow string column. The pattern uses RE2 syntax,
+    spell whitespace as RE2_WHITESPACE to match Python's \\s. Returns None when the kernel is not available.
+    """
+    replace = _kernel('replace_substring_regex')
+    if replace is None:
+        return None
+
+    return _to_series(replace(pa.array(series.array), pattern=pattern, replacement=replacement), series)
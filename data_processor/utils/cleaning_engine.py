@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable, List
+
+# Object/string columns whose distinct-to-total ratio is at most this value are cleaned
+# once per distinct value and mapped back through their codes
+DICTIONARY_ENCODING_THRESHOLD = 0.5
+
+# Columns shorter than this are always cleaned row by row
+DICTIONARY_ENCODING_MIN_ROWS = 1000
+
+# Number of values used to estimate the cardinality ratio before encoding a column
+CARDINALITY_SAMPLE_SIZE = 10000
+
+
+def is_fusable(operation) -> bool:
+    """
+    Check if an operation exposes the per-column kernels used by the fused cleaning engine.
+    """
+    return any(getattr(operation, attr, None) is not None
+               for attr in ('_fused_chain', '_column_kernel', '_columns_kernel'))
+
+
+def expand_operations(operations: Iterable) -> List:
+    """
+    Flatten composite operations into their built-in steps and drop steps made redundant by their successor.
+
+    :param operations: Fusable operations in execution order.
+    :return: A list of single-kernel operations, equivalent to running the input one after another.
+    """
+    expanded = []
+    for operation in operations:
+        chain = getattr(operation, '_fused_chain', None)
+        if chain is not None:
+            expanded.extend(expand_operations(chain))
+        else:
+            expanded.append(operation)
+
+    # A step whose kernel already covers the previous step (e.g. manage_special_characters
+    # after remove_spaces_Around_punctuation) makes that previous step a no-op
+    result = []
+    for operation in expanded:
+        if result and result[-1] in getattr(operation, '_absorbs', ()):
+            result.pop()
+        result.append(operation)
+
+    return result
+
+
+def _apply_kernels(series: pd.Series, kernels: List) -> pd.Series:
+    result = series
+    for kernel in kernels:
+        result = kernel(result)
+    return result
+
+
+def _is_low_cardinality(series: pd.Series) -> bool:
+    """
+    Estimate from an evenly spaced sample whether a column is worth dictionary encoding.
+    """
+    if len(series) < DICTIONARY_ENCODING_MIN_ROWS:
+        return False
+
+    step = max(len(series) // CARDINALITY_SAMPLE_SIZE, 1)
+    sample = series.iloc[::step]
+    try:
+        return sample.nunique(dropna=False) <= DICTIONARY_ENCODING_THRESHOLD * len(sample)
+    except TypeError:
+        # Unhashable values
+        return False
+
+
+def _transform_categorical(series: pd.Series, kernels: List) -> pd.Series:
+    categories = pd.Series(series.cat.categories)
+    transformed = _apply_kernels(categories, kernels)
+    if transformed is categories:
+        return series
+
+    # Different categories may collapse into one value once cleaned (e.g. 'a' and 'A')
+    mapping, new_categories = pd.factorize(transformed)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes == -1, -1, mapping[codes])
+    values = pd.Categorical.from_codes(new_codes, categories=new_categories, ordered=series.cat.ordered)
+
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _transform_encoded(series: pd.Series, kernels: List):
+    """
+    Apply the kernels to the distinct values of a column and expand the result through the codes.
+    Returns None when the column does not qualify.
+    """
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > DICTIONARY_ENCODING_THRESHOLD * len(series):
+        return None
+
+    dictionary = pd.Series(uniques, dtype=series.dtype)
+    missing = codes == -1
+    if missing.any():
+        # Keep the exact null object (None, NaN, ...) unless several kinds are mixed
+        nulls = series[missing].unique()
+        if len(nulls) > 1:
+            return None
+        dictionary = pd.concat([dictionary, pd.Series(nulls, dtype=series.dtype)], ignore_index=True)
+        codes[missing] = len(uniques)
+
+    transformed = _apply_kernels(dictionary, kernels)
+    if transformed is dictionary:
+        return series
+
+    return pd.Series(transformed.array.take(codes), index=series.index, name=series.name)
+
+
+def transform_column(series: pd.Series, kernels: List) -> pd.Series:
+    """
+    Apply value kernels to a column, choosing between row-by-row and dictionary-encoded execution.
+
+    Category columns are transformed through their categories. Object/string columns are
+    dictionary encoded when their cardinality ratio is at most DICTIONARY_ENCODING_THRESHOLD.
+    Either way the values are the same as applying the kernels row by row.
+
+    :param series: Column to transform.
+    :param kernels: Value kernels in execution order.
+    :return: The transformed column, or the input column itself if no kernel changed it.
+    """
+    if not kernels:
+        return series
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _transform_categorical(series, kernels)
+
+    if (series.dtype == 'object' or series.dtype == 'string') and _is_low_cardinality(series):
+        try:
+            result = _transform_encoded(series, kernels)
+        except TypeError:
+            # Unhashable values
+            result = None
+        if result is not None:
+            return result
+
+    return _apply_kernels(series, kernels)
+
+
+def run_cleaning_chain(dataframe: pd.DataFrame, operations: Iterable) -> pd.DataFrame:
+    """
+    Run a chain of fusable cleaning operations in a single pass per column.
+
+    Column names go through every column-name kernel first, then each column goes through
+    every value kernel in order (see transform_column). The output frame is allocated once, at the end.
+
+    :param dataframe: Input DataFrame, left unmodified.
+    :param operations: Fusable operations in execution order.
+    :return: A new DataFrame equal to applying the operations one after another.
+    """
+    operations = expand_operations(operations)
+
+    columns = dataframe.columns
+    for operation in operations:
+        columns_kernel = getattr(operation, '_columns_kernel', None)
+        if columns_kernel is not None:
+            columns = columns_kernel(columns)
+
+    kernels = [operation._column_kernel for operation in operations
+               if getattr(operation, '_column_kernel', None) is not None]
+
+    arrays = {}
+    for position in range(dataframe.shape[1]):
+        series = dataframe.iloc[:, position]
+        result = transform_column(series, kernels)
+
+        # Untouched columns are copied so the output never shares memory with the input
+        arrays[position] = series.array.copy() if result is series else result.array
+
+    _df = pd.DataFrame(arrays, index=dataframe.index, copy=False)
+    _df.columns = columns
+
+    return _df.__finalize__(dataframe)
+
+
+def split_fusable_runs(operations: Iterable) -> List:
+    """
+    Replace every run of two or more consecutive fusable operations with a single fused operation.
+
+    :param operations: Cleaning operations in execution order.
+    :return: The operations to run, in order.
+    """
+    result = []
+    run = []
+
+    def flush():
+        if len(run) > 1:
+            result.append(FusedCleaningOperation(run))
+        else:
+            result.extend(run)
+        run.clear()
+
+    for operation in operations:
+        if is_fusable(operation):
+            run.append(operation)
+        else:
+            flush()
+            result.append(operation)
+    flush()
+
+    return result
+
+
+class FusedCleaningOperation:
+    """
+    A chain of built-in cleaning operations executed as one operation by the fused cleaning engine.
+    """
+
+    _is_cleaning_operation = True
+
+    def __init__(self, operations: Iterable):
+        operations = list(operations)
+        for operation in operations:
+            if not is_fusable(operation):
+                raise TypeError(f"The operation '{getattr(operation, '__name__', operation)}' cannot be fused.")
+
+        self.operations = tuple(expand_operations(operations))
+        self._fused_chain = self.operations
+        self._is_row_local = all(getattr(operation, '_is_row_local', False) for operation in self.operations)
+        self.__name__ = f"fused({', '.join(operation.__name__ for operation in operations)})"
+
+    def __call__(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return run_cleaning_chain(dataframe, self.operations)
+
+    def __repr__(self):
+        return f"<FusedCleaningOperation {self.__name__}>"
@@ -0,0 +1,275 @@
+import logging
+from typing import Mapping, NamedTuple, Tuple
+import numpy as np
+import pandas as pd
+from utils.arrow_backend import pa
+
+logger = logging.getLogger(__name__)
+
+# What a Dataset does with the dtypes of its data: 'keep' leaves them, 'schema' converts the columns the schema
+# declares a dtype for, 'optimize' also gives every other column the most compact dtype holding the same values
+DTYPE_MODES = ('keep', 'schema', 'optimize')
+
+# Schema dtype names that are not pandas dtype names. Plain integers are nullable, raw data often has gaps
+DTYPE_ALIASES = {
+    'int': 'Int64', 'integer': 'Int64',
+    'float': 'float64', 'double': 'float64',
+    'str': 'string', 'text': 'string',
+    'datetime': 'datetime64[ns]', 'timestamp': 'datetime64[ns]', 'date': 'datetime64[ns]',
+}
+
+# Spellings of booleans in text columns
+TRUE_STRINGS = frozenset({'true', 't', 'yes', 'y', '1'})
+FALSE_STRINGS = frozenset({'false', 'f', 'no', 'n', '0'})
+
+# Integer dtypes tried by the optimizer, smallest first
+_INTEGER_DTYPES = (np.int8, np.int16, np.int32)
+
+
+def check_dtype_mode(mode: str):
+    if mode not in DTYPE_MODES:
+        raise ValueError(f"Invalid dtype mode '{mode}'. Use one of: {', '.join(DTYPE_MODES)}.")
+
+
+def resolve_dtype(name: str):
+    """
+    Get the pandas dtype of a dtype name from a schema.
+
+    Names are pandas dtype names (int8 to int64, uint8 to uint64, float32, float64, bool, category, object,
+    datetime64[ns], datetime64[ns, UTC], the nullable Int8 to Int64 and boolean, string[pyarrow]) or the aliases
+    of DTYPE_ALIASES. 'string' stores strings in Arrow buffers, in object columns when pyarrow is not installed.
+
+    :raises ValueError: If the name is not a known dtype.
+    """
+    name = DTYPE_ALIASES.get(name, name)
+    if name == 'string':
+        return pd.StringDtype('pyarrow') if pa is not None else np.dtype(object)
+    try:
+        return pd.api.types.pandas_dtype(name)
+    except (TypeError, ValueError, ImportError):
+        raise ValueError(f"Invalid dtype '{name}' in the schema.")
+
+
+def _to_numeric(series: pd.Series, dtype, column) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        values = series
+    else:
+        try:
+            values = pd.to_numeric(series.astype(object) if isinstance(series.dtype, pd.CategoricalDtype) else series)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Column '{column}' cannot be converted to {dtype}: {error}")
+
+    if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_integer_dtype(values.dtype):
+        present = values.dropna()
+        if isinstance(dtype, np.dtype) and len(present) < len(values):
+            raise ValueError(f"Column '{column}' has missing values, {dtype} cannot hold them. "
+                             f"Use the nullable {str(dtype).capitalize()} dtype.")
+        if (present % 1 != 0).any():
+            raise ValueError(f"Column '{column}' has fractional values, {dtype} would truncate them.")
+    if pd.api.types.is_integer_dtype(dtype) and len(values.dropna()):
+        limits = np.iinfo(dtype.numpy_dtype if hasattr(dtype, 'numpy_dtype') else dtype)
+        if values.min() < limits.min or values.max() > limits.max:
+            raise ValueError(f"Column '{column}' has values out of the range of {dtype}.")
+    return values.astype(dtype)
+
+
+def _to_bool(series: pd.Series, dtype, column) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series.dtype):
+        values = series
+    else:
+        def parse(value):
+            if pd.isna(value):
+                return None
+            if isinstance(value, (bool, np.bool_)) or (isinstance(value, (int, float, np.number)) and value in (0, 1)):
+                return bool(value)
+            text = str(value).strip().lower()
+            if text in TRUE_STRINGS:
+                return True
+            if text in FALSE_STRINGS:
+                return False
+            raise ValueError(f"Column '{column}' cannot be converted to {dtype}: invalid value {value!r}.")
+
+        values = pd.Series([parse(value) for value in series.astype(object)], index=series.index, name=series.name,
+                           dtype=object)
+    if isinstance(dtype, np.dtype) and values.isna().any():
+        raise ValueError(f"Column '{column}' has missing values, bool cannot hold them. Use the nullable boolean dtype.")
+    return values.astype(dtype)
+
+
+def _to_datetime(series: pd.Series, dtype, column) -> pd.Series:
+    try:
+        values = series if pd.api.types.is_datetime64_any_dtype(series.dtype) else pd.to_datetime(series)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Column '{column}' cannot be converted to {dtype}: {error}")
+
+    timezone = getattr(dtype, 'tz', None)
+    if timezone is not None:
+        values = values.dt.tz_convert(timezone) if values.dt.tz is not None else values.dt.tz_localize(timezone)
+    elif values.dt.tz is not None:
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    return values.astype(dtype)
+
+
+def convert_column(series: pd.Series, dtype) -> pd.Series:
+    """
+    Convert a column to a dtype. Text is parsed for numeric, boolean and datetime dtypes.
+
+    :raises ValueError: If a value cannot be represented in the dtype (e.g. text that is not a number,
+        a missing value for a NumPy integer or bool column, a fraction or an out of range value for an integer).
+    """
+    if series.dtype == dtype:
+        return series
+    column = series.name
+    if pd.api.types.is_bool_dtype(dtype):
+        return _to_bool(series, dtype, column)
+    if pd.api.types.is_numeric_dtype(dtype):
+        return _to_numeric(series, dtype, column)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return _to_datetime(series, dtype, column)
+    try:
+        return series.astype(dtype)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Column '{column}' cannot be converted to {dtype}: {error}")
+
+
+def _compact_integers(series: pd.Series) -> pd.Series:
+    if not len(series):
+        return series
+    low, high = series.min(), series.max()
+    for dtype in _INTEGER_DTYPES:
+        if np.dtype(dtype).itemsize >= series.dtype.itemsize:
+            break
+        limits = np.iinfo(dtype)
+        if limits.min <= low and high <= limits.max:
+            return series.astype(dtype)
+    return series
+
+
+def _compact_floats(series: pd.Series) -> pd.Series:
+    values = series.to_numpy()
+    narrow = values.astype(np.float32)
+    # Only when every value survives the round trip, NaN included
+    if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+        return pd.Series(narrow, index=series.index, name=series.name)
+    return series
+
+
+def _compact_strings(series: pd.Series, category_ratio: float) -> pd.Series:
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) != 'string':
+        if pd.api.types.infer_dtype(series, skipna=False) == 'boolean':
+            return series.astype(bool)
+        return series
+    if len(series) and series.nunique() <= category_ratio * len(series):
+        return series.astype('category')
+    if series.dtype == object and pa is not None:
+        return series.astype(pd.StringDtype('pyarrow'))
+    return series
+
+
+def compact_column(series: pd.Series, category_ratio: float = 0.5) -> pd.Series:
+    """
+    Get the column in the most compact dtype holding exactly the same values: integers in the narrowest signed
+    width, floats in float32 when no value changes, strings with few distinct values (at most category_ratio of
+    the rows) as category and other strings in Arrow buffers, object columns of booleans as bool.
+    Other columns are returned as they are.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind == 'i':
+        return _compact_integers(series)
+    if isinstance(dtype, np.dtype) and dtype == np.float64:
+        return _compact_floats(series)
+    if dtype == object or (isinstance(dtype, pd.StringDtype)):
+        return _compact_strings(series, category_ratio)
+    return series
+
+
+class ColumnMemory(NamedTuple):
+    column: str
+    dtype_before: str
+    dtype_after: str
+    bytes_before: int
+    bytes_after: int
+
+
+class MemoryReport(NamedTuple):
+    """
+    Memory of a DataFrame before and after its dtypes were converted, in bytes, Python strings included.
+    """
+    columns: Tuple[ColumnMemory, ...]
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def ratio(self) -> float:
+        """
+        How many times smaller the data got.
+        """
+        return self.bytes_before / self.bytes_after if self.bytes_after else float('inf')
+
+    def __str__(self):
+        lines = [f"{column.column:<30} {column.dtype_before:>16} -> {column.dtype_after:<16} "
+                 f"{column.bytes_before:>14,} -> {column.bytes_after:>14,}" for column in self.columns]
+        lines.append(f"{'Total':<30} {'':>16}    {'':<16} {self.bytes_before:>14,} -> {self.bytes_after:>14,} "
+                     f"({self.ratio:.1f}x)")
+        return '\n'.join(lines)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> MemoryReport:
+    """
+    Compare the memory of the columns of a DataFrame before and after a dtype conversion.
+    Both DataFrames have the same columns in the same order.
+    """
+    usage_before = before.memory_usage(index=True, deep=True)
+    usage_after = after.memory_usage(index=True, deep=True)
+    # The first entry is the index, columns are matched by position so duplicate names are fine
+    columns = tuple(ColumnMemory(column, str(dtype_before), str(dtype_after), int(bytes_before), int(bytes_after))
+                    for column, dtype_before, dtype_after, bytes_before, bytes_after
+                    in zip(after.columns, before.dtypes, after.dtypes, usage_before.iloc[1:], usage_after.iloc[1:]))
+    return MemoryReport(columns, int(usage_before.sum()), int(usage_after.sum()))
+
+
+def enforce_dtypes(dataframe: pd.DataFrame, dtypes: Mapping = None, optimize: bool = False,
+                   category_ratio: float = 0.5) -> Tuple[pd.DataFrame, MemoryReport]:
+    """
+    Convert the columns of a DataFrame to their declared dtypes.
+
+    :param dataframe: Input DataFrame, left unmodified.
+    :param dtypes: Dtype name by column (see resolve_dtype), e.g. CompiledSchema.dtypes.
+        Declared columns missing from the DataFrame are ignored. Columns declaring a type name that is not a known
+        dtype (e.g. 'varchar' in a schema written for another tool) are left as they are, with a warning.
+    :param optimize: Also give the other columns their most compact dtype (see compact_column).
+    :param category_ratio: Highest ratio of distinct values to rows of the strings the optimizer stores as category.
+    :raises ValueError: If a declared column cannot be converted.
+    :return: The converted DataFrame and the memory report of the conversion.
+    """
+    declared, unknown = {}, []
+    for column, name in (dtypes or {}).items():
+        try:
+            declared[column] = resolve_dtype(name)
+        except ValueError:
+            unknown.append(column)
+            declared[column] = None
+    if unknown:
+        logger.warning("Leaving columns with unknown dtypes as they are: %s",
+                       ', '.join(f"{column} ({dtypes[column]})" for column in unknown))
+
+    converted = {}
+    for position, column in enumerate(dataframe.columns):
+        series = dataframe.iloc[:, position]
+        if column in declared:
+            if declared[column] is None:
+                continue
+            result = convert_column(series, declared[column])
+        elif optimize:
+            result = compact_column(series, category_ratio)
+        else:
+            continue
+        if result is not series:
+            converted[position] = result
+
+    result = dataframe
+    if converted:
+        result = dataframe.copy(deep=False)
+        for position, series in converted.items():
+            result.isetitem(position, series)
+    return result, memory_report(dataframe, result)
@@ -5,9 +5,13 @@ class ExceptionHandler:
     A class responsible for handling all exceptions during the operation execution.
     """
 
-    def handle(self, operation, error: Exception):
+    def handle(self, operation, error: Exception, dataset=None):
 
         operation_name = type(operation).__name__
+
+        # Identify the dataset the operation failed on
+        if dataset is not None:
+            print(f"Operation '{getattr(operation, '__name__', operation_name)}' failed on {dataset!r}.")
         
         if isinstance(error, KeyError):
             print(f"KeyError in '{operation_name}': Column not found in the DataFrame.")
@@ -1,11 +1,14 @@
+import numpy as np
 import pandas as pd
-from box import ConfigBox
-import yaml
-from box.exceptions import BoxValueError
-from functools import wraps
-import inspect
-import sys
+from functools import wraps, update_wrapper
 from typing import List
+from utils.registry import registry, OPERATION_TYPES
+from utils.schema import read_yaml, compile_schema
+from utils.validation_engine import validate_dataframe
+from utils.multiway_merge import multiway_merge, union_datasets
+from utils.cleaning_engine import run_cleaning_chain
+from utils.streaming_dedup import drop_seen_rows
+from utils.arrow_backend import is_arrow_string, arrow_upper, arrow_strip, arrow_replace_regex, RE2_WHITESPACE
 
 def mark_as_cleaning_operation(func):
     """
@@ -17,7 +20,7 @@ def mark_as_cleaning_operation(func):
     
     # Mark the function as a cleaning operation
     wrapper._is_cleaning_operation = True
-    return wrapper
+    return registry.register(wrapper, 'cleaning')
 
 def mark_as_validation_operation(func):
     """
@@ -29,7 +32,7 @@ def mark_as_validation_operation(func):
     
     # Mark the function as a validation operation
     wrapper._is_validation_operation = True
-    return wrapper
+    return registry.register(wrapper, 'validation')
 
 def mark_as_merge_operation(func):
     """
@@ -41,11 +44,188 @@ def mark_as_merge_operation(func):
     
     # Mark the function as a merge operation
     wrapper._is_merge_operation = True
-    return wrapper
+    return registry.register(wrapper, 'merge')
+
+def mark_as_fusable(values=None, columns=None, chain=None, absorbs=()):
+    """
+    Decorator to attach the kernels used by the fused cleaning engine to a cleaning operation.
+
+    :param values: Function applied to each column (Series -> Series).
+    :param columns: Function applied to the column names (Index -> Index).
+    :param chain: Operations this composite operation is made of, in order.
+    :param absorbs: Operations that become redundant when they run right before this one.
+    """
+    def decorator(func):
+        func._column_kernel = values
+        func._columns_kernel = columns
+        func._fused_chain = chain
+        func._absorbs = tuple(absorbs)
+        return func
+
+    return decorator
+
+def mark_as_multiway(multiway):
+    """
+    Decorator to attach an N-way implementation to a merge operation. MergeProcessor calls
+    multiway(datasets, **arguments) instead of merging pairwise, unless it returns None.
+    """
+    def decorator(func):
+        func._multiway = multiway
+        return func
+
+    return decorator
+
+def mark_as_incremental(func):
+    """
+    Decorator to mark a merge operation whose N-way implementation takes incremental=True to keep the row
+    hashes of its result on the first Dataset (see MergeProcessor).
+    """
+    func._is_incremental = True
+    return func
+
+def is_incremental(operation) -> bool:
+    """
+    Check if a merge operation can keep the row hashes of its result between runs.
+    """
+    return getattr(operation, '_is_incremental', False)
+
+class BoundOperation:
+    """
+    An operation with keyword arguments bound to it, see bind_arguments.
+
+    It keeps the name and markers of the operation. Unlike a closure it can be pickled, so it runs on the
+    process backend, as long as the operation and the arguments can be pickled.
+    """
+
+    def __init__(self, operation, **kwargs):
+        update_wrapper(self, operation)
+        # Binding twice binds both sets of arguments to the original operation
+        self.operation = operation.operation if isinstance(operation, BoundOperation) else operation
+        self._bound_arguments = {**getattr(operation, '_bound_arguments', {}), **kwargs}
+
+    def __call__(self, *args):
+        return self.operation(*args, **self._bound_arguments)
+
+    def __repr__(self):
+        arguments = ', '.join(f"{name}={value!r}" for name, value in self._bound_arguments.items())
+        return f"<BoundOperation {self.__name__}({arguments})>"
+
+
+def bind_arguments(operation, **kwargs) -> BoundOperation:
+    """
+    Bind keyword arguments to an operation, e.g. bind_arguments(merge_dfs, merge_columns=['id'], how='left'),
+    keeping its name and markers so it can still be added with add_operation.
+    """
+    return BoundOperation(operation, **kwargs)
+
+def mark_as_hash_partitionable(func):
+    """
+    Decorator to mark a merge operation that only combines rows with equal merge_columns values,
+    so it can run on pairs of hash partitions of its inputs (see HashPartitionedMerge).
+    """
+    func._is_hash_partitionable = True
+    return func
+
+def is_hash_partitionable(operation) -> bool:
+    """
+    Check if a merge operation can run partition by partition on the hash of its merge columns.
+    """
+    return getattr(operation, '_is_hash_partitionable', False)
+
+def mark_as_column_projection(columns):
+    """
+    Decorator to declare the columns an operation keeps, the others being dropped from its result,
+    so a Dataset read from a file for it can skip them (see LazyDataset).
+
+    :param columns: List of column names, or a callable (dataset, **bound_arguments) returning them,
+        or None when they are not known.
+    """
+    def decorator(func):
+        func._projection = columns
+        return func
+
+    return decorator
+
+def mark_as_column_needs(columns):
+    """
+    Decorator to declare the columns an operation reads, the other columns passing through it unchanged,
+    so a Dataset read from a file for a later projection (see mark_as_column_projection) only adds these columns.
+
+    :param columns: List of column names, or a callable (dataset, **bound_arguments) returning them,
+        or None when every column is read.
+    """
+    def decorator(func):
+        func._column_needs = columns
+        return func
+
+    return decorator
+
+def _declared_columns(operation, dataset, attribute: str) -> set:
+    columns = getattr(operation, attribute, None)
+    if callable(columns):
+        columns = columns(dataset, **getattr(operation, '_bound_arguments', {}))
+    return None if columns is None else set(columns)
+
+def projected_columns(operation, dataset) -> set:
+    """
+    Get the columns an operation keeps when run on a dataset, None if it does not declare them.
+    """
+    return _declared_columns(operation, dataset, '_projection')
+
+def needed_columns(operation, dataset) -> set:
+    """
+    Get the columns an operation reads when run on a dataset, None if it may read every column.
+    """
+    return _declared_columns(operation, dataset, '_column_needs')
+
+def mark_as_row_local(func):
+    """
+    Decorator to mark an operation whose result for a row depends only on that row,
+    so it can run on chunks or partitions of a DataFrame independently.
+    """
+    func._is_row_local = True
+    return func
+
+def is_row_local(operation) -> bool:
+    """
+    Check if an operation can run on chunks or partitions of a DataFrame independently.
+    """
+    return getattr(operation, '_is_row_local', False)
+
+def mark_as_stateful_chunks(func):
+    """
+    Decorator to mark an operation that keeps state across the DataFrames it is given, e.g. the rows seen so far.
+    A StreamingDataset runs it chunk by chunk in order, but it never runs on partitions in parallel.
+    """
+    func._is_stateful_chunks = True
+    return func
+
+def is_stateful_chunks(operation) -> bool:
+    """
+    Check if an operation runs on chunks one after the other, keeping state between them.
+    """
+    return getattr(operation, '_is_stateful_chunks', False)
+
+def mark_as_validation_only(func):
+    """
+    Decorator to mark a validation operation that only checks the data and returns it unchanged,
+    so a DataValidationProcessor can run it on a sample of the rows.
+    """
+    func._is_validation_only = True
+    return func
+
+def is_validation_only(operation) -> bool:
+    """
+    Check if an operation returns its DataFrame unchanged.
+    """
+    return getattr(operation, '_is_validation_only', False)
 
 class SchemaNotProvidedError(Exception):
     pass
 
+class FullDatasetRequiredError(Exception):
+    pass
+
 def requires_schema(func):
     """
     Decorator to mark functions that require the schema as an argument.
@@ -58,7 +238,7 @@ def check_operation_type( operation, operation_type: str):
         Helper method to check if the operation matches the processor type.
         """
         expected_attr = f"_is_{operation_type}_operation"
-        if not getattr(operation, expected_attr, False):
+        if not (getattr(operation, expected_attr, False) or registry.is_registered(operation, operation_type)):
             operation_name = operation.__name__  # Get the operation name
             raise TypeError(
                 f"The operation '{operation_name}' is not of type {operation_type}. "
@@ -76,12 +256,31 @@ def check_duplicate_order(order, global_operations):
     """
     Helper method to check if the same order is already present in global_operations.
     """
-    if order in [op[0] for op in global_operations]:
+    if any(op[0] == order for op in global_operations):
         raise ValueError(f"Duplicate order {order} found. Please use a different order number.")
 
 
+def _uppercase_column_names(columns: pd.Index) -> pd.Index:
+    return pd.Index([col.upper() for col in columns])
+
+def _on_objects(series: pd.Series, kernel) -> pd.Series:
+    # Run the object-dtype version of a kernel on an Arrow string column
+    return kernel(series.astype(object)).astype(series.dtype)
+
+def _uppercase_values(series: pd.Series) -> pd.Series:
+    if is_arrow_string(series):
+        result = arrow_upper(series)
+        if result is not None:
+            return result
+
+    # Check if the column's data type is object (string) or string
+    if series.dtype == 'object' or series.dtype == 'string':
+        return series.str.upper()
+    return series
 
 @mark_as_cleaning_operation
+@mark_as_row_local
+@mark_as_fusable(values=_uppercase_values, columns=_uppercase_column_names)
 def make_uppercase( dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Apply the uppercase transformation to the DataFrame.
@@ -91,24 +290,26 @@ def make_uppercase( dataframe: pd.DataFrame) -> pd.DataFrame:
         :return: A new DataFrame with uppercase column names and string column values in uppercase.
         """
 
-        # Create a copy of the input DataFrame to avoid modifying the original
-        _df = dataframe.copy()
+        # Convert column names and string values to uppercase into a new DataFrame
+        return run_cleaning_chain(dataframe, [make_uppercase])
 
-        # Convert all column names to uppercase
-        _df.columns = [col.upper() for col in _df.columns]
 
-        # Iterate over each column in the DataFrame
-        for col in _df.columns:
-            # Check if the column's data type is object (string) or string
-            if _df[col].dtype == 'object' or _df[col].dtype == 'string':
-                # Convert all values in the column to uppercase
-                _df[col] = _df[col].str.upper()
+def _strip_column_names(columns: pd.Index) -> pd.Index:
+    return columns.str.strip()
 
-        # Return the modified DataFrame
-        return _df
+def _strip_values(series: pd.Series) -> pd.Series:
+    if is_arrow_string(series):
+        result = arrow_strip(series)
+        return result if result is not None else _on_objects(series, _strip_values)
 
+    # Strip spaces from string data in object columns
+    if series.dtype == 'object':
+        return series.apply(lambda x: x.strip() if isinstance(x, str) else x)
+    return series
 
 @mark_as_cleaning_operation
+@mark_as_row_local
+@mark_as_fusable(values=_strip_values, columns=_strip_column_names)
 def strip_leading_and_trailing_spaces( dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Apply the transformation to strip spaces from column names and string values.
@@ -118,19 +319,23 @@ def strip_leading_and_trailing_spaces( dataframe: pd.DataFrame) -> pd.DataFrame:
         :return: A DataFrame with stripped column names and values.
         """
 
-        # Create a copy of the input DataFrame to avoid modifying the original
-        _df = dataframe.copy()
+        # Strip spaces from column names and string data into a new DataFrame
+        return run_cleaning_chain(dataframe, [strip_leading_and_trailing_spaces])
 
-        # Strip spaces from column names
-        _df.columns = _df.columns.str.strip()
+def _remove_spaces_around_punctuation_values(series: pd.Series) -> pd.Series:
+    if is_arrow_string(series):
+        result = arrow_replace_regex(series, RE2_WHITESPACE + r'*([,:\-!;])' + RE2_WHITESPACE + '*', r'\1')
+        return result if result is not None else _on_objects(series, _remove_spaces_around_punctuation_values)
 
-        # Strip spaces from string data in all categorical/object columns
-        for col in _df.select_dtypes(include=['object']).columns:
-            _df[col] = _df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
-
-        return _df
+    # Check if the column's data type is object (string)
+    if series.dtype == 'object':
+        # Remove spaces around commas, colons, hyphens, exclamation marks and semicolons in one regex pass
+        return series.str.replace(r'\s*([,:\-!;])\s*', r'\1', regex=True)
+    return series
 
 @mark_as_cleaning_operation
+@mark_as_row_local
+@mark_as_fusable(values=_remove_spaces_around_punctuation_values)
 def remove_spaces_Around_punctuation(dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Apply the transformation to remove spaces around commas, colons, and hyphens.
@@ -140,34 +345,27 @@ def remove_spaces_Around_punctuation(dataframe: pd.DataFrame) -> pd.DataFrame:
         :return: A new DataFrame with spaces removed around commas, colons, and hyphens in string columns.
         """
 
-        # Create a copy of the input DataFrame to avoid modifying the original
-        _df = dataframe.copy()
-
-        # Iterate over each column in the DataFrame
-        for col in _df.columns:
-            # Check if the column's data type is object (string)
-            if _df[col].dtype == 'object':
-                # Remove spaces around commas
-                _df[col] = _df[col].str.replace(r'(\s*,\s*)', ',', regex=True)
-                # Remove spaces around colons
-                _df[col] = _df[col].str.replace(r'(\s*:\s*)', ':', regex=True)
-                # Remove spaces around hyphens
-                _df[col] = _df[col].str.replace(r'(\s*-\s*)', '-', regex=True)
-                _df[col] = _df[col].str.replace(r'(\s*!\s*)', '!', regex=True)
-                _df[col] = _df[col].str.replace(r'(\s*;\s*)', ';', regex=True)
-
-        # Return the modified DataFrame
-        return _df
+        # Remove spaces around punctuation in string columns into a new DataFrame
+        return run_cleaning_chain(dataframe, [remove_spaces_Around_punctuation])
+
+def _schema_columns(dataset, **arguments):
+    # drop_invalid_columns keeps the COLUMNS of the schema
+    schema = dataset.get_schema()
+    return None if schema is None else compile_schema(schema).columns
 
 @mark_as_validation_operation
+@mark_as_row_local
+@mark_as_column_projection(_schema_columns)
 @requires_schema
 def drop_invalid_columns(dataframe, schema):
         """
         Drops columns from the DataFrame that are not present in the schema.yaml file
         and prints the dropped columns.
         """
-        schema_columns = schema['COLUMNS'].keys()
-        columns_to_drop = [col for col in dataframe.columns if col not in schema_columns]
+        schema = compile_schema(schema)
+        if schema.columns is None:
+            raise KeyError('COLUMNS')
+        columns_to_drop = [col for col in dataframe.columns if col not in schema.columns]
         
         if columns_to_drop:
             print(f"Columns dropped: {', '.join(columns_to_drop)}")
@@ -177,7 +375,20 @@ def drop_invalid_columns(dataframe, schema):
         return dataframe.drop(columns=columns_to_drop)
 
 
+def _special_characters_values(series: pd.Series) -> pd.Series:
+    if is_arrow_string(series):
+        result = arrow_replace_regex(series, RE2_WHITESPACE + '*[,;:!-]' + RE2_WHITESPACE + '*', '-')
+        return result if result is not None else _on_objects(series, _special_characters_values)
+
+    # Check if the column's data type is object (string)
+    if series.dtype == 'object':
+        # Replace spaces around commas, semicolons, and colons with hyphens
+        return series.str.replace(r'\s*[,;:!-]\s*', '-', regex=True)
+    return series
+
 @mark_as_cleaning_operation
+@mark_as_row_local
+@mark_as_fusable(values=_special_characters_values, absorbs=[remove_spaces_Around_punctuation])
 def manage_special_characters( dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Apply the transformation to replace spaces around commas, semicolons, and colons with hyphens.
@@ -187,43 +398,85 @@ def manage_special_characters( dataframe: pd.DataFrame) -> pd.DataFrame:
         :return: A new DataFrame with spaces around commas, semicolons, and colons replaced with hyphens in string columns.
         """
         
-        # Create a copy of the input DataFrame to avoid modifying the original
-        _df = dataframe.copy()
+        # Replace punctuation and the spaces around it in string columns into a new DataFrame
+        return run_cleaning_chain(dataframe, [manage_special_characters])
 
-        # Iterate over each column in the DataFrame
-        for col in _df.columns:
-            # Check if the column's data type is object (string)
-            if _df[col].dtype == 'object':
-                # Replace spaces around commas, semicolons, and colons with hyphens
-                _df[col] = _df[col].str.replace(r'\s*[,;:!-]\s*', '-', regex=True)
 
-        # Return the modified DataFrame
-        return _df
 
 
 
+def _parse_float(text: str):
+    try:
+        return float(text)
+    except ValueError:
+        return None
 
+def _numeric_values(series: pd.Series) -> pd.Series:
+    # Numeric, boolean and datetime columns cannot hold currency strings
+    if series.dtype != 'object' and series.dtype != 'string':
+        return series
 
+    values = series.astype(object)
+    try:
+        strings = values.str
+    except AttributeError:
+        # No string values in the column
+        return series
+
+    # Strings starting with '$' are currency amounts, others must be digits with at most one decimal point
+    dollar = strings.startswith('$', na=False).to_numpy(dtype=bool)
+    plain = (strings.replace('.', '', n=1, regex=False).str.isdigit() == True).to_numpy(dtype=bool)
+    candidates = dollar | plain
+    if not candidates.any():
+        return series
+
+    text = pd.Series(np.where(dollar, strings.replace('$', '', regex=False), values)[candidates], dtype=object)
+    parsed = pd.to_numeric(text, errors='coerce').to_numpy(dtype='float64')
+    parsed_ok = np.ones(len(text), dtype=bool)
+
+    # to_numeric rejects a few spellings float() accepts (e.g. '1_000' or 'nan'), parse those one by one
+    retry = np.isnan(parsed)
+    if retry.any():
+        fallback = [_parse_float(value) for value in text[retry]]
+        parsed_ok[retry] = [value is not None for value in fallback]
+        parsed[retry] = [np.nan if value is None else value for value in fallback]
+
+    # Values that still cannot be parsed (e.g. '$abc') are left alone
+    converted = np.zeros(len(values), dtype=bool)
+    converted[candidates] = parsed_ok
+    parsed = parsed[parsed_ok]
+
+    rest = ~converted & values.notna().to_numpy()
+    if not rest.any() or pd.api.types.infer_dtype(values[rest], skipna=True) in ('integer', 'floating', 'mixed-integer-float'):
+        # Every value is numeric now, return a proper float column
+        result = np.full(len(values), np.nan)
+        result[converted] = parsed
+        result[rest] = values[rest].to_numpy(dtype='float64')
+        return pd.Series(result, index=series.index, name=series.name)
+
+    result = values.to_numpy(copy=True)
+    result[converted] = parsed
+    return pd.Series(result, index=series.index, name=series.name, dtype=object)
+
+# Not row-local: a column becomes float64 only when every row of the frame is numeric, so the dtype of a chunk
+# would depend on the other rows of that chunk
 @mark_as_cleaning_operation
+@mark_as_fusable(values=_numeric_values)
 def clean_numeric_values( dataframe: pd.DataFrame) -> pd.DataFrame:
         """
         Apply the transformation to clean numeric values in the DataFrame.
+
+        String columns are cleaned with vectorized operations: '$' amounts and plain decimal strings
+        are parsed to floats, other strings are left alone. Columns that end up fully numeric are
+        returned as float64, numeric columns are not touched.
         
         :param dataframe: Input DataFrame where numeric values need to be cleaned and converted.
         :param schema: Not used for this operation, included for compatibility.
         :return: A DataFrame with cleaned numeric values.
         """
         
-        # Create a copy of the input DataFrame to avoid modifying the original
-        _df = dataframe.copy()
-
-        # Clean numeric values by handling dollar signs and converting strings to floats
-        _df = _df.map(
-            lambda x: float(x.replace('$', '')) if isinstance(x, str) and x.startswith('$')
-            else (float(x) if isinstance(x, str) and x.replace('.', '', 1).isdigit() else x)
-        )
-
-        return _df
+        # Clean numeric values column by column into a new DataFrame
+        return run_cleaning_chain(dataframe, [clean_numeric_values])
 
 @mark_as_cleaning_operation    
 def remove_duplicates(dataframe: pd.DataFrame, keep='first') -> pd.DataFrame:
@@ -242,14 +495,42 @@ def remove_duplicates(dataframe: pd.DataFrame, keep='first') -> pd.DataFrame:
         
         return dataframe.drop_duplicates(keep = keep)
 
+@mark_as_cleaning_operation
+@mark_as_stateful_chunks
+@mark_as_column_needs(lambda dataset, subset=None, **arguments: subset)
+def remove_duplicates_across_batches(dataframe: pd.DataFrame, store=None, subset: list = None) -> pd.DataFrame:
+    """
+    Drop the rows seen in an earlier batch or earlier in this one, keeping memory bounded: only the row
+    hashes are kept, in the store, which persists between runs. Bind the store with bind_arguments, e.g.
+    bind_arguments(remove_duplicates_across_batches, store=DiskHashSet('seen.db')).
+    Rows are recorded as they are processed, so a StreamingDataset iterated twice has no new rows the second time.
+
+    :param dataframe: Batch of rows.
+    :param store: DiskHashSet for exact deduplication or BloomFilter for approximate deduplication
+        (see utils.streaming_dedup).
+    :param subset: Columns identifying a row, all columns by default.
+    :return: The new rows of the batch.
+    """
+    if store is None:
+        raise ValueError("store must be provided")
+    return drop_seen_rows(dataframe, store, subset)
+
+
 
 
 
 
 
 
+def _validated_columns(dataset, **arguments):
+    # validate_column_values reads the columns the schema lists valid values for
+    schema = dataset.get_schema()
+    return None if schema is None else compile_schema(schema).valid_values
 
 @mark_as_validation_operation
+@mark_as_row_local
+@mark_as_validation_only
+@mark_as_column_needs(_validated_columns)
 @requires_schema
 def validate_column_values( dataframe: pd.DataFrame, schema: dict) -> pd.DataFrame:
         """
@@ -261,80 +542,24 @@ def validate_column_values( dataframe: pd.DataFrame, schema: dict) -> pd.DataFra
         :return: The unmodified DataFrame if no invalid values are found.
         """
 
-        invalid_data = []
-
-        # Iterate over the schema keys that define valid values
-        for column, constraints in schema.items():
-            # Check if the column exists in the DataFrame and if the schema has defined valid values for this column
-            if column in dataframe.columns and isinstance(constraints, list):
-                valid_values = constraints
-
-                # Find invalid values in the DataFrame that are not in the list of valid values
-                invalid_values = dataframe[dataframe[column].notna() & ~dataframe[column].isin(valid_values)][column].unique()
-
-                # If invalid values are found, collect the information
-                if len(invalid_values) > 0:
-                    invalid_data.append(f"Invalid values in column '{column}': {', '.join(map(str, invalid_values))}")
+        # Check every constrained column in one pass and report all of its invalid values
+        report = validate_dataframe(dataframe, schema, sample_size=None)
 
         # Raise ValueError if any invalid values are found
-        if invalid_data:
-            print("\n".join(invalid_data))
+        if report.violations:
+            print("\n".join(report.messages()))
 
         # Return the DataFrame unmodified if no errors
         return dataframe
 
 
   
-def read_yaml(path_to_yaml: str) -> ConfigBox:
-    """
-    Read the YAML file and return a ConfigBox object.
-    
-    This function reads a YAML file from the specified path and converts its content into a ConfigBox object,
-    which allows for attribute-style access to dictionary keys. The function ensures that the YAML content 
-    is properly formatted as a dictionary and handles various exceptions related to file reading and YAML parsing.
-    
-    :param path_to_yaml: The file path to the YAML file.
-    :return: A ConfigBox object containing the parsed YAML content.
-    :raises ValueError: If the YAML content is not a dictionary or if the YAML file is not properly formatted.
-    :raises BoxValueError: If the YAML content cannot be converted to a ConfigBox object.
-    :raises Exception: For any other unexpected errors.
-    """
-    try:
-        # Open and read the YAML file
-        with open(path_to_yaml, 'r') as file:
-            content = yaml.safe_load(file)
-
-            # Check if the content is a dictionary
-            if isinstance(content, dict):
-                
-                return ConfigBox(content)
-            else:
-                raise ValueError("YAML content is not a dictionary")
-
-    except yaml.YAMLError as e:
-        # Handle YAML parsing errors
-        print(f"An error occurred while parsing the YAML file: {e}")
-        raise ValueError("YAML file is not properly formatted")
-
-    except BoxValueError:
-        # Handle errors related to converting to ConfigBox
-        print("Cannot convert the YAML content to a Box object")
-        raise BoxValueError("Cannot convert the YAML content to a Box object")
-
-    except Exception as e:
-        # Handle any other unexpected errors
-        print(f"An unexpected error occurred: {e}")
-        raise e
     
 def get_operation_list(operation_type: str) -> List[str]:
-    
-    attr = {'cleaning': '_is_cleaning_operation', 'validation': '_is_validation_operation','merge': '_is_merge_operation' }.get(operation_type)
-    
-    if not attr:
-        raise ValueError("Invalid operation type. Use 'cleaning' or 'validation' or 'merge'.")
-    
-    return [name for name, obj in inspect.getmembers(sys.modules[__name__]) 
-            if inspect.isfunction(obj) and getattr(obj, attr, False)]
+    """
+    Get the names of the built-in operations of a type, from the operation registry.
+    """
+    return registry.names(operation_type, built_in_only=True)
     
 
 
@@ -357,6 +582,8 @@ def check_no_duplicates(df: pd.DataFrame, subset_columns: list = None) -> bool:
     return True
 
 @mark_as_merge_operation
+@mark_as_multiway(multiway_merge)
+@mark_as_hash_partitionable
 def merge_dfs(df1: pd.DataFrame, df2: pd.DataFrame, merge_columns=None, how="outer") -> pd.DataFrame:
     """
     Merge two DataFrames based on the given columns and merge strategy.
@@ -376,10 +603,15 @@ def merge_dfs(df1: pd.DataFrame, df2: pd.DataFrame, merge_columns=None, how="out
     return merged_df
 
 @mark_as_merge_operation
+@mark_as_multiway(union_datasets)
+@mark_as_incremental
 def add_new_rows(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
     """
     Add rows from df2 into df1. If row exists in df1, it's ignored.
 
+    Through MergeProcessor, every dataset is added in a single pass (see union_datasets), incrementally
+    with MergeProcessor(incremental=True).
+
     :param df1: Main DataFrame.
     :param df2: DataFrame containing new rows.
     :return: DataFrame with new rows added from df2.
@@ -405,19 +637,37 @@ def add_new_rows(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
 
 
 
+STANDARD_CLEANING_OPERATIONS = [
+    make_uppercase,
+    remove_spaces_Around_punctuation,
+    manage_special_characters,
+    strip_leading_and_trailing_spaces,
+    clean_numeric_values,
+]
+
+# Not row-local, it includes clean_numeric_values
 @mark_as_cleaning_operation
+@mark_as_fusable(chain=STANDARD_CLEANING_OPERATIONS)
 def apply_standard_cleaning(dataframe: pd.DataFrame) -> pd.DataFrame:
     """
     Applies a set of standard cleaning operations to the given DataFrame.
+
+    The operations are fused, so every column is visited once and a single output DataFrame is allocated.
     
     :param dataframe: The DataFrame to be cleaned.
     :return: The cleaned DataFrame.
     """
-    # Apply all standard cleaning operations
-    dataframe = make_uppercase(dataframe)
-    dataframe = remove_spaces_Around_punctuation(dataframe)
-    dataframe = manage_special_characters(dataframe)
-    dataframe = strip_leading_and_trailing_spaces(dataframe)
-    dataframe = clean_numeric_values(dataframe)
-    
-    return dataframe
+    # Apply all standard cleaning operations in one pass
+    return run_cleaning_chain(dataframe, STANDARD_CLEANING_OPERATIONS)
+
+
+def _register_built_ins():
+    # The operations marked in this module are the built-in ones, operations marked in other modules are not
+    for operation in list(globals().values()):
+        if getattr(operation, '__module__', None) != __name__:
+            continue
+        for operation_type in OPERATION_TYPES:
+            if getattr(operation, f"_is_{operation_type}_operation", False):
+                registry.register(operation, operation_type, built_in=True)
+
+_register_built_ins()
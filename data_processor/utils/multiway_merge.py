@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+from typing import List
+from utils.row_hashing import RowHashSet
+
+# Join types the N-way path supports: 'left' and 'inner' keep the rows of the first dataset in order,
+# 'outer' sorts the union of the keys like pd.merge
+MULTIWAY_JOINS = ('left', 'inner', 'outer')
+
+
+def build_key_index(df: pd.DataFrame, merge_columns: List[str]) -> pd.Index:
+    """
+    Build the index of the join-key values of a DataFrame, one entry per row.
+    The index keeps its hash table once built, so lookups into it can be repeated cheaply.
+    """
+    if len(merge_columns) == 1:
+        return pd.Index(df[merge_columns[0]])
+    return pd.MultiIndex.from_frame(df[merge_columns])
+
+
+def _supports_multiway(frames: List[pd.DataFrame], merge_columns: List[str], how: str) -> bool:
+    """
+    Check that the N-way join gives the same result as merging the frames pairwise with pd.merge.
+    """
+    if how not in MULTIWAY_JOINS:
+        return False
+
+    base = frames[0]
+    seen = set(base.columns)
+    for df in frames:
+        keys = df[merge_columns]
+        if keys.isna().any().any() or any(keys[column].dtype != base[column].dtype for column in merge_columns):
+            return False
+        if df is base:
+            continue
+        # Overlapping columns would get suffixes
+        others = [column for column in df.columns if column not in merge_columns]
+        if seen.intersection(others) or len(set(others)) != len(others):
+            return False
+        seen.update(others)
+    return True
+
+
+def multiway_merge(datasets: list, merge_columns=None, how: str = 'outer'):
+    """
+    Merge datasets in one pass: every row of the first dataset looks up its key in the key index of each
+    other dataset, and the matching columns are gathered at once instead of building N-1 intermediate frames.
+
+    The key indexes come from Dataset.key_index, so they are cached on each dataset and reused by later merges.
+
+    Outer joins take the union of the keys of every dataset, sorted, and align each dataset to it with a
+    single lookup, as merging pairwise sorts the keys at every step.
+
+    :return: The merged DataFrame, or None when the result could differ from merging pairwise with pd.merge
+        ('right' joins, duplicate keys in the other datasets, missing, mismatched or unsortable keys,
+        overlapping column names). The caller then merges pairwise.
+    """
+    if merge_columns is None:
+        raise ValueError("merge_columns must be provided")
+    merge_columns = [merge_columns] if isinstance(merge_columns, str) else list(merge_columns)
+
+    frames = [dataset.get_data() for dataset in datasets]
+    if not _supports_multiway(frames, merge_columns, how):
+        return None
+
+    indexes = [dataset.key_index(merge_columns) for dataset in datasets[1:]]
+    if not all(index.is_unique for index in indexes):
+        return None
+
+    base = frames[0]
+    base_keys = build_key_index(base, merge_columns)
+    if how == 'outer':
+        return _outer_merge(frames, base_keys, indexes, merge_columns)
+    indexers = [index.get_indexer(base_keys) for index in indexes]
+
+    if how == 'inner':
+        keep = np.logical_and.reduce([indexer >= 0 for indexer in indexers])
+        base = base[keep]
+        indexers = [indexer[keep] for indexer in indexers]
+
+    columns = {}
+    for position in range(base.shape[1]):
+        columns[len(columns)] = base.iloc[:, position].array
+    return _gather(columns, base.columns, frames, indexers, merge_columns)
+
+
+def _outer_merge(frames: List[pd.DataFrame], base_keys: pd.Index, indexes: List[pd.Index],
+                 merge_columns: List[str]):
+    """
+    Outer join: every row of the first frame and one row per key found only in the other frames,
+    sorted by key, rows of the first frame with the same key staying in order.
+    """
+    base = frames[0]
+    extra = indexes[0].append(indexes[1:]) if len(indexes) > 1 else indexes[0]
+    extra = extra.unique()
+    extra = extra[~extra.isin(base_keys)]
+
+    keys = pd.concat([base[merge_columns], pd.DataFrame(extra.tolist(), columns=merge_columns)], ignore_index=True)
+    for column in merge_columns:
+        keys[column] = keys[column].astype(base[column].dtype)
+    try:
+        order = keys.sort_values(merge_columns, kind='stable').index.to_numpy()
+    except TypeError:
+        # Keys of mixed types cannot be sorted
+        return None
+    keys = keys.take(order).reset_index(drop=True)
+
+    result_keys = build_key_index(keys, merge_columns)
+    base_indexer = np.where(order < len(base), order, -1)
+    columns = {}
+    for position, column in enumerate(base.columns):
+        if column in merge_columns:
+            columns[len(columns)] = keys[column].array
+        else:
+            columns[len(columns)] = _take(base.iloc[:, position], base_indexer)
+    return _gather(columns, base.columns, frames, [index.get_indexer(result_keys) for index in indexes],
+                   merge_columns)
+
+
+def _take(series: pd.Series, indexer: np.ndarray):
+    # Rows without a match get missing values, upcasting like pd.merge (e.g. int64 to float64)
+    values = series.array
+    if isinstance(values, pd.arrays.NumpyExtensionArray):
+        values = values.to_numpy()
+    return pd.api.extensions.take(values, indexer, allow_fill=True)
+
+
+def _gather(columns: dict, base_columns: pd.Index, frames: List[pd.DataFrame], indexers: list,
+            merge_columns: List[str]) -> pd.DataFrame:
+    """
+    Add the columns of the other frames, aligned by their indexers, to the columns of the result.
+    """
+    for df, indexer in zip(frames[1:], indexers):
+        for column in df.columns:
+            if column in merge_columns:
+                continue
+            columns[len(columns)] = _take(df[column], indexer)
+
+    result = pd.DataFrame(columns, copy=False)
+    result.columns = list(base_columns) + [column for df in frames[1:]
+                                           for column in df.columns if column not in merge_columns]
+    return result
+
+
+def union_datasets(datasets: list, incremental: bool = False) -> pd.DataFrame:
+    """
+    Union the rows of datasets with the columns of the first one, keeping the first occurrence of every row:
+    one concatenation and one deduplication pass, however many datasets there are.
+
+    :param incremental: Keep the row hashes of the result on the first dataset. The next union only hashes
+        the new datasets and checks them against the stored hashes instead of deduplicating the whole table.
+    """
+    frames = [dataset.get_data() for dataset in datasets]
+    base = frames[0]
+    for df in frames[1:]:
+        if set(base.columns) != set(df.columns):
+            raise ValueError(f"DataFrames have different columns. "
+                             f"df1 columns: {base.columns.tolist()}, df2 columns: {df.columns.tolist()}")
+    # Align the columns once
+    others = [df[base.columns] for df in frames[1:]]
+
+    if not incremental:
+        return pd.concat([base] + others).drop_duplicates(keep='first').reset_index(drop=True)
+
+    row_hashes = datasets[0].row_hashes()
+    if row_hashes is None:
+        # First incremental union: hash and deduplicate the table once
+        row_hashes = RowHashSet()
+        base = row_hashes.new_rows(base)
+    new_rows = [row_hashes.new_rows(df) for df in others]
+
+    result = pd.concat([base] + new_rows, ignore_index=True)
+    datasets[0].set_row_hashes(row_hashes, result)
+    return result
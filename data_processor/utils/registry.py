@@ -0,0 +1,81 @@
+import threading
+from typing import List
+
+OPERATION_TYPES = ('cleaning', 'validation', 'merge')
+
+
+def check_operation_type_name(operation_type: str):
+    if operation_type not in OPERATION_TYPES:
+        raise ValueError("Invalid operation type. Use 'cleaning' or 'validation' or 'merge'.")
+
+
+class OperationRegistry:
+    """
+    Operations by type and name.
+
+    The mark_as_*_operation decorators register every operation they mark, in utils.helper or in user
+    modules, so listing and type-checking operations are dictionary lookups instead of module scans.
+    Plain functions can be registered with register(). utils.helper registers its operations as built-in
+    once they are defined.
+    """
+
+    def __init__(self):
+        self._operations = {operation_type: {} for operation_type in OPERATION_TYPES}
+        self._built_in = {operation_type: {} for operation_type in OPERATION_TYPES}
+        self._lock = threading.Lock()
+
+    def register(self, operation, operation_type: str, name: str = None, built_in: bool = False,
+                 override: bool = False):
+        """
+        Register an operation under its type. A later operation with the same name replaces the earlier one,
+        but the names of built-in operations are reserved.
+
+        :param built_in: Register a built-in operation, whose name other operations cannot take.
+        :param override: Replace the built-in operation of that name for lookups (get, is_registered).
+            It stays listed as the built-in operation.
+        :raises ValueError: If the name is taken by a built-in operation and override is not set.
+        :return: The operation, so register can be used from a decorator.
+        """
+        check_operation_type_name(operation_type)
+        name = name or operation.__name__
+
+        with self._lock:
+            if not (built_in or override) and any(name in operations for operations in self._built_in.values()):
+                raise ValueError(f"The operation name '{name}' is used by a built-in operation. "
+                                 f"Please use a different name, or register it with override=True.")
+            self._operations[operation_type][name] = operation
+            if built_in:
+                self._built_in[operation_type][name] = operation
+
+        return operation
+
+    def get(self, operation_type: str, name: str):
+        """
+        Get a registered operation by type and name, or None.
+        """
+        check_operation_type_name(operation_type)
+        return self._operations[operation_type].get(name)
+
+    def is_registered(self, operation, operation_type: str) -> bool:
+        """
+        Check if this exact operation is registered under the type.
+        """
+        return self.get(operation_type, getattr(operation, '__name__', None)) is operation
+
+    def is_built_in(self, name: str) -> bool:
+        """
+        Check if a name belongs to a built-in operation of any type.
+        """
+        return any(name in operations for operations in self._built_in.values())
+
+    def names(self, operation_type: str, built_in_only: bool = False) -> List[str]:
+        """
+        Get the sorted names of the registered operations of a type.
+        """
+        check_operation_type_name(operation_type)
+        operations = self._built_in if built_in_only else self._operations
+        return sorted(operations[operation_type])
+
+
+# Registry shared by the decorators, processors and ExecutionManager
+registry = OperationRegistry()
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash of every row of a DataFrame, from its values only (not its index).
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def first_occurrences(hashes: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of the first occurrence of every hash, in row order.
+    """
+    _, first = np.unique(hashes, return_index=True)
+    mask = np.zeros(len(hashes), dtype=bool)
+    mask[first] = True
+    return mask
+
+
+class RowHashSet:
+    """
+    Set of the row hashes of a table, used to append only the rows that are not in it yet
+    without hashing the table again.
+
+    Hashes are kept in sorted runs, each at least twice as long as the next one: adding hashes sorts them into
+    a new run and merges the runs that got too small, so a union costs about the size of what it adds
+    however large the set is, and a lookup searches a few runs.
+
+    Rows are compared by their 64-bit hash: two different rows with the same hash (about one chance in
+    1e19 per pair) would be treated as duplicates. Values hash by type, so 1 and 1.0 in an object column
+    are different rows, unlike with drop_duplicates.
+    """
+
+    def __init__(self, hashes: np.ndarray = None):
+        self._runs = [np.unique(hashes)] if hashes is not None and len(hashes) else []
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'RowHashSet':
+        return cls(hash_rows(df))
+
+    @property
+    def hashes(self) -> np.ndarray:
+        """
+        Every hash of the set, sorted. Merges the runs into one.
+        """
+        if len(self._runs) > 1:
+            self._runs = [_merge_runs(self._runs)]
+        return self._runs[0] if self._runs else np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask of the hashes already in the set.
+        """
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray):
+        """
+        Add hashes that are not in the set yet (unique among themselves).
+        """
+        if not len(hashes):
+            return
+        self._runs.append(np.sort(hashes))
+        # Merge the runs that are not at least twice as long as the next one, which keeps a logarithmic
+        # number of runs and merges every hash a logarithmic number of times
+        while len(self._runs) > 1 and len(self._runs[-2]) < 2 * len(self._runs[-1]):
+            last = self._runs.pop()
+            self._runs[-1] = _merge_runs([self._runs[-1], last])
+
+    def new_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Get the rows of a DataFrame that are not in the set, first occurrences only, and add them to the set.
+        """
+        hashes = hash_rows(df)
+        mask = first_occurrences(hashes) & ~self.contains(hashes)
+        self.add(hashes[mask])
+        return df[mask]
+
+    def save(self, path):
+        """
+        Save the set to a .npy file, so the next run can append new partitions without hashing the table.
+        """
+        np.save(path, self.hashes)
+
+    @classmethod
+    def load(cls, path) -> 'RowHashSet':
+        row_hashes = cls()
+        hashes = np.load(path)
+        row_hashes._runs = [hashes] if len(hashes) else []
+        return row_hashes
+
+
+def _merge_runs(runs: list) -> np.ndarray:
+    # Stable sorts of integers find the sorted runs and merge them
+    return np.sort(np.concatenate(runs), kind='stable')
@@ -0,0 +1,129 @@
+import math
+from statistics import NormalDist
+from typing import List, NamedTuple
+import pandas as pd
+from utils.schema import compile_schema
+from utils.validation_engine import validate_dataframe
+
+
+class SamplingPolicy:
+    """
+    How a DataValidationProcessor validates large datasets from a sample.
+
+    :param size: Number of rows to sample.
+    :param fraction: Fraction of the rows to sample, used when size is not given.
+    :param stratify_by: Column to stratify the sample on: every value keeps its share of the rows.
+        None draws a simple random sample.
+    :param seed: Random seed, the same seed draws the same sample.
+    :param threshold: Escalate to a full validation when the violation rate of a column in the sample
+        exceeds this value. The default escalates on any violation found in the sample.
+    :param confidence: Confidence level of the violation rate bounds.
+    """
+
+    def __init__(self, size: int = 10_000, fraction: float = None, stratify_by: str = None, seed: int = 0,
+                 threshold: float = 0.0, confidence: float = 0.95):
+        if fraction is None and (not isinstance(size, int) or size <= 0):
+            raise ValueError(f"size must be a positive whole number. Got {size}.")
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError(f"fraction must be between 0 and 1. Got {fraction}.")
+        if not 0 <= threshold <= 1:
+            raise ValueError(f"threshold must be between 0 and 1. Got {threshold}.")
+        if not 0 < confidence < 1:
+            raise ValueError(f"confidence must be between 0 and 1. Got {confidence}.")
+
+        self.size = size if fraction is None else None
+        self.fraction = fraction
+        self.stratify_by = stratify_by
+        self.seed = seed
+        self.threshold = threshold
+        self.confidence = confidence
+
+    def sample_rows(self, rows: int) -> int:
+        """
+        Number of rows sampled from a dataset of `rows` rows.
+        """
+        if self.fraction is not None:
+            return min(rows, max(1, math.ceil(self.fraction * rows)))
+        return min(rows, self.size)
+
+    def draw(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Draw the sample of a DataFrame, keeping the original index.
+        """
+        rows = self.sample_rows(len(df))
+        if self.stratify_by is None:
+            return df.sample(n=rows, random_state=self.seed)
+
+        # Proportional allocation, rounding can move the sample size by a few rows
+        return (df.groupby(self.stratify_by, group_keys=False, dropna=False, sort=False)
+                .sample(frac=rows / len(df), random_state=self.seed))
+
+
+def wilson_interval(count: int, rows: int, confidence: float = 0.95) -> tuple:
+    """
+    Wilson score interval of a proportion, reliable for rates close to 0 and small samples.
+
+    :return: (lower, upper) bounds of the proportion of `count` in `rows` at the confidence level.
+    """
+    if rows == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = count / rows
+    denominator = 1 + z ** 2 / rows
+    center = (rate + z ** 2 / (2 * rows)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / rows + z ** 2 / (4 * rows ** 2)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class ViolationEstimate(NamedTuple):
+    column: str
+    count: int      # Invalid values found in the sample
+    rate: float     # Estimated share of invalid values in the dataset
+    lower: float
+    upper: float
+
+
+class SampledValidationReport:
+    """
+    Violation rates of a dataset estimated from a sample.
+
+    :ivar rows: Number of rows of the dataset.
+    :ivar sample_rows: Number of rows validated.
+    :ivar estimates: One ViolationEstimate per constrained column present in the dataset.
+    :ivar escalated: True when the sample exceeded the threshold and the full dataset was validated.
+    """
+
+    def __init__(self, rows: int, sample_rows: int, estimates: List[ViolationEstimate], escalated: bool = False):
+        self.rows = rows
+        self.sample_rows = sample_rows
+        self.estimates = estimates
+        self.escalated = escalated
+
+    def exceeds(self, threshold: float) -> bool:
+        return any(estimate.rate > threshold for estimate in self.estimates)
+
+    def messages(self) -> List[str]:
+        return [f"Estimated invalid values in column '{estimate.column}': {estimate.rate:.2%} "
+                f"({estimate.lower:.2%} - {estimate.upper:.2%}), {estimate.count} in a sample of {self.sample_rows} rows"
+                for estimate in self.estimates if estimate.count]
+
+    def __repr__(self):
+        return (f"<SampledValidationReport: {self.sample_rows} of {self.rows} rows, "
+                f"{sum(1 for estimate in self.estimates if estimate.count)} columns with violations"
+                f"{', escalated' if self.escalated else ''}>")
+
+
+def estimate_violations(sample: pd.DataFrame, schema, rows: int, policy: SamplingPolicy) -> SampledValidationReport:
+    """
+    Estimate the violation rate of every constrained column of a dataset from its sample.
+    """
+    schema = compile_schema(schema)
+    counts = {violation.column: violation.count for violation in validate_dataframe(sample, schema).violations}
+    estimates = []
+    for column in schema.valid_values:
+        if column in sample.columns:
+            count = counts.get(column, 0)
+            lower, upper = wilson_interval(count, len(sample), policy.confidence)
+            estimates.append(ViolationEstimate(column, count, count / len(sample) if len(sample) else 0.0,
+                                               lower, upper))
+    return SampledValidationReport(rows, len(sample), estimates)
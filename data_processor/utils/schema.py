@@ -0,0 +1,180 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+import pandas as pd
+import yaml
+from box import ConfigBox
+from box.exceptions import BoxValueError
+
+# Number of schema files kept by the process-wide schema cache
+SCHEMA_CACHE_SIZE = 128
+
+
+def read_yaml(path_to_yaml: str) -> ConfigBox:
+    """
+    Read the YAML file and return a ConfigBox object.
+    
+    This function reads a YAML file from the specified path and converts its content into a ConfigBox object,
+    which allows for attribute-style access to dictionary keys. The function ensures that the YAML content 
+    is properly formatted as a dictionary and handles various exceptions related to file reading and YAML parsing.
+    
+    :param path_to_yaml: The file path to the YAML file.
+    :return: A ConfigBox object containing the parsed YAML content.
+    :raises ValueError: If the YAML content is not a dictionary or if the YAML file is not properly formatted.
+    :raises BoxValueError: If the YAML content cannot be converted to a ConfigBox object.
+    :raises Exception: For any other unexpected errors.
+    """
+    try:
+        # Open and read the YAML file
+        with open(path_to_yaml, 'r') as file:
+            content = yaml.safe_load(file)
+
+            # Check if the content is a dictionary
+            if isinstance(content, dict):
+                
+                return ConfigBox(content)
+            else:
+                raise ValueError("YAML content is not a dictionary")
+
+    except yaml.YAMLError as e:
+        # Handle YAML parsing errors
+        print(f"An error occurred while parsing the YAML file: {e}")
+        raise ValueError("YAML file is not properly formatted")
+
+    except BoxValueError:
+        # Handle errors related to converting to ConfigBox
+        print("Cannot convert the YAML content to a Box object")
+        raise BoxValueError("Cannot convert the YAML content to a Box object")
+
+    except Exception as e:
+        # Handle any other unexpected errors
+        print(f"An unexpected error occurred: {e}")
+        raise e
+
+
+
+def _column_dtype(definition):
+    # COLUMNS entries are null, a dtype name (AMOUNT: float64) or a mapping with a type (AMOUNT: {type: float64})
+    if isinstance(definition, str):
+        return definition
+    if isinstance(definition, Mapping):
+        return definition.get('dtype', definition.get('type'))
+    return None
+
+
+class CompiledSchema(Mapping):
+    """
+    A schema with the lookups used by the validation operations computed once.
+
+    It reads like the parsed YAML (schema['COLUMNS'], schema.COLUMNS) so custom operations keep working.
+    Compiled schemas from the schema cache are shared by every Dataset using the file and must not be modified.
+
+    :ivar columns: Set of the column names under COLUMNS, None if the schema has no COLUMNS.
+    :ivar valid_values: Valid values by column, for the top-level entries holding a list of values.
+    :ivar dtypes: Target dtype by column, for the COLUMNS entries declaring one.
+    """
+
+    def __init__(self, config: Mapping):
+        self.config = config
+
+        columns = config.get('COLUMNS')
+        self.columns = frozenset(columns.keys()) if isinstance(columns, Mapping) else None
+        self.dtypes = {}
+        for column, definition in (columns.items() if isinstance(columns, Mapping) else ()):
+            dtype = _column_dtype(definition)
+            if dtype is not None:
+                self.dtypes[column] = dtype
+
+        self.valid_values = {}
+        # Hash indexes keep their hash table between calls, unlike isin which rebuilds one each time
+        self._valid_indexes = {}
+        for column, values in config.items():
+            if isinstance(values, list):
+                try:
+                    self.valid_values[column] = frozenset(values)
+                    self._valid_indexes[column] = pd.Index(list(self.valid_values[column]))
+                except TypeError:
+                    # Unhashable values (e.g. a list of mappings) are compared with isin
+                    self.valid_values[column] = values
+
+    def is_valid(self, column: str, values: pd.Series) -> pd.Series:
+        """
+        Get a boolean mask of the values that are in the valid values of the column.
+        """
+        if column not in self._valid_indexes:
+            return values.isin(self.valid_values[column])
+        return pd.Series(self._valid_indexes[column].get_indexer(values) >= 0, index=values.index)
+
+    def __getitem__(self, key):
+        return self.config[key]
+
+    def __iter__(self):
+        return iter(self.config)
+
+    def __len__(self):
+        return len(self.config)
+
+    def __getattr__(self, name):
+        # Attribute access to the schema keys, like the ConfigBox returned by read_yaml
+        if name.startswith('_') or name == 'config':
+            raise AttributeError(name)
+        return getattr(self.config, name)
+
+    def __repr__(self):
+        return f"<CompiledSchema: {len(self.columns or ())} columns, {len(self.valid_values)} validated>"
+
+
+def compile_schema(schema) -> CompiledSchema:
+    """
+    Compile a schema mapping, compiled schemas are returned as they are.
+    """
+    return schema if isinstance(schema, CompiledSchema) else CompiledSchema(schema)
+
+
+class SchemaCache:
+    """
+    Process-wide cache of compiled schemas keyed by file path and modification time, bounded to the
+    `max_size` most recently used files. A file that changes on disk is read again on next use.
+    """
+
+    def __init__(self, max_size: int = SCHEMA_CACHE_SIZE):
+        self.max_size = max_size
+        self._schemas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path) -> CompiledSchema:
+        path = os.path.abspath(os.fspath(path))
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._schemas.get(path)
+            if cached is not None and cached[0] == version:
+                self._schemas.move_to_end(path)
+                return cached[1]
+
+        schema = CompiledSchema(read_yaml(path))
+        with self._lock:
+            self._schemas[path] = (version, schema)
+            self._schemas.move_to_end(path)
+            while len(self._schemas) > self.max_size:
+                self._schemas.popitem(last=False)
+        return schema
+
+    def clear(self):
+        with self._lock:
+            self._schemas.clear()
+
+    def __len__(self):
+        return len(self._schemas)
+
+
+schema_cache = SchemaCache()
+
+
+def load_schema(path) -> CompiledSchema:
+    """
+    Get the compiled schema of a YAML file from the process-wide schema cache.
+    """
+    return schema_cache.get(path)
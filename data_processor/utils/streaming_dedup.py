@@ -0,0 +1,212 @@
+import io
+import math
+import os
+import pickle
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from utils.row_hashing import hash_rows, first_occurrences
+
+# Pickle protocol of the rows stored for collision verification, fixed so stored rows compare across versions
+ROW_PICKLE_PROTOCOL = 4
+
+
+class DiskHashSet:
+    """
+    Exact set of 64-bit row hashes stored in a SQLite file, so memory does not grow with the history.
+
+    :param path: SQLite file, created if it does not exist. ':memory:' keeps the set for this run only.
+    :param verify: Also store every row and compare rows with the stored rows of the same hash, so a hash
+        collision (about one chance in 1e19 per pair of rows) with an earlier batch or earlier in the same batch
+        does not drop a new row. Rows stored without verification match any row with their hash.
+    """
+
+    def __init__(self, path, verify: bool = False):
+        self.path = path
+        self.verify = verify
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS row_hashes (hash INTEGER NOT NULL, row BLOB);
+            CREATE INDEX IF NOT EXISTS row_hashes_hash ON row_hashes (hash);
+            CREATE TEMP TABLE batch (position INTEGER PRIMARY KEY, hash INTEGER NOT NULL);
+        """)
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM row_hashes").fetchone()[0]
+
+    def seen(self, hashes: np.ndarray, df: pd.DataFrame) -> np.ndarray:
+        """
+        Check which rows were seen before, in an earlier call or earlier in `df`, and add the others to the set.
+
+        :param hashes: Hashes of the rows of `df` (see hash_rows).
+        :return: Boolean mask of the rows seen before.
+        """
+        first = first_occurrences(hashes)
+        if self.verify:
+            first = _first_distinct_rows(hashes, df, first)
+        candidates = np.flatnonzero(first)
+        # SQLite integers are signed
+        signed = hashes.view(np.int64)
+
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT INTO batch VALUES (?, ?)",
+                                         zip(candidates.tolist(), signed[candidates].tolist()))
+            columns = "batch.position, row_hashes.row" if self.verify else "DISTINCT batch.position"
+            matches = self._connection.execute(f"SELECT {columns} FROM batch "
+                                               f"JOIN row_hashes ON row_hashes.hash = batch.hash").fetchall()
+            self._connection.execute("DELETE FROM batch")
+
+            seen = ~first
+            if self.verify:
+                rows = dict(zip(candidates.tolist(), _pickled_rows(df.iloc[candidates])))
+                # A hash match is a duplicate only if one of the stored rows is the same row
+                for position, stored in matches:
+                    if stored is None or stored == rows[position]:
+                        seen[position] = True
+            else:
+                seen[[position for position, in matches]] = True
+
+            new = np.flatnonzero(first & ~seen)
+            self._connection.executemany(
+                "INSERT INTO row_hashes VALUES (?, ?)",
+                ((int(signed[position]), rows[position] if self.verify else None) for position in new.tolist()))
+
+        return seen
+
+    def close(self):
+        self._connection.close()
+
+
+def _pickle_row(row: tuple) -> bytes:
+    # Without the memo, so equal rows give equal bytes: the memo writes a value repeated in a row once and
+    # refers to it after, only when it is the same object
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=ROW_PICKLE_PROTOCOL)
+    pickler.fast = True
+    pickler.dump(row)
+    return buffer.getvalue()
+
+
+def _pickled_rows(df: pd.DataFrame):
+    return (_pickle_row(row) for row in df.itertuples(index=False, name=None))
+
+
+def _first_distinct_rows(hashes: np.ndarray, df: pd.DataFrame, first: np.ndarray) -> np.ndarray:
+    """
+    Refine the first occurrences of the hashes of a batch to the first occurrences of its rows: a row repeating
+    the hash of an earlier row of the batch is only a duplicate if it is the same row.
+    """
+    repeated = hashes[~first]
+    if not len(repeated):
+        return first
+    # Only the rows sharing their hash with another row are compared
+    shared = np.flatnonzero(np.isin(hashes, repeated))
+    first = first.copy()
+    distinct = set()
+    for position, row in zip(shared.tolist(), _pickled_rows(df.iloc[shared])):
+        key = (int(hashes[position]), row)
+        first[position] = key not in distinct
+        distinct.add(key)
+    return first
+
+
+class BloomFilter:
+    """
+    Approximate set of row hashes with a fixed size, set by the number of rows it is sized for and the
+    false-positive rate. A false positive makes a new row look like a duplicate, rows seen before are
+    always found.
+
+    :param path: .npy file holding the filter, memory-mapped so every added row is kept on disk.
+        Created if it does not exist, an existing filter keeps the size it was created with. None keeps the
+        filter in memory for this run only.
+    :param capacity: Number of distinct rows the filter is sized for, more rows raise the false-positive rate.
+    :param error_rate: False-positive rate at capacity.
+
+    Rows are only known by their 64-bit hash, within a batch too: two different rows of a batch with the same
+    hash (about one chance in 1e19 per pair) count as one row. Use DiskHashSet(verify=True) to compare rows.
+    """
+
+    # Words before the bits: number of bits, number of hash functions, rows added
+    HEADER = 3
+
+    def __init__(self, path=None, capacity: int = 10_000_000, error_rate: float = 0.001):
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError(f"capacity must be a positive whole number. Got {capacity}.")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1. Got {error_rate}.")
+
+        self.path = path
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._words = np.load(path, mmap_mode='r+')
+            return
+
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        words = self.HEADER + math.ceil(bits / 64)
+        if path is None:
+            self._words = np.zeros(words, dtype=np.uint64)
+        else:
+            self._words = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint64, shape=(words,))
+        self._words[:self.HEADER] = [bits, max(1, round(bits / capacity * math.log(2))), 0]
+
+    @property
+    def bits(self) -> int:
+        return int(self._words[0])
+
+    @property
+    def hash_functions(self) -> int:
+        return int(self._words[1])
+
+    def __len__(self):
+        return int(self._words[2])
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Double hashing: the i-th position of a row is h1 + i * h2, with h2 mixed from the row hash (splitmix64)
+        h2 = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h2 = (h2 ^ (h2 >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        h2 = (h2 ^ (h2 >> np.uint64(31))) | np.uint64(1)
+        steps = np.arange(self.hash_functions, dtype=np.uint64)
+        return (hashes[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bits)
+
+    def seen(self, hashes: np.ndarray, df: pd.DataFrame = None) -> np.ndarray:
+        """
+        Check which rows were (probably) seen before, in an earlier call or earlier in the batch, and add the
+        others to the filter.
+
+        :param hashes: Hashes of the rows (see hash_rows).
+        :return: Boolean mask of the rows seen before.
+        """
+        first = first_occurrences(hashes)
+        positions = self._positions(hashes[first])
+        words = (positions >> np.uint64(6)).astype(np.intp) + self.HEADER
+        masks = np.uint64(1) << (positions & np.uint64(63))
+
+        with self._lock:
+            found = ((self._words[words] & masks) != 0).all(axis=1)
+            np.bitwise_or.at(self._words, words[~found].ravel(), masks[~found].ravel())
+            self._words[2] += np.uint64((~found).sum())
+            if isinstance(self._words, np.memmap):
+                self._words.flush()
+
+        seen = ~first
+        seen[np.flatnonzero(first)[found]] = True
+        return seen
+
+    def close(self):
+        if isinstance(self._words, np.memmap):
+            self._words.flush()
+
+
+def drop_seen_rows(df: pd.DataFrame, store, subset: list = None) -> pd.DataFrame:
+    """
+    Drop the rows of a batch that are in the store (seen in an earlier batch) or repeated in the batch,
+    keeping first occurrences, and add the new rows to the store.
+
+    :param store: DiskHashSet (exact) or BloomFilter (approximate).
+    :param subset: Columns identifying a row, all columns by default.
+    """
+    rows = df if subset is None else df[subset]
+    return df[~store.seen(hash_rows(rows), rows)]
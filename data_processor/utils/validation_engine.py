@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from typing import List, NamedTuple
+from utils.schema import CompiledSchema, compile_schema
+
+# Number of distinct invalid values kept per column in a report
+SAMPLE_SIZE = 5
+
+
+class ColumnViolation(NamedTuple):
+    column: str
+    count: int          # Number of rows with an invalid value
+    samples: tuple      # Distinct invalid values, in order of appearance
+    mask: np.ndarray    # Boolean mask of the invalid rows
+
+
+class ValidationReport:
+    """
+    Result of validating a DataFrame against the valid values of a schema.
+
+    :ivar rows: Number of rows validated.
+    :ivar violations: One ColumnViolation per column holding invalid values.
+    :ivar truncated: True when validation stopped early because the violation budget was exceeded,
+        later columns were not checked.
+    """
+
+    def __init__(self, rows: int, violations: List[ColumnViolation], truncated: bool = False):
+        self.rows = rows
+        self.violations = violations
+        self.truncated = truncated
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.violations and not self.truncated
+
+    @property
+    def total_violations(self) -> int:
+        return sum(violation.count for violation in self.violations)
+
+    @property
+    def mask(self) -> np.ndarray:
+        """
+        Boolean mask of the rows with an invalid value in any column.
+        """
+        mask = np.zeros(self.rows, dtype=bool)
+        for violation in self.violations:
+            mask |= violation.mask
+        return mask
+
+    def to_records(self) -> List[dict]:
+        """
+        The violations as dictionaries, without the row masks.
+        """
+        return [{'column': violation.column, 'count': violation.count, 'samples': list(violation.samples)}
+                for violation in self.violations]
+
+    def messages(self) -> List[str]:
+        return [f"Invalid values in column '{violation.column}': {', '.join(map(str, violation.samples))}"
+                for violation in self.violations]
+
+    def __repr__(self):
+        return (f"<ValidationReport: {len(self.violations)} columns, {self.total_violations} invalid values"
+                f"{', truncated' if self.truncated else ''}>")
+
+
+def _check_categorical(series: pd.Series, schema: CompiledSchema, column: str):
+    # Check every category once and look the rows up by code
+    categories = pd.Series(series.cat.categories)
+    invalid_categories = ~schema.is_valid(column, categories).to_numpy()
+    codes = series.cat.codes.to_numpy()
+    mask = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    mask[present] = invalid_categories[codes[present]]
+    return mask, categories.to_numpy(), pd.unique(codes[mask])
+
+
+def _check_hashed(series: pd.Series, schema: CompiledSchema, column: str):
+    # One hash pass: every distinct value is checked once and the rows are mapped back through their codes
+    codes, uniques = pd.factorize(series)
+    invalid_uniques = ~schema.is_valid(column, pd.Series(uniques)).to_numpy()
+    mask = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    mask[present] = invalid_uniques[codes[present]]
+    return mask, np.asarray(uniques, dtype=object), np.flatnonzero(invalid_uniques)
+
+
+def check_column(series: pd.Series, schema: CompiledSchema, column: str, sample_size: int = SAMPLE_SIZE):
+    """
+    Check the values of one column against its valid values.
+
+    :param sample_size: Number of distinct invalid values to keep, None for all of them.
+    :return: A ColumnViolation, or None if every value is valid.
+    """
+    try:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            mask, values, invalid = _check_categorical(series, schema, column)
+        else:
+            mask, values, invalid = _check_hashed(series, schema, column)
+        samples = values[invalid[:sample_size]]
+    except TypeError:
+        # Unhashable values
+        mask = (series.notna() & ~schema.is_valid(column, series)).to_numpy()
+        samples = series[mask].unique()[:sample_size]
+
+    count = int(mask.sum())
+    if not count:
+        return None
+    return ColumnViolation(column, count, tuple(samples), mask)
+
+
+def validate_dataframe(dataframe: pd.DataFrame, schema, max_violations: int = None,
+                       sample_size: int = SAMPLE_SIZE) -> ValidationReport:
+    """
+    Validate every constrained column of a DataFrame in a single pass per column, without building
+    intermediate frames.
+
+    :param schema: Schema (dict or CompiledSchema) whose top-level lists are the valid values of a column.
+    :param max_violations: Stop once more than this many invalid values are found. None checks every column.
+    :param sample_size: Number of distinct invalid values kept per column, None for all of them.
+    """
+    schema = compile_schema(schema)
+    violations = []
+    found = 0
+
+    for column in schema.valid_values:
+        if column not in dataframe.columns:
+            continue
+        violation = check_column(dataframe[column], schema, column, sample_size)
+        if violation is None:
+            continue
+        violations.append(violation)
+        found += violation.count
+        if max_violations is not None and found > max_violations:
+            return ValidationReport(len(dataframe), violations, truncated=True)
+
+    return ValidationReport(len(dataframe), violations)